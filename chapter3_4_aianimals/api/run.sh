@@ -16,6 +16,11 @@ MAX_REQUESTS_JITTER=${MAX_REQUESTS_JITTER:-2048}
 GRACEFUL_TIMEOUT=${GRACEFUL_TIMEOUT:-600}
 TIMEOUT=${TIMEOUT:-180}
 APP_NAME=${APP_NAME:-"src.main:app"}
+PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-"/tmp/prometheus"}
+export prometheus_multiproc_dir=${PROMETHEUS_MULTIPROC_DIR}
+
+rm -rf ${PROMETHEUS_MULTIPROC_DIR}
+mkdir -p ${PROMETHEUS_MULTIPROC_DIR}
 
 gunicorn ${APP_NAME} \
     -b ${HOST}:${PORT} \
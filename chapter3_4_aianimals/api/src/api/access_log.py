@@ -1,18 +1,22 @@
 from logging import getLogger
+from typing import List
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Header
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
+from src.configurations import Configurations
+from src.exceptions.custom_exceptions import AccessLogBufferFullException
 from src.middleware.assert_token import token_assertion
 from src.registry.container import container
 from src.request_object.access_log import AccessLogCreateRequest
+from starlette.status import HTTP_400_BAD_REQUEST
 
 logger = getLogger(__name__)
 
 router = APIRouter()
 
 
-async def register_access_log(
-    request: AccessLogCreateRequest,
+async def register_access_logs(
+    requests: List[AccessLogCreateRequest],
     token: str,
     session: Session,
 ):
@@ -20,24 +24,43 @@ async def register_access_log(
         token=token,
         session=session,
     )
-    request.user_id = user_id
-    logger.info(f"add access log for {request}")
-    container.access_log_usecase.register(
-        session=session,
-        request=request,
-    )
+    for request in requests:
+        request.user_id = user_id
+    logger.info(f"add {len(requests)} access logs for {user_id}")
+    accepted = container.access_log_usecase.bulk_register(requests=requests)
+    if not accepted:
+        raise AccessLogBufferFullException(
+            message="access log buffer is full",
+            detail="retry later",
+        )
 
 
 @router.post("", response_model=None)
 async def post_access_log(
-    background_tasks: BackgroundTasks,
     request: AccessLogCreateRequest,
     token: str = Header(...),
     session: Session = Depends(container.database.get_session),
 ):
-    background_tasks.add_task(
-        register_access_log,
-        request,
-        token,
-        session,
+    await register_access_logs(
+        requests=[request],
+        token=token,
+        session=session,
+    )
+
+
+@router.post("/batch", response_model=None)
+async def post_access_logs(
+    requests: List[AccessLogCreateRequest],
+    token: str = Header(...),
+    session: Session = Depends(container.database.get_session),
+):
+    if len(requests) > Configurations.access_log_max_request_size:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"too many access logs; max {Configurations.access_log_max_request_size}",
+        )
+    await register_access_logs(
+        requests=requests,
+        token=token,
+        session=session,
     )
@@ -1,12 +1,16 @@
 import os
 from logging import getLogger
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Header, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Header, HTTPException, Response, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.configurations import Configurations
 from src.middleware.assert_token import token_assertion
+from src.middleware.cursor import make_next_cursor
 from src.middleware.strings import random_str
+from src.middleware.tracing import stage
+from src.middleware.upload import save_upload_file
 from src.registry.container import container
 from src.request_object.animal import (
     AnimalCreateRequest,
@@ -16,14 +20,20 @@ from src.request_object.animal import (
 )
 from src.response_object.animal import AnimalResponse, AnimalSearchResponses, SimilarAnimalSearchResponses
 from src.response_object.user import UserResponse
+from starlette.status import HTTP_400_BAD_REQUEST
 
 logger = getLogger(__name__)
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+get_session = container.database.get_async_session if Configurations.async_mode else container.database.get_session
+
 
 @router.get("", response_model=List[AnimalResponse])
 async def get_animal(
+    response: Response,
     id: Optional[str] = None,
     name: Optional[str] = None,
     animal_category_id: Optional[str] = None,
@@ -32,47 +42,95 @@ async def get_animal(
     deactivated: Optional[bool] = False,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     token: str = Header(...),
-    session: Session = Depends(container.database.get_session),
+    session: Union[Session, AsyncSession] = Depends(get_session),
 ):
     await token_assertion(
         token=token,
         session=session,
     )
-    data = container.animal_usecase.retrieve(
-        session=session,
-        request=AnimalRequest(
-            id=id,
-            name=name,
-            animal_category_id=animal_category_id,
-            animal_subcategory_id=animal_subcategory_id,
-            user_id=user_id,
-            deactivated=deactivated,
-        ),
+    request = AnimalRequest(
+        id=id,
+        name=name,
+        animal_category_id=animal_category_id,
+        animal_subcategory_id=animal_subcategory_id,
+        user_id=user_id,
+        deactivated=deactivated,
+    )
+    try:
+        if isinstance(session, AsyncSession):
+            data = await container.animal_usecase.async_retrieve(
+                session=session,
+                request=request,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        else:
+            data = container.animal_usecase.retrieve(
+                session=session,
+                request=request,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    next_cursor = make_next_cursor(
+        ids=[d.id for d in data],
         limit=limit,
-        offset=offset,
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return data
 
 
 @router.get("/liked_by", response_model=List[UserResponse])
 async def liked_by(
+    response: Response,
     animal_id: str,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     token: str = Header(...),
-    session: Session = Depends(container.database.get_session),
+    session: Union[Session, AsyncSession] = Depends(get_session),
 ):
     await token_assertion(
         token=token,
         session=session,
     )
-    data = container.animal_usecase.liked_by(
-        session=session,
-        animal_id=animal_id,
+    try:
+        if isinstance(session, AsyncSession):
+            data = await container.animal_usecase.async_liked_by(
+                session=session,
+                animal_id=animal_id,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        else:
+            data = container.animal_usecase.liked_by(
+                session=session,
+                animal_id=animal_id,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    next_cursor = make_next_cursor(
+        ids=[d.id for d in data],
         limit=limit,
-        offset=offset,
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return data
 
 
@@ -82,7 +140,7 @@ async def post_animal(
     request: AnimalCreateRequest = Form(...),
     file: UploadFile = File(...),
     token: str = Header(...),
-    session: Session = Depends(container.database.get_session),
+    session: Union[Session, AsyncSession] = Depends(get_session),
 ):
     await token_assertion(
         token=token,
@@ -90,41 +148,156 @@ async def post_animal(
     )
     logger.info(f"register animal: {request}")
     os.makedirs(Configurations.work_directory, exist_ok=True)
-    local_file_path = os.path.join(Configurations.work_directory, f"{random_str()}.jpg")
-    with open(local_file_path, "wb+") as f:
-        f.write(file.file.read())
-    logger.info(f"temporarily saved file on {local_file_path}")
-    data = container.animal_usecase.register(
-        session=session,
-        request=request,
-        local_file_path=local_file_path,
-        background_tasks=background_tasks,
+    name = random_str()
+    upload_file_path = os.path.join(Configurations.work_directory, f"{name}.upload")
+    local_file_path = os.path.join(Configurations.work_directory, f"{name}.jpg")
+    await save_upload_file(
+        file=file,
+        destination_file_path=upload_file_path,
+        chunk_size=Configurations.upload_chunk_size,
+        max_size=Configurations.upload_max_size,
     )
+    try:
+        await container.image_normalizer.normalize(
+            source_file_path=upload_file_path,
+            destination_file_path=local_file_path,
+        )
+    except Exception as e:
+        logger.error(f"failed to normalize image: {e}")
+        if os.path.exists(local_file_path):
+            os.remove(local_file_path)
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail="invalid image",
+        )
+    finally:
+        os.remove(upload_file_path)
+    logger.info(f"temporarily saved file on {local_file_path}")
+    if isinstance(session, AsyncSession):
+        data = await container.animal_usecase.async_register(
+            session=session,
+            request=request,
+            local_file_path=local_file_path,
+            background_tasks=background_tasks,
+        )
+    else:
+        data = container.animal_usecase.register(
+            session=session,
+            request=request,
+            local_file_path=local_file_path,
+            background_tasks=background_tasks,
+        )
     return data
 
 
 @router.post("/search", response_model=AnimalSearchResponses)
 async def search_animal(
+    response: Response,
     background_tasks: BackgroundTasks,
     request: Optional[AnimalSearchRequest] = None,
     limit: int = 100,
     offset: int = 0,
+    paginate: bool = False,
+    cursor: Optional[str] = None,
     token: str = Header(...),
-    session: Session = Depends(container.database.get_session),
+    session: Union[Session, AsyncSession] = Depends(get_session),
 ):
-    await token_assertion(
-        token=token,
-        session=session,
-    )
+    with stage("search", "token_assertion"):
+        await token_assertion(
+            token=token,
+            session=session,
+        )
     if request is None:
         request = AnimalSearchRequest()
     logger.info(f"search animal: {request}")
-    data = container.animal_usecase.search(
-        request=request,
-        background_tasks=background_tasks,
-        limit=limit,
-        offset=offset,
-    )
+    next_cursor = None
+    if paginate or cursor is not None:
+        try:
+            if Configurations.async_mode:
+                data, next_cursor = await container.animal_usecase.async_search_after(
+                    request=request,
+                    limit=limit,
+                    cursor=cursor,
+                )
+            else:
+                data, next_cursor = container.animal_usecase.search_after(
+                    request=request,
+                    limit=limit,
+                    cursor=cursor,
+                )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+    elif Configurations.async_mode:
+        data = await container.animal_usecase.async_search(
+            request=request,
+            background_tasks=background_tasks,
+            limit=limit,
+            offset=offset,
+        )
+    else:
+        data = container.animal_usecase.search(
+            request=request,
+            background_tasks=background_tasks,
+            limit=limit,
+            offset=offset,
+        )
+    headers: Dict[str, str] = {}
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if Configurations.search_raw_response:
+        with stage("search", "serialize"):
+            return Response(
+                content=data.json(),
+                media_type="application/json",
+                headers=headers,
+            )
+    response.headers.update(headers)
+    return data
+
+
+@router.post("/search/batch", response_model=List[AnimalSearchResponses])
+async def search_animal_batch(
+    background_tasks: BackgroundTasks,
+    requests: List[AnimalSearchRequest],
+    limit: int = 100,
+    offset: int = 0,
+    token: str = Header(...),
+    session: Union[Session, AsyncSession] = Depends(get_session),
+):
+    if len(requests) > Configurations.search_batch_max_size:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"too many searches; max {Configurations.search_batch_max_size}",
+        )
+    with stage("search_batch", "token_assertion"):
+        await token_assertion(
+            token=token,
+            session=session,
+        )
+    logger.info(f"search animals: {requests}")
+    if Configurations.async_mode:
+        data = await container.animal_usecase.async_search_batch(
+            requests=requests,
+            background_tasks=background_tasks,
+            limit=limit,
+            offset=offset,
+        )
+    else:
+        data = container.animal_usecase.search_batch(
+            requests=requests,
+            background_tasks=background_tasks,
+            limit=limit,
+            offset=offset,
+        )
+    if Configurations.search_raw_response:
+        with stage("search_batch", "serialize"):
+            return Response(
+                content=f"[{','.join(d.json() for d in data)}]",
+                media_type="application/json",
+            )
     return data
 
 
@@ -132,15 +305,21 @@ async def search_animal(
 async def search_similar_animal(
     request: SimilarAnimalSearchRequest,
     token: str = Header(...),
-    session: Session = Depends(container.database.get_session),
+    session: Union[Session, AsyncSession] = Depends(get_session),
 ):
     await token_assertion(
         token=token,
         session=session,
     )
     logger.info(f"search similar animal: {request}")
-    data = container.animal_usecase.search_similar_image(
-        session=session,
-        request=request,
-    )
+    if isinstance(session, AsyncSession):
+        data = await container.animal_usecase.async_search_similar_image(
+            session=session,
+            request=request,
+        )
+    else:
+        data = container.animal_usecase.search_similar_image(
+            session=session,
+            request=request,
+        )
     return data
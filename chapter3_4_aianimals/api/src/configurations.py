@@ -7,11 +7,24 @@ class Configurations:
     version = os.getenv("VERSION", "0.0.0")
 
     run_environment = os.getenv("RUN_ENVIRONMENT", "local")
+    async_mode = bool(int(os.getenv("ASYNC_MODE", "0")))
+    tracing = bool(int(os.getenv("TRACING", "0")))
     gcs_bucket = os.getenv("GCS_BUCKET", "aianimals")
 
     key_file_path = os.environ["KEY_FILE_PATH"]
 
+    token_cache_size = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    token_cache_ttl_second = int(os.getenv("TOKEN_CACHE_TTL_SECOND", 10))
+    token_cache_redis = bool(int(os.getenv("TOKEN_CACHE_REDIS", "0")))
+    token_cache_redis_ttl_second = int(os.getenv("TOKEN_CACHE_REDIS_TTL_SECOND", 600))
+
     work_directory = os.getenv("WORK_DIRECTORY", "/tmp")
+    upload_chunk_size = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+    upload_max_size = int(os.getenv("UPLOAD_MAX_SIZE", 20 * 1024 * 1024))
+    upload_max_request_size = int(os.getenv("UPLOAD_MAX_REQUEST_SIZE", upload_max_size + 1024 * 1024))
+    image_max_side = int(os.getenv("IMAGE_MAX_SIDE", 1024))
+    image_jpeg_quality = int(os.getenv("IMAGE_JPEG_QUALITY", 85))
+    image_normalization_workers = int(os.getenv("IMAGE_NORMALIZATION_WORKERS", 2))
 
     animal_registry_queue = os.getenv("ANIMAL_REGISTRY_QUEUE", "animal")
 
@@ -20,7 +33,40 @@ class Configurations:
         if k.startswith("ANIMAL_VIOLATION_QUEUE_"):
             animal_violation_queues.append(v)
 
+    access_log_batch_size = int(os.getenv("ACCESS_LOG_BATCH_SIZE", 500))
+    access_log_flush_interval_second = float(os.getenv("ACCESS_LOG_FLUSH_INTERVAL_SECOND", 1.0))
+    access_log_buffer_size = int(os.getenv("ACCESS_LOG_BUFFER_SIZE", 10000))
+    access_log_max_request_size = int(os.getenv("ACCESS_LOG_MAX_REQUEST_SIZE", 1000))
+    access_log_durable = bool(int(os.getenv("ACCESS_LOG_DURABLE", "0")))
+    access_log_registry_queue = os.getenv("ACCESS_LOG_REGISTRY_QUEUE", "access_log")
+
+    local_cache_refresh_interval_second = float(os.getenv("LOCAL_CACHE_REFRESH_INTERVAL_SECOND", 300.0))
+
+    similar_word_cache_size = int(os.getenv("SIMILAR_WORD_CACHE_SIZE", 1024))
+    similar_word_cache_ttl_second = int(os.getenv("SIMILAR_WORD_CACHE_TTL_SECOND", 600))
+
+    search_cache_size = int(os.getenv("SEARCH_CACHE_SIZE", 1024))
+    search_cache_ttl_second = int(os.getenv("SEARCH_CACHE_TTL_SECOND", 60))
+    search_cache_redis_ttl_second = int(os.getenv("SEARCH_CACHE_REDIS_TTL_SECOND", 600))
+    search_cache_validate = bool(int(os.getenv("SEARCH_CACHE_VALIDATE", "0")))
+    search_response_validate = bool(int(os.getenv("SEARCH_RESPONSE_VALIDATE", "0")))
+    search_raw_response = bool(int(os.getenv("SEARCH_RAW_RESPONSE", "0")))
+    search_batch_max_size = int(os.getenv("SEARCH_BATCH_MAX_SIZE", 10))
+
+    http_max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+    http_max_keepalive_connections = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+    http_keepalive_expiry_second = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECOND", 30.0))
+    http_retries = int(os.getenv("HTTP_RETRIES", 3))
+
     learn_to_rank_url = os.getenv("LEARN_TO_RANK_URL", None)
     learn_to_rank_ab_test = bool(int(os.getenv("LEARN_TO_RANK_AB_TEST", "0")))
+    learn_to_rank_cache = bool(int(os.getenv("LEARN_TO_RANK_CACHE", "0" if learn_to_rank_ab_test else "1")))
+    learn_to_rank_timeout_second = float(os.getenv("LEARN_TO_RANK_TIMEOUT_SECOND", 10.0))
+    learn_to_rank_model_ttl_second = float(os.getenv("LEARN_TO_RANK_MODEL_TTL_SECOND", 10.0))
+    learn_to_rank_slow_call_second = float(os.getenv("LEARN_TO_RANK_SLOW_CALL_SECOND", 1.0))
+    learn_to_rank_circuit_failure_threshold = int(os.getenv("LEARN_TO_RANK_CIRCUIT_FAILURE_THRESHOLD", 5))
+    learn_to_rank_circuit_recovery_second = float(os.getenv("LEARN_TO_RANK_CIRCUIT_RECOVERY_SECOND", 30.0))
 
     similar_image_search_url = os.getenv("SIMILAR_IMAGE_SEARCH_URL", None)
+    similar_image_search_timeout_second = float(os.getenv("SIMILAR_IMAGE_SEARCH_TIMEOUT_SECOND", 10.0))
+    similar_image_search_from_index = bool(int(os.getenv("SIMILAR_IMAGE_SEARCH_FROM_INDEX", "1")))
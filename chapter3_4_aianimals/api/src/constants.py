@@ -63,5 +63,13 @@ class _CONSTANTS(object):
     def ANIMAL_SEARCH_CACHE_PREFIX() -> str:
         return "ANIMAL_SEARCH"
 
+    @constant
+    def TOKEN_CACHE_PREFIX() -> str:
+        return "TOKEN_VERIFIED"
+
+    @constant
+    def TOKEN_REVOKED_PREFIX() -> str:
+        return "TOKEN_REVOKED"
+
 
 CONSTANTS = _CONSTANTS()
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from pydantic import BaseModel, Extra
 
@@ -66,6 +66,13 @@ class AnimalModel(AnimalModelBase):
         extra = Extra.forbid
 
 
+class AnimalLikeModel(AnimalModelBase):
+    like: int = 0
+
+    class Config:
+        extra = Extra.forbid
+
+
 class AnimalSearchSortKey(Enum):
     SCORE = "score"
     LIKE = "like"
@@ -123,11 +130,22 @@ class AnimalSearchResult(BaseModel):
         extra = Extra.forbid
 
 
+class AnimalSearchCursor(BaseModel):
+    pit_id: str
+    search_after: List[Any]
+    seed: Optional[int] = None
+    offset: int = 0
+
+    class Config:
+        extra = Extra.forbid
+
+
 class AnimalSearchResults(BaseModel):
     hits: int
     max_score: Optional[float]
     results: List[AnimalSearchResult]
     offset: int
+    cursor: Optional[AnimalSearchCursor] = None
 
     class Config:
         extra = Extra.forbid
@@ -27,6 +27,15 @@ class StorageClientException(BaseException):
         return self.__message
 
 
+class SearchClientException(BaseException):
+    def __init__(self, message: str, detail: str):
+        super().__init__(message=message, detail=detail)
+        self.__message = f"search client exception: {self.message}"
+
+    def __str__(self):
+        return self.__message
+
+
 class APINotAllowedException(BaseException):
     def __init__(self, message: str, detail: str):
         super().__init__(message=message, detail=detail)
@@ -34,3 +43,12 @@ class APINotAllowedException(BaseException):
 
     def __str__(self):
         return self.__message
+
+
+class AccessLogBufferFullException(BaseException):
+    def __init__(self, message: str, detail: str):
+        super().__init__(message=message, detail=detail)
+        self.__message = f"access log buffer full exception: {self.message}"
+
+    def __str__(self):
+        return self.__message
@@ -1,9 +1,10 @@
 import os
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 import redis
+import redis.asyncio as aioredis
 
 logger = getLogger(__name__)
 
@@ -28,6 +29,64 @@ class AbstractCache(ABC):
     ) -> Optional[Union[str, int, float, bool, bytes]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_bytes(
+        self,
+        key: str,
+    ) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def mget(
+        self,
+        keys: List[str],
+    ) -> List[Optional[Union[str, int, float, bool, bytes]]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def mget_bytes(
+        self,
+        keys: List[str],
+    ) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_set(
+        self,
+        key: str,
+        value: Union[str, int, float, bool, bytes],
+        expire_second: int = 600,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_get(
+        self,
+        key: str,
+    ) -> Optional[Union[str, int, float, bool, bytes]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_get_bytes(
+        self,
+        key: str,
+    ) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_mget(
+        self,
+        keys: List[str],
+    ) -> List[Optional[Union[str, int, float, bool, bytes]]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_mget_bytes(
+        self,
+        keys: List[str],
+    ) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
 
 class RedisCache(AbstractCache):
     def __init__(self):
@@ -42,6 +101,24 @@ class RedisCache(AbstractCache):
             db=self.__redis_db,
             decode_responses=True,
         )
+        self.async_redis_client = aioredis.Redis(
+            host=self.__redis_host,
+            port=self.__redis_port,
+            db=self.__redis_db,
+            decode_responses=True,
+        )
+        self.binary_redis_client = redis.Redis(
+            host=self.__redis_host,
+            port=self.__redis_port,
+            db=self.__redis_db,
+            decode_responses=False,
+        )
+        self.async_binary_redis_client = aioredis.Redis(
+            host=self.__redis_host,
+            port=self.__redis_port,
+            db=self.__redis_db,
+            decode_responses=False,
+        )
 
     def set(
         self,
@@ -61,3 +138,72 @@ class RedisCache(AbstractCache):
     ) -> Optional[Union[str, int, float, bool, bytes]]:
         value = self.redis_client.get(key)
         return value
+
+    def get_bytes(
+        self,
+        key: str,
+    ) -> Optional[bytes]:
+        value = self.binary_redis_client.get(key)
+        return value
+
+    def mget(
+        self,
+        keys: List[str],
+    ) -> List[Optional[Union[str, int, float, bool, bytes]]]:
+        if len(keys) == 0:
+            return []
+        values = self.redis_client.mget(keys)
+        return values
+
+    def mget_bytes(
+        self,
+        keys: List[str],
+    ) -> List[Optional[bytes]]:
+        if len(keys) == 0:
+            return []
+        values = self.binary_redis_client.mget(keys)
+        return values
+
+    async def async_set(
+        self,
+        key: str,
+        value: Union[str, int, float, bool, bytes],
+        expire_second: int = 600,
+    ):
+        await self.async_redis_client.set(
+            name=key,
+            value=value,
+            ex=expire_second,
+        )
+
+    async def async_get(
+        self,
+        key: str,
+    ) -> Optional[Union[str, int, float, bool, bytes]]:
+        value = await self.async_redis_client.get(key)
+        return value
+
+    async def async_get_bytes(
+        self,
+        key: str,
+    ) -> Optional[bytes]:
+        value = await self.async_binary_redis_client.get(key)
+        return value
+
+    async def async_mget(
+        self,
+        keys: List[str],
+    ) -> List[Optional[Union[str, int, float, bool, bytes]]]:
+        if len(keys) == 0:
+            return []
+        values = await self.async_redis_client.mget(keys)
+        return values
+
+    async def async_mget_bytes(
+        self,
+        keys: List[str],
+    ) -> List[Optional[bytes]]:
+        if len(keys) == 0:
+            return []
+        values = await self.async_binary_redis_client.mget(keys)
+        return values
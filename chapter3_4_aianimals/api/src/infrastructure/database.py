@@ -1,9 +1,11 @@
 import os
 from abc import ABC, abstractmethod
 from logging import getLogger
+from typing import Optional
 
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 logger = getLogger(__name__)
@@ -12,14 +14,22 @@ logger = getLogger(__name__)
 class AbstractDatabase(ABC):
     def __init__(self):
         self.engine: Engine
+        self.async_engine: Optional[AsyncEngine] = None
 
     @abstractmethod
     def get_session(self):
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_async_session(self):
+        raise NotImplementedError
+
 
 class PostgreSQLDatabase(AbstractDatabase):
-    def __init__(self):
+    def __init__(
+        self,
+        async_mode: bool = False,
+    ):
         super().__init__()
 
         self.__postgres_username = os.getenv("POSTGRES_USER")
@@ -43,6 +53,21 @@ class PostgreSQLDatabase(AbstractDatabase):
             bind=self.engine,
         )
 
+        self.async_session_local: Optional[sessionmaker] = None
+        if async_mode:
+            self.__sql_alchemy_async_database_url = f"postgresql+asyncpg://{self.__postgres_username}:{self.__postgres_password}@{self.__postgres_server}:{self.__postgres_port}/{self.__postgres_db}"
+            self.async_engine = create_async_engine(
+                self.__sql_alchemy_async_database_url,
+                pool_recycle=3600,
+                echo=False,
+            )
+            self.async_session_local = sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=self.async_engine,
+                class_=AsyncSession,
+            )
+
     def get_session(self):
         db = self.session_local()
         try:
@@ -51,3 +76,14 @@ class PostgreSQLDatabase(AbstractDatabase):
             db.rollback()
         finally:
             db.close()
+
+    async def get_async_session(self):
+        if self.async_session_local is None:
+            raise ValueError("async session is not enabled; set ASYNC_MODE=1")
+        db = self.async_session_local()
+        try:
+            yield db
+        except:
+            await db.rollback()
+        finally:
+            await db.close()
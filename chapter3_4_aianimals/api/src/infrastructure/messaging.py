@@ -1,13 +1,23 @@
+import asyncio
 import json
 import os
+import queue
+import threading
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Dict
+from typing import Dict, List, Optional, Tuple, Union
 
+import aio_pika
 import pika
+from aio_pika.abc import AbstractRobustConnection
+from aio_pika.pool import Pool
+from pika.adapters.blocking_connection import BlockingChannel, ReturnedMessage
+from pika.exceptions import AMQPChannelError, AMQPConnectionError, UnroutableError
 
 logger = getLogger(__name__)
 
+MessageBody = Union[Dict, List[Dict]]
+
 
 class AbstractMessaging(ABC):
     def __init__(self):
@@ -32,10 +42,36 @@ class AbstractMessaging(ABC):
     def publish(
         self,
         queue_name: str,
-        body: Dict,
+        body: MessageBody,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def publish_batch(
+        self,
+        messages: List[Tuple[str, MessageBody]],
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_publish(
+        self,
+        queue_name: str,
+        body: MessageBody,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_publish_batch(
+        self,
+        messages: List[Tuple[str, MessageBody]],
     ):
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_close(self):
+        raise NotImplementedError
+
 
 class RabbitmqMessaging(AbstractMessaging):
     def __init__(self):
@@ -43,6 +79,9 @@ class RabbitmqMessaging(AbstractMessaging):
         self.__rabbitmq_host = os.getenv("RABBITMQ_HOST", "localhost")
         self.__rebbitmq_user = os.environ["RABBITMQ_USER"]
         self.__rabbitmq_password = os.environ["RABBITMQ_PASSWORD"]
+        self.__channel_pool_size = int(os.getenv("RABBITMQ_CHANNEL_POOL_SIZE", 4))
+        self.__acquire_timeout_second = float(os.getenv("RABBITMQ_ACQUIRE_TIMEOUT_SECOND", 10.0))
+        self.__publish_retries = int(os.getenv("RABBITMQ_PUBLISH_RETRIES", 2))
 
         self.__rabbitmq_credential = pika.PlainCredentials(
             self.__rebbitmq_user,
@@ -52,33 +91,215 @@ class RabbitmqMessaging(AbstractMessaging):
             self.__rabbitmq_host,
             credentials=self.__rabbitmq_credential,
         )
-        self.properties = pika.BasicProperties(content_type="application/json")
+        self.properties = pika.BasicProperties(
+            content_type="application/json",
+            delivery_mode=2,
+        )
+
+        self.__channels: "queue.LifoQueue[BlockingChannel]" = queue.LifoQueue()
+        self.__channel_count = 0
+        self.__returned: Dict[int, List[ReturnedMessage]] = {}
+        self.__lock = threading.Lock()
+
+        self.__async_connection_pool: Optional[Pool] = None
+        self.__async_channel_pool: Optional[Pool] = None
+        self.__async_lock: Optional[asyncio.Lock] = None
+
+    def __create_channel(self) -> BlockingChannel:
+        connection = pika.BlockingConnection(self.__params)
+        channel = connection.channel()
+        channel.tx_select()
+        returned: List[ReturnedMessage] = []
+        channel.add_on_return_callback(
+            lambda _channel, method, properties, body: returned.append(ReturnedMessage(method, properties, body))
+        )
+        self.__returned[id(channel)] = returned
+        return channel
+
+    def __is_alive(
+        self,
+        channel: BlockingChannel,
+    ) -> bool:
+        if not channel.is_open or not channel.connection.is_open:
+            return False
+        try:
+            channel.connection.process_data_events(time_limit=0)
+        except (AMQPConnectionError, AMQPChannelError) as e:
+            logger.warning(f"discard dead rabbitmq channel: {e}")
+            return False
+        return channel.is_open
+
+    def __acquire(self) -> BlockingChannel:
+        while True:
+            try:
+                channel = self.__channels.get_nowait()
+            except queue.Empty:
+                with self.__lock:
+                    create = self.__channel_count < self.__channel_pool_size
+                    if create:
+                        self.__channel_count += 1
+                if create:
+                    try:
+                        return self.__create_channel()
+                    except Exception as e:
+                        with self.__lock:
+                            self.__channel_count -= 1
+                        raise e
+                channel = self.__channels.get(timeout=self.__acquire_timeout_second)
+            if self.__is_alive(channel=channel):
+                return channel
+            self.__discard(channel=channel)
+
+    def __release(
+        self,
+        channel: BlockingChannel,
+    ):
+        if channel.is_open:
+            self.__channels.put(channel)
+        else:
+            self.__discard(channel=channel)
+
+    def __discard(
+        self,
+        channel: BlockingChannel,
+    ):
+        with self.__lock:
+            self.__channel_count -= 1
+        self.__returned.pop(id(channel), None)
+        try:
+            channel.connection.close()
+        except Exception:
+            pass
 
     def init_channel(self):
-        self.connection = pika.BlockingConnection(self.__params)
-        self.channel = self.connection.channel()
+        self.__release(channel=self.__acquire())
 
     def create_queue(
         self,
         queue_name: str,
     ):
-        self.channel.queue_declare(
-            queue=queue_name,
-            durable=True,
-        )
+        channel = self.__acquire()
+        try:
+            channel.queue_declare(
+                queue=queue_name,
+                durable=True,
+            )
+        except (AMQPConnectionError, AMQPChannelError) as e:
+            self.__discard(channel=channel)
+            raise e
+        self.__release(channel=channel)
 
     def close(self):
-        self.channel.close()
-        self.connection.close()
+        while True:
+            try:
+                channel = self.__channels.get_nowait()
+            except queue.Empty:
+                break
+            self.__discard(channel=channel)
 
     def publish(
         self,
         queue_name: str,
-        body: Dict,
+        body: MessageBody,
     ):
-        self.channel.basic_publish(
-            exchange="",
-            routing_key=queue_name,
-            body=json.dumps(body),
-            properties=self.properties,
-        )
+        self.publish_batch(messages=[(queue_name, body)])
+
+    def publish_batch(
+        self,
+        messages: List[Tuple[str, MessageBody]],
+    ):
+        for attempt in range(self.__publish_retries + 1):
+            channel = self.__acquire()
+            returned = self.__returned[id(channel)]
+            try:
+                for queue_name, body in messages:
+                    channel.basic_publish(
+                        exchange="",
+                        routing_key=queue_name,
+                        body=json.dumps(body),
+                        properties=self.properties,
+                        mandatory=True,
+                    )
+                channel.tx_commit()
+                channel.connection.process_data_events(time_limit=0)
+            except (AMQPConnectionError, AMQPChannelError) as e:
+                self.__discard(channel=channel)
+                if attempt >= self.__publish_retries:
+                    raise e
+                logger.warning(f"reconnect to rabbitmq after failure: {e}")
+                continue
+            except Exception as e:
+                self.__release(channel=channel)
+                raise e
+            if len(returned) > 0:
+                unroutable = returned[:]
+                returned.clear()
+                self.__release(channel=channel)
+                raise UnroutableError(unroutable)
+            self.__release(channel=channel)
+            return
+
+    async def __get_async_channel_pool(self) -> Pool:
+        if self.__async_lock is None:
+            self.__async_lock = asyncio.Lock()
+        async with self.__async_lock:
+            if self.__async_channel_pool is None:
+
+                async def get_connection() -> AbstractRobustConnection:
+                    return await aio_pika.connect_robust(
+                        host=self.__rabbitmq_host,
+                        login=self.__rebbitmq_user,
+                        password=self.__rabbitmq_password,
+                    )
+
+                connection_pool: Pool = Pool(
+                    get_connection,
+                    max_size=max(1, self.__channel_pool_size // 2),
+                )
+                self.__async_connection_pool = connection_pool
+
+                async def get_channel() -> aio_pika.RobustChannel:
+                    async with connection_pool.acquire() as connection:
+                        return await connection.channel(publisher_confirms=True)
+
+                self.__async_channel_pool = Pool(
+                    get_channel,
+                    max_size=self.__channel_pool_size,
+                )
+        return self.__async_channel_pool
+
+    async def async_publish(
+        self,
+        queue_name: str,
+        body: MessageBody,
+    ):
+        await self.async_publish_batch(messages=[(queue_name, body)])
+
+    async def async_publish_batch(
+        self,
+        messages: List[Tuple[str, MessageBody]],
+    ):
+        channel_pool = await self.__get_async_channel_pool()
+        async with channel_pool.acquire() as channel:
+            await asyncio.gather(
+                *[
+                    channel.default_exchange.publish(
+                        aio_pika.Message(
+                            body=json.dumps(body).encode(),
+                            content_type="application/json",
+                            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                        ),
+                        routing_key=queue_name,
+                        mandatory=True,
+                    )
+                    for queue_name, body in messages
+                ]
+            )
+
+    async def async_close(self):
+        if self.__async_channel_pool is not None:
+            await self.__async_channel_pool.close()
+            self.__async_channel_pool = None
+        if self.__async_connection_pool is not None:
+            await self.__async_connection_pool.close()
+            self.__async_connection_pool = None
@@ -1,13 +1,26 @@
 import os
+import random
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
-from elasticsearch import Elasticsearch
-from src.entities.animal import AnimalSearchQuery, AnimalSearchResult, AnimalSearchResults, AnimalSearchSortKey
+from elasticsearch import AsyncElasticsearch, Elasticsearch, NotFoundError
+from pydantic.datetime_parse import parse_datetime
+from src.entities.animal import (
+    AnimalSearchCursor,
+    AnimalSearchQuery,
+    AnimalSearchResult,
+    AnimalSearchResults,
+    AnimalSearchSortKey,
+)
+from src.exceptions.custom_exceptions import SearchClientException
+from src.middleware.tracing import record_search_took
 
 logger = getLogger(__name__)
 
+SEARCH_SOURCE_FIELDS: List[str] = [f for f in AnimalSearchResult.__fields__.keys() if f not in ("score", "id")]
+RANDOM_SEED_MAX = 2**31 - 1
+
 
 class AbstractSearch(ABC):
     def __init__(self):
@@ -23,14 +36,85 @@ class AbstractSearch(ABC):
     ) -> AnimalSearchResults:
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_search(
+        self,
+        index: str,
+        query: AnimalSearchQuery,
+        from_: int = 0,
+        size: int = 100,
+    ) -> AnimalSearchResults:
+        raise NotImplementedError
+
+    @abstractmethod
+    def multi_search(
+        self,
+        index: str,
+        queries: List[AnimalSearchQuery],
+        from_: int = 0,
+        size: int = 100,
+    ) -> List[AnimalSearchResults]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_multi_search(
+        self,
+        index: str,
+        queries: List[AnimalSearchQuery],
+        from_: int = 0,
+        size: int = 100,
+    ) -> List[AnimalSearchResults]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_documents(
+        self,
+        index: str,
+        ids: List[str],
+    ) -> Dict[str, AnimalSearchResult]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_get_documents(
+        self,
+        index: str,
+        ids: List[str],
+    ) -> Dict[str, AnimalSearchResult]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_after(
+        self,
+        index: str,
+        query: AnimalSearchQuery,
+        size: int = 100,
+        cursor: Optional[AnimalSearchCursor] = None,
+    ) -> AnimalSearchResults:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_search_after(
+        self,
+        index: str,
+        query: AnimalSearchQuery,
+        size: int = 100,
+        cursor: Optional[AnimalSearchCursor] = None,
+    ) -> AnimalSearchResults:
+        raise NotImplementedError
+
 
 class ElasticsearchClient(AbstractSearch):
-    def __init__(self):
+    def __init__(
+        self,
+        validate: bool = False,
+    ):
         super().__init__()
+        self.validate = validate
         self.__es_host = os.getenv("ES_HOST", "http://es:9200")
         self.__es_verify_certs = bool(int(os.getenv("ES_VERIFY_CERTS", 0)))
         self.__es_user = os.getenv("ES_USER", None)
         self.__es_password = os.getenv("ES_PASSWORD", None)
+        self.__pit_keep_alive = os.getenv("ES_PIT_KEEP_ALIVE", "1m")
         self.__basic_auth = (
             (self.__es_user, self.__es_password)
             if self.__es_user is not None and self.__es_password is not None
@@ -41,6 +125,11 @@ class ElasticsearchClient(AbstractSearch):
             verify_certs=self.__es_verify_certs,
             basic_auth=self.__basic_auth,
         )
+        self.async_es_client = AsyncElasticsearch(
+            hosts=[self.__es_host],
+            verify_certs=self.__es_verify_certs,
+            basic_auth=self.__basic_auth,
+        )
 
     def __add_must(
         self,
@@ -83,20 +172,14 @@ class ElasticsearchClient(AbstractSearch):
     def __make_sort(
         self,
         key: Optional[AnimalSearchSortKey],
-    ) -> List[Union[str, Dict]]:
-        sort: List[Union[str, Dict]] = []
+    ) -> List[Union[str, Mapping[str, Any]]]:
+        sort: List[Union[str, Mapping[str, Any]]] = []
         if key is not None and key:
-            if key == AnimalSearchSortKey.RANDOM:
-                sort.append(
-                    {
-                        "_script": {
-                            "script": "Math.random() * 200000",
-                            "type": "number",
-                            "order": "asc",
-                        }
-                    }
-                )
-            elif key == AnimalSearchSortKey.SCORE or key == AnimalSearchSortKey.LEARN_TO_RANK:
+            if (
+                key == AnimalSearchSortKey.RANDOM
+                or key == AnimalSearchSortKey.SCORE
+                or key == AnimalSearchSortKey.LEARN_TO_RANK
+            ):
                 sort.append("_score")
             else:
                 sort.append(
@@ -108,13 +191,27 @@ class ElasticsearchClient(AbstractSearch):
                 )
         return sort
 
-    def search(
+    def __make_random_score(
+        self,
+        q: Dict,
+        seed: int,
+    ) -> Dict:
+        return {
+            "function_score": {
+                "query": q,
+                "random_score": {
+                    "seed": seed,
+                    "field": "_seq_no",
+                },
+                "boost_mode": "replace",
+            }
+        }
+
+    def __make_query(
         self,
-        index: str,
         query: AnimalSearchQuery,
-        from_: int = 0,
-        size: int = 100,
-    ) -> AnimalSearchResults:
+        seed: Optional[int] = None,
+    ) -> Tuple[Dict, List[Union[str, Mapping[str, Any]]]]:
         q: Dict[str, Dict] = {"bool": {}}
         musts = []
         shoulds = []
@@ -162,14 +259,47 @@ class ElasticsearchClient(AbstractSearch):
 
         if len(q["bool"]) == 0:
             q = {"match_all": {}}
+        if query.sort_by == AnimalSearchSortKey.RANDOM:
+            q = self.__make_random_score(
+                q=q,
+                seed=seed if seed is not None else random.randint(0, RANDOM_SEED_MAX),
+            )
         sort = self.__make_sort(key=query.sort_by if query is not None else None)
-        searched = self.es_client.search(
-            index=index,
-            query=q,
-            sort=sort,
-            from_=from_,
-            size=size,
+        return q, sort
+
+    def __make_search_result(
+        self,
+        id: str,
+        score: Optional[float],
+        source: Dict,
+    ) -> AnimalSearchResult:
+        if self.validate:
+            return AnimalSearchResult(
+                score=score,
+                id=id,
+                **source,
+            )
+        return AnimalSearchResult.construct(
+            score=score,
+            id=id,
+            name=source["name"],
+            description=source["description"],
+            photo_url=source["photo_url"],
+            animal_category_name_en=source["animal_category_name_en"],
+            animal_category_name_ja=source["animal_category_name_ja"],
+            animal_subcategory_name_en=source["animal_subcategory_name_en"],
+            animal_subcategory_name_ja=source["animal_subcategory_name_ja"],
+            user_handle_name=source["user_handle_name"],
+            like=source["like"],
+            created_at=parse_datetime(source["created_at"]),
         )
+
+    def __parse_results(
+        self,
+        searched: Dict,
+        from_: int = 0,
+        size: int = 100,
+    ) -> AnimalSearchResults:
         if searched["hits"]["total"]["value"] == 0:
             return AnimalSearchResults(
                 hits=0,
@@ -185,19 +315,369 @@ class ElasticsearchClient(AbstractSearch):
         )
         for r in searched["hits"]["hits"]:
             results.results.append(
-                AnimalSearchResult(
-                    score=r["_score"],
+                self.__make_search_result(
                     id=r["_id"],
-                    name=r["_source"]["name"],
-                    description=r["_source"]["description"],
-                    photo_url=r["_source"]["photo_url"],
-                    animal_category_name_en=r["_source"]["animal_category_name_en"],
-                    animal_category_name_ja=r["_source"]["animal_category_name_ja"],
-                    animal_subcategory_name_en=r["_source"]["animal_subcategory_name_en"],
-                    animal_subcategory_name_ja=r["_source"]["animal_subcategory_name_ja"],
-                    user_handle_name=r["_source"]["user_handle_name"],
-                    like=r["_source"]["like"],
-                    created_at=r["_source"]["created_at"],
+                    score=r["_score"],
+                    source=r["_source"],
                 ),
             )
         return results
+
+    def search(
+        self,
+        index: str,
+        query: AnimalSearchQuery,
+        from_: int = 0,
+        size: int = 100,
+    ) -> AnimalSearchResults:
+        q, sort = self.__make_query(query=query)
+        searched = self.es_client.search(
+            index=index,
+            query=q,
+            sort=sort,
+            from_=from_,
+            size=size,
+            source_includes=SEARCH_SOURCE_FIELDS,
+        )
+        record_search_took(
+            index=index,
+            took_millisecond=searched["took"],
+        )
+        return self.__parse_results(
+            searched=searched.body,
+            from_=from_,
+            size=size,
+        )
+
+    async def async_search(
+        self,
+        index: str,
+        query: AnimalSearchQuery,
+        from_: int = 0,
+        size: int = 100,
+    ) -> AnimalSearchResults:
+        q, sort = self.__make_query(query=query)
+        searched = await self.async_es_client.search(
+            index=index,
+            query=q,
+            sort=sort,
+            from_=from_,
+            size=size,
+            source_includes=SEARCH_SOURCE_FIELDS,
+        )
+        record_search_took(
+            index=index,
+            took_millisecond=searched["took"],
+        )
+        return self.__parse_results(
+            searched=searched.body,
+            from_=from_,
+            size=size,
+        )
+
+    def __make_multi_search_body(
+        self,
+        index: str,
+        queries: List[AnimalSearchQuery],
+        from_: int = 0,
+        size: int = 100,
+    ) -> List[Mapping[str, Any]]:
+        searches: List[Mapping[str, Any]] = []
+        for query in queries:
+            q, sort = self.__make_query(query=query)
+            searches.append({"index": index})
+            searches.append(
+                {
+                    "query": q,
+                    "sort": sort,
+                    "from": from_,
+                    "size": size,
+                    "_source": {
+                        "includes": SEARCH_SOURCE_FIELDS,
+                    },
+                }
+            )
+        return searches
+
+    def __parse_multi_search_results(
+        self,
+        index: str,
+        searched: Dict,
+        from_: int = 0,
+        size: int = 100,
+    ) -> List[AnimalSearchResults]:
+        results: List[AnimalSearchResults] = []
+        for response in searched["responses"]:
+            if "error" in response:
+                raise SearchClientException(
+                    message="failed to search in multi search",
+                    detail=str(response["error"]),
+                )
+            record_search_took(
+                index=index,
+                took_millisecond=response.get("took"),
+            )
+            results.append(
+                self.__parse_results(
+                    searched=response,
+                    from_=from_,
+                    size=size,
+                )
+            )
+        return results
+
+    def multi_search(
+        self,
+        index: str,
+        queries: List[AnimalSearchQuery],
+        from_: int = 0,
+        size: int = 100,
+    ) -> List[AnimalSearchResults]:
+        if len(queries) == 0:
+            return []
+        searched = self.es_client.msearch(
+            searches=self.__make_multi_search_body(
+                index=index,
+                queries=queries,
+                from_=from_,
+                size=size,
+            ),
+        )
+        return self.__parse_multi_search_results(
+            index=index,
+            searched=searched.body,
+            from_=from_,
+            size=size,
+        )
+
+    async def async_multi_search(
+        self,
+        index: str,
+        queries: List[AnimalSearchQuery],
+        from_: int = 0,
+        size: int = 100,
+    ) -> List[AnimalSearchResults]:
+        if len(queries) == 0:
+            return []
+        searched = await self.async_es_client.msearch(
+            searches=self.__make_multi_search_body(
+                index=index,
+                queries=queries,
+                from_=from_,
+                size=size,
+            ),
+        )
+        return self.__parse_multi_search_results(
+            index=index,
+            searched=searched.body,
+            from_=from_,
+            size=size,
+        )
+
+    def __parse_documents(
+        self,
+        searched: Dict,
+    ) -> Dict[str, AnimalSearchResult]:
+        return {
+            d["_id"]: self.__make_search_result(
+                id=d["_id"],
+                score=None,
+                source=d["_source"],
+            )
+            for d in searched["docs"]
+            if d.get("found", False)
+        }
+
+    def get_documents(
+        self,
+        index: str,
+        ids: List[str],
+    ) -> Dict[str, AnimalSearchResult]:
+        if len(ids) == 0:
+            return {}
+        searched = self.es_client.mget(
+            index=index,
+            ids=ids,
+            source_includes=SEARCH_SOURCE_FIELDS,
+        )
+        return self.__parse_documents(searched=searched.body)
+
+    async def async_get_documents(
+        self,
+        index: str,
+        ids: List[str],
+    ) -> Dict[str, AnimalSearchResult]:
+        if len(ids) == 0:
+            return {}
+        searched = await self.async_es_client.mget(
+            index=index,
+            ids=ids,
+            source_includes=SEARCH_SOURCE_FIELDS,
+        )
+        return self.__parse_documents(searched=searched.body)
+
+    def __make_seed(
+        self,
+        query: AnimalSearchQuery,
+        cursor: Optional[AnimalSearchCursor] = None,
+    ) -> Optional[int]:
+        if cursor is not None:
+            return cursor.seed
+        if query.sort_by == AnimalSearchSortKey.RANDOM:
+            return random.randint(0, RANDOM_SEED_MAX)
+        return None
+
+    def __make_search_after_params(
+        self,
+        pit_id: str,
+        q: Dict,
+        sort: List[Union[str, Mapping[str, Any]]],
+        size: int,
+        cursor: Optional[AnimalSearchCursor] = None,
+    ) -> Dict:
+        params = dict(
+            pit={
+                "id": pit_id,
+                "keep_alive": self.__pit_keep_alive,
+            },
+            query=q,
+            sort=sort if len(sort) > 0 else ["_score"],
+            size=size,
+            source_includes=SEARCH_SOURCE_FIELDS,
+        )
+        if cursor is not None:
+            params["search_after"] = cursor.search_after
+        return params
+
+    def __parse_search_after_results(
+        self,
+        searched: Dict,
+        pit_id: str,
+        seed: Optional[int],
+        size: int,
+        cursor: Optional[AnimalSearchCursor] = None,
+    ) -> AnimalSearchResults:
+        offset = cursor.offset if cursor is not None else 0
+        results = self.__parse_results(
+            searched=searched,
+            from_=offset,
+            size=size,
+        )
+        hits = searched["hits"]["hits"]
+        results.offset = offset + len(hits)
+        if len(hits) == 0 or len(hits) < size:
+            return results
+        results.cursor = AnimalSearchCursor(
+            pit_id=searched.get("pit_id", pit_id),
+            search_after=hits[-1]["sort"],
+            seed=seed,
+            offset=results.offset,
+        )
+        return results
+
+    def search_after(
+        self,
+        index: str,
+        query: AnimalSearchQuery,
+        size: int = 100,
+        cursor: Optional[AnimalSearchCursor] = None,
+    ) -> AnimalSearchResults:
+        seed = self.__make_seed(
+            query=query,
+            cursor=cursor,
+        )
+        q, sort = self.__make_query(
+            query=query,
+            seed=seed,
+        )
+        if cursor is None:
+            pit_id = self.es_client.open_point_in_time(
+                index=index,
+                keep_alive=self.__pit_keep_alive,
+            )["id"]
+        else:
+            pit_id = cursor.pit_id
+        try:
+            searched = self.es_client.search(
+                **self.__make_search_after_params(
+                    pit_id=pit_id,
+                    q=q,
+                    sort=sort,
+                    size=size,
+                    cursor=cursor,
+                )
+            )
+        except NotFoundError as e:
+            logger.info(f"point in time {pit_id} not found: {e}")
+            raise ValueError("expired cursor")
+        record_search_took(
+            index=index,
+            took_millisecond=searched["took"],
+        )
+        results = self.__parse_search_after_results(
+            searched=searched.body,
+            pit_id=pit_id,
+            seed=seed,
+            size=size,
+            cursor=cursor,
+        )
+        if results.cursor is None:
+            try:
+                self.es_client.close_point_in_time(id=searched.get("pit_id", pit_id))
+            except Exception as e:
+                logger.warning(f"failed to close point in time: {e}")
+        return results
+
+    async def async_search_after(
+        self,
+        index: str,
+        query: AnimalSearchQuery,
+        size: int = 100,
+        cursor: Optional[AnimalSearchCursor] = None,
+    ) -> AnimalSearchResults:
+        seed = self.__make_seed(
+            query=query,
+            cursor=cursor,
+        )
+        q, sort = self.__make_query(
+            query=query,
+            seed=seed,
+        )
+        if cursor is None:
+            opened = await self.async_es_client.open_point_in_time(
+                index=index,
+                keep_alive=self.__pit_keep_alive,
+            )
+            pit_id = opened["id"]
+        else:
+            pit_id = cursor.pit_id
+        try:
+            searched = await self.async_es_client.search(
+                **self.__make_search_after_params(
+                    pit_id=pit_id,
+                    q=q,
+                    sort=sort,
+                    size=size,
+                    cursor=cursor,
+                )
+            )
+        except NotFoundError as e:
+            logger.info(f"point in time {pit_id} not found: {e}")
+            raise ValueError("expired cursor")
+        record_search_took(
+            index=index,
+            took_millisecond=searched["took"],
+        )
+        results = self.__parse_search_after_results(
+            searched=searched.body,
+            pit_id=pit_id,
+            seed=seed,
+            size=size,
+            cursor=cursor,
+        )
+        if results.cursor is None:
+            try:
+                await self.async_es_client.close_point_in_time(id=searched.get("pit_id", pit_id))
+            except Exception as e:
+                logger.warning(f"failed to close point in time: {e}")
+        return results
@@ -2,9 +2,18 @@ from logging import getLogger
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
+from prometheus_fastapi_instrumentator import Instrumentator, metrics
 from src.api import access_log, animal, animal_category, health_check, like, metadata, user, violation
 from src.configurations import Configurations
-from src.exceptions.custom_exceptions import APINotAllowedException, DatabaseException, StorageClientException
+from src.exceptions.custom_exceptions import (
+    AccessLogBufferFullException,
+    APINotAllowedException,
+    DatabaseException,
+    SearchClientException,
+    StorageClientException,
+)
+from src.middleware.upload import UploadSizeLimitMiddleware
+from src.registry.container import container
 
 logger = getLogger(__name__)
 
@@ -20,6 +29,17 @@ app = FastAPI(
     redoc_url=f"{base_prefix}/redoc",
 )
 
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_size=Configurations.upload_max_request_size,
+)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    container.close()
+    await container.async_close()
+
 
 @app.exception_handler(DatabaseException)
 async def database_exception_handler(
@@ -45,6 +65,18 @@ async def storage_client_exception_handler(
     )
 
 
+@app.exception_handler(SearchClientException)
+async def search_client_exception_handler(
+    request: Request,
+    e: SearchClientException,
+):
+    logger.error(e)
+    return JSONResponse(
+        status_code=500,
+        content={"message": e.message},
+    )
+
+
 @app.exception_handler(APINotAllowedException)
 async def api_not_allowed_exception_handler(
     request: Request,
@@ -57,6 +89,18 @@ async def api_not_allowed_exception_handler(
     )
 
 
+@app.exception_handler(AccessLogBufferFullException)
+async def access_log_buffer_full_exception_handler(
+    request: Request,
+    e: AccessLogBufferFullException,
+):
+    logger.error(e)
+    return JSONResponse(
+        status_code=503,
+        content={"message": e.message},
+    )
+
+
 app.include_router(
     health_check.router,
     prefix=f"{base_prefix}/health-check",
@@ -104,3 +148,8 @@ app.include_router(
     prefix=f"{base_prefix}/metadata",
     tags=["metadata"],
 )
+
+instrumentator = Instrumentator()
+instrumentator.add(metrics.latency()).add(metrics.requests())
+instrumentator.instrument(app)
+instrumentator.expose(app)
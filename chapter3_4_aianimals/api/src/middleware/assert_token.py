@@ -1,17 +1,65 @@
-from typing import Tuple
+from typing import Tuple, Union
 
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.constants import CONSTANTS
-from src.entities.user import UserLoginQuery
+from src.entities.user import UserLoginQuery, UserQuery
+from src.middleware.tracing import record_cache
 from src.registry.container import container
 from starlette.status import HTTP_403_FORBIDDEN
 
 
 async def token_assertion(
     token: str,
-    session: Session,
+    session: Union[Session, AsyncSession],
 ) -> Tuple[bool, str]:
+    cached_user_id = container.token_cache.get(token=token)
+    if cached_user_id is not None:
+        record_cache(cache="token", hit=1)
+        return True, cached_user_id
+
+    if isinstance(session, AsyncSession):
+        shared_user_id = await container.token_cache.async_get_shared(token=token)
+    else:
+        shared_user_id = container.token_cache.get_shared(token=token)
+    if shared_user_id is not None:
+        user_query = UserQuery(id=shared_user_id)
+        if isinstance(session, AsyncSession):
+            users = await session.run_sync(
+                lambda s: container.user_repository.select(
+                    session=s,
+                    query=user_query,
+                    limit=1,
+                    offset=0,
+                )
+            )
+        else:
+            users = container.user_repository.select(
+                session=session,
+                query=user_query,
+                limit=1,
+                offset=0,
+            )
+        if len(users) == 0:
+            if isinstance(session, AsyncSession):
+                await container.token_cache.async_invalidate_user(user_id=shared_user_id)
+            else:
+                container.token_cache.invalidate_user(user_id=shared_user_id)
+            record_cache(cache="token", miss=1)
+            raise HTTPException(
+                status_code=HTTP_403_FORBIDDEN,
+                detail="authorization failure",
+            )
+        container.token_cache.set(
+            token=token,
+            user_id=shared_user_id,
+            shared=False,
+        )
+        record_cache(cache="token", hit=1)
+        return True, shared_user_id
+    record_cache(cache="token", miss=1)
+
     try:
         raw_token = container.crypt.decrypt(enc_text=token)
     except Exception:
@@ -31,13 +79,31 @@ async def token_assertion(
         handle_name=handle_name,
         password=password,
     )
-    login_assertion = container.user_repository.assert_login(
-        session=session,
-        login_query=login_query,
-    )
+    if isinstance(session, AsyncSession):
+        login_assertion = await session.run_sync(
+            lambda s: container.user_repository.assert_login(
+                session=s,
+                login_query=login_query,
+            )
+        )
+    else:
+        login_assertion = container.user_repository.assert_login(
+            session=session,
+            login_query=login_query,
+        )
     if login_assertion is None:
         raise HTTPException(
             status_code=HTTP_403_FORBIDDEN,
             detail="authorization failure",
         )
+    if isinstance(session, AsyncSession):
+        await container.token_cache.async_set(
+            token=token,
+            user_id=user_id,
+        )
+    else:
+        container.token_cache.set(
+            token=token,
+            user_id=user_id,
+        )
     return True, user_id
@@ -0,0 +1,71 @@
+import time
+from enum import Enum
+from logging import getLogger
+from threading import Lock
+from typing import List
+
+logger = getLogger(__name__)
+
+
+class CIRCUIT_STATE(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    @staticmethod
+    def get_list() -> List[str]:
+        return [v.value for v in CIRCUIT_STATE.__members__.values()]
+
+
+class CircuitBreaker(object):
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_second: float = 30.0,
+        slow_call_second: float = 1.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_second = recovery_second
+        self.slow_call_second = slow_call_second
+        self.state = CIRCUIT_STATE.CLOSED
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__lock = Lock()
+
+    def allow(self) -> bool:
+        with self.__lock:
+            if self.state == CIRCUIT_STATE.CLOSED:
+                return True
+            if self.state == CIRCUIT_STATE.OPEN and time.time() - self.__opened_at >= self.recovery_second:
+                logger.info(f"circuit {self.name} half open")
+                self.state = CIRCUIT_STATE.HALF_OPEN
+                return True
+            return False
+
+    def record(
+        self,
+        success: bool,
+        elapsed_second: float = 0.0,
+    ):
+        if success and elapsed_second <= self.slow_call_second:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def record_success(self):
+        with self.__lock:
+            if self.state != CIRCUIT_STATE.CLOSED:
+                logger.info(f"circuit {self.name} closed")
+            self.state = CIRCUIT_STATE.CLOSED
+            self.__failures = 0
+
+    def record_failure(self):
+        with self.__lock:
+            self.__failures += 1
+            if self.state == CIRCUIT_STATE.HALF_OPEN or self.__failures >= self.failure_threshold:
+                if self.state != CIRCUIT_STATE.OPEN:
+                    logger.warning(f"circuit {self.name} open after {self.__failures} failures")
+                self.state = CIRCUIT_STATE.OPEN
+                self.__opened_at = time.time()
@@ -0,0 +1,41 @@
+import base64
+import binascii
+import json
+from typing import Dict, List, Optional
+
+
+def encode_cursor(last_id: str) -> str:
+    return base64.urlsafe_b64encode(last_id.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        value = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(f"invalid cursor: {cursor}")
+    if value == "":
+        raise ValueError(f"invalid cursor: {cursor}")
+    return value
+
+
+def make_next_cursor(
+    ids: List[str],
+    limit: int,
+) -> Optional[str]:
+    if len(ids) == 0 or len(ids) < limit:
+        return None
+    return encode_cursor(last_id=ids[-1])
+
+
+def encode_json_cursor(value: Dict) -> str:
+    return encode_cursor(last_id=json.dumps(value, separators=(",", ":")))
+
+
+def decode_json_cursor(cursor: str) -> Dict:
+    try:
+        value = json.loads(decode_cursor(cursor=cursor))
+    except json.JSONDecodeError:
+        raise ValueError(f"invalid cursor: {cursor}")
+    if not isinstance(value, dict):
+        raise ValueError(f"invalid cursor: {cursor}")
+    return value
@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock
+from typing import Any, Hashable, Optional, Tuple
+
+logger = getLogger(__name__)
+
+
+class LRUCache(object):
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_second: Optional[float] = None,
+    ):
+        self.max_size = max_size
+        self.ttl_second = ttl_second
+        self.__lock = Lock()
+        self.__entries: OrderedDict[Hashable, Tuple[Any, Optional[float]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(
+        self,
+        key: Hashable,
+    ) -> Optional[Any]:
+        with self.__lock:
+            entry = self.__entries.get(key, None)
+            if entry is None:
+                return None
+            value, expire_at = entry
+            if expire_at is not None and expire_at < time.time():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+    ):
+        expire_at = time.time() + self.ttl_second if self.ttl_second is not None else None
+        with self.__lock:
+            self.__entries[key] = (value, expire_at)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def delete(
+        self,
+        key: Hashable,
+    ):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
@@ -0,0 +1,110 @@
+import time
+from logging import getLogger
+from typing import Optional, Union
+
+from opentelemetry import trace
+from prometheus_client import Counter, Histogram
+from src.configurations import Configurations
+
+logger = getLogger(__name__)
+
+tracer = trace.get_tracer("aianimals.api")
+
+STAGE_LATENCY = Histogram(
+    "aianimals_stage_latency_seconds",
+    "latency of each stage in a request",
+    ["operation", "stage"],
+)
+CACHE_REQUESTS = Counter(
+    "aianimals_cache_requests_total",
+    "cache lookups by cache and result",
+    ["cache", "result"],
+)
+CACHE_LATENCY = Histogram(
+    "aianimals_cache_latency_seconds",
+    "cache lookup latency by cache",
+    ["cache"],
+)
+SEARCH_TOOK = Histogram(
+    "aianimals_search_took_seconds",
+    "elasticsearch took time reported in search responses",
+    ["index"],
+)
+
+
+class NoopStage(object):
+    def __enter__(self) -> "NoopStage":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> Optional[bool]:
+        return None
+
+
+class Stage(object):
+    def __init__(
+        self,
+        operation: str,
+        name: str,
+    ):
+        self.operation = operation
+        self.name = name
+        self.__span = tracer.start_as_current_span(f"{self.operation}.{self.name}")
+        self.__started_at = 0.0
+
+    def __enter__(self) -> "Stage":
+        self.__span.__enter__()
+        self.__started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> Optional[bool]:
+        STAGE_LATENCY.labels(
+            operation=self.operation,
+            stage=self.name,
+        ).observe(time.perf_counter() - self.__started_at)
+        return self.__span.__exit__(exc_type, exc_value, traceback)
+
+
+NOOP_STAGE = NoopStage()
+
+
+def stage(
+    operation: str,
+    name: str,
+) -> Union[Stage, NoopStage]:
+    if not Configurations.tracing:
+        return NOOP_STAGE
+    return Stage(
+        operation=operation,
+        name=name,
+    )
+
+
+def record_cache(
+    cache: str,
+    hit: int = 0,
+    miss: int = 0,
+):
+    if not Configurations.tracing:
+        return
+    if hit > 0:
+        CACHE_REQUESTS.labels(cache=cache, result="hit").inc(hit)
+    if miss > 0:
+        CACHE_REQUESTS.labels(cache=cache, result="miss").inc(miss)
+
+
+def record_cache_latency(
+    cache: str,
+    elapsed_second: float,
+):
+    if not Configurations.tracing:
+        return
+    CACHE_LATENCY.labels(cache=cache).observe(elapsed_second)
+
+
+def record_search_took(
+    index: str,
+    took_millisecond: Optional[int],
+):
+    if not Configurations.tracing or took_millisecond is None:
+        return
+    SEARCH_TOOK.labels(index=index).observe(took_millisecond / 1000)
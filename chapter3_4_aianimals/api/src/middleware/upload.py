@@ -0,0 +1,111 @@
+import os
+from logging import getLogger
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.status import HTTP_413_REQUEST_ENTITY_TOO_LARGE
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = getLogger(__name__)
+
+
+class RequestTooLargeException(Exception):
+    pass
+
+
+class UploadSizeLimitMiddleware(object):
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_size: int = 21 * 1024 * 1024,
+    ):
+        self.app = app
+        self.max_size = max_size
+
+    def __make_response(self) -> JSONResponse:
+        return JSONResponse(
+            status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"message": f"request exceeds {self.max_size} bytes"},
+        )
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_size:
+            logger.info(f"reject upload of {content_length} bytes")
+            await self.__make_response()(scope, receive, send)
+            return
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    too_large = True
+                    raise RequestTooLargeException()
+            return message
+
+        async def limited_send(message: Message):
+            nonlocal response_started
+            if too_large and not response_started:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except RequestTooLargeException:
+            if response_started:
+                raise
+        if too_large and not response_started:
+            logger.info(f"reject upload over {self.max_size} bytes after {received} bytes")
+            await self.__make_response()(scope, receive, send)
+
+
+async def save_upload_file(
+    file: UploadFile,
+    destination_file_path: str,
+    chunk_size: int = 1024 * 1024,
+    max_size: int = 20 * 1024 * 1024,
+) -> int:
+    size = 0
+    try:
+        async with aiofiles.open(destination_file_path, "wb") as f:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"file exceeds {max_size} bytes",
+                    )
+                await f.write(chunk)
+    except Exception as e:
+        if os.path.exists(destination_file_path):
+            os.remove(destination_file_path)
+        raise e
+    finally:
+        await file.close()
+    logger.info(f"saved {size} bytes on {destination_file_path}")
+    return size
@@ -1,5 +1,6 @@
 from logging import getLogger
 
+import httpx
 from src.configurations import Configurations
 from src.constants import RUN_ENVIRONMENT
 from src.infrastructure.cache import AbstractCache, RedisCache
@@ -7,6 +8,7 @@ from src.infrastructure.database import AbstractDatabase, PostgreSQLDatabase
 from src.infrastructure.messaging import AbstractMessaging, RabbitmqMessaging
 from src.infrastructure.search import AbstractSearch, ElasticsearchClient
 from src.infrastructure.storage import AbstractStorage, LocalStorage
+from src.middleware.circuit_breaker import CircuitBreaker
 from src.middleware.crypt import AbstractCrypt, Crypt
 from src.repository.access_log_repository import AbstractAccessLogRepository, AccessLogRepository
 from src.repository.animal_category_repository import AbstractAnimalCategoryRepository, AnimalCategoryRepository
@@ -19,13 +21,17 @@ from src.repository.like_repository import AbstractLikeRepository, LikeRepositor
 from src.repository.user_repository import AbstractUserRepository, UserRepository
 from src.repository.violation_repository import AbstractViolationRepository, ViolationRepository
 from src.repository.violation_type_repository import AbstractViolationTypeRepository, ViolationTypeRepository
+from src.service.access_log_buffer import AbstractAccessLogBuffer, AccessLogBuffer, QueueAccessLogBuffer
+from src.service.image_normalizer import AbstractImageNormalizer, ImageNormalizer
 from src.service.learn_to_rank import AbstractLearnToRankService, LearnToRankService, PseudoLearnToRankService
 from src.service.local_cache import AbstractLocalCache, LocalCache
+from src.service.search_cache import AbstractSearchCache, SearchCache
 from src.service.similar_image_search import (
     AbstractSimilarImageSearchService,
     PseudoSimilarImageSearchService,
     SimilarImageSearchService,
 )
+from src.service.token_cache import AbstractTokenCache, TokenCache
 from src.usecase.access_log_usecase import AbstractAccessLogUsecase, AccessLogUsecase
 from src.usecase.animal_category_usecase import AbstractAnimalCategoryUsecase, AnimalCategoryUsecase
 from src.usecase.animal_subcategory_usecase import AbstractAnimalSubcategoryUsecase, AnimalSubcategoryUsecase
@@ -50,7 +56,11 @@ class Container(object):
         crypt: AbstractCrypt,
         learn_to_rank: AbstractLearnToRankService,
         similar_image_search: AbstractSimilarImageSearchService,
+        http_client: httpx.Client,
+        async_http_client: httpx.AsyncClient,
     ):
+        self.http_client = http_client
+        self.async_http_client = async_http_client
         self.database = database
         self.storage_client = storage_client
         self.cache = cache
@@ -60,6 +70,17 @@ class Container(object):
         for q in Configurations.animal_violation_queues:
             self.messaging.create_queue(queue_name=q)
         self.crypt = crypt
+        self.image_normalizer: AbstractImageNormalizer = ImageNormalizer(
+            max_side=Configurations.image_max_side,
+            quality=Configurations.image_jpeg_quality,
+            max_workers=Configurations.image_normalization_workers,
+        )
+        self.token_cache: AbstractTokenCache = TokenCache(
+            cache=self.cache if Configurations.token_cache_redis else None,
+            max_size=Configurations.token_cache_size,
+            ttl_second=Configurations.token_cache_ttl_second,
+            redis_ttl_second=Configurations.token_cache_redis_ttl_second,
+        )
 
         self.animal_category_repository: AbstractAnimalCategoryRepository = AnimalCategoryRepository()
         self.animal_subcategory_repository: AbstractAnimalSubcategoryRepository = AnimalSubcategoryRepository()
@@ -76,10 +97,44 @@ class Container(object):
             animal_category_repository=self.animal_category_repository,
             animal_subcategory_repository=self.animal_subcategory_repository,
             database=self.database,
+            refresh_interval_second=Configurations.local_cache_refresh_interval_second,
+        )
+        self.search_cache: AbstractSearchCache = SearchCache(
+            cache=self.cache,
+            max_size=Configurations.search_cache_size,
+            ttl_second=Configurations.search_cache_ttl_second,
+            redis_ttl_second=Configurations.search_cache_redis_ttl_second,
+            validate=Configurations.search_cache_validate,
         )
 
+        if Configurations.access_log_durable:
+            self.access_log_buffer: AbstractAccessLogBuffer = QueueAccessLogBuffer(
+                database=self.database,
+                access_log_repository=self.access_log_repository,
+                animal_repository=self.animal_repository,
+                like_repository=self.like_repository,
+                local_cache=self.local_cache,
+                messaging=self.messaging,
+                queue_name=Configurations.access_log_registry_queue,
+                batch_size=Configurations.access_log_batch_size,
+                flush_interval_second=Configurations.access_log_flush_interval_second,
+                max_buffer_size=Configurations.access_log_buffer_size,
+            )
+        else:
+            self.access_log_buffer = AccessLogBuffer(
+                database=self.database,
+                access_log_repository=self.access_log_repository,
+                animal_repository=self.animal_repository,
+                like_repository=self.like_repository,
+                local_cache=self.local_cache,
+                batch_size=Configurations.access_log_batch_size,
+                flush_interval_second=Configurations.access_log_flush_interval_second,
+                max_buffer_size=Configurations.access_log_buffer_size,
+            )
+
         self.animal_category_usecase: AbstractAnimalCategoryUsecase = AnimalCategoryUsecase(
             animal_category_repository=self.animal_category_repository,
+            local_cache=self.local_cache,
         )
         self.animal_subcategory_usecase: AbstractAnimalSubcategoryUsecase = AnimalSubcategoryUsecase(
             animal_category_repository=self.animal_category_repository,
@@ -99,6 +154,7 @@ class Container(object):
             search_client=self.search_client,
             messaging=self.messaging,
             local_cache=self.local_cache,
+            search_cache=self.search_cache,
         )
         self.like_usecase: AbstractLikeUsecase = LikeUsecase(
             like_repository=self.like_repository,
@@ -112,28 +168,73 @@ class Container(object):
         )
         self.access_log_usecase: AbstractAccessLogUsecase = AccessLogUsecase(
             access_log_repository=self.access_log_repository,
-            like_repository=self.like_repository,
+            access_log_buffer=self.access_log_buffer,
         )
         self.metadata_usecase: AbstractMetadataUsecase = MetadataUsecase(
-            animal_category_repository=self.animal_category_repository,
-            animal_subcategory_repository=self.animal_subcategory_repository,
+            local_cache=self.local_cache,
         )
 
+    def close(self):
+        self.access_log_buffer.close()
+        self.image_normalizer.close()
+        self.local_cache.close()
+        self.messaging.close()
+        self.http_client.close()
+
+    async def async_close(self):
+        await self.messaging.async_close()
+        await self.async_http_client.aclose()
+
+
+http_limits = httpx.Limits(
+    max_connections=Configurations.http_max_connections,
+    max_keepalive_connections=Configurations.http_max_keepalive_connections,
+    keepalive_expiry=Configurations.http_keepalive_expiry_second,
+)
+http_client = httpx.Client(
+    transport=httpx.HTTPTransport(
+        retries=Configurations.http_retries,
+        limits=http_limits,
+    ),
+)
+async_http_client = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        retries=Configurations.http_retries,
+        limits=http_limits,
+    ),
+)
 
 if Configurations.run_environment == RUN_ENVIRONMENT.LOCAL.value:
     learn_to_rank: AbstractLearnToRankService = PseudoLearnToRankService()
     similar_image_search: AbstractSimilarImageSearchService = PseudoSimilarImageSearchService()
 elif Configurations.run_environment == RUN_ENVIRONMENT.CLOUD.value:
-    learn_to_rank = LearnToRankService()
-    similar_image_search = SimilarImageSearchService()
+    learn_to_rank = LearnToRankService(
+        client=http_client,
+        async_client=async_http_client,
+        circuit_breaker=CircuitBreaker(
+            name="learn_to_rank",
+            failure_threshold=Configurations.learn_to_rank_circuit_failure_threshold,
+            recovery_second=Configurations.learn_to_rank_circuit_recovery_second,
+            slow_call_second=Configurations.learn_to_rank_slow_call_second,
+        ),
+        timeout=Configurations.learn_to_rank_timeout_second,
+        model_ttl_second=Configurations.learn_to_rank_model_ttl_second,
+    )
+    similar_image_search = SimilarImageSearchService(
+        client=http_client,
+        async_client=async_http_client,
+        timeout=Configurations.similar_image_search_timeout_second,
+    )
 
 container = Container(
     storage_client=LocalStorage(),
-    database=PostgreSQLDatabase(),
+    database=PostgreSQLDatabase(async_mode=Configurations.async_mode),
     cache=RedisCache(),
-    search_client=ElasticsearchClient(),
+    search_client=ElasticsearchClient(validate=Configurations.search_response_validate),
     messaging=RabbitmqMessaging(),
     crypt=Crypt(key_file_path=Configurations.key_file_path),
     learn_to_rank=learn_to_rank,
     similar_image_search=similar_image_search,
+    http_client=http_client,
+    async_http_client=async_http_client,
 )
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from logging import getLogger
+from typing import List
 
 from sqlalchemy.orm import Session
 from src.entities.access_log import AccessLogCreate
@@ -22,6 +23,15 @@ class AbstractAccessLogRepository(ABC):
     ):
         raise NotImplementedError
 
+    @abstractmethod
+    def bulk_insert(
+        self,
+        session: Session,
+        records: List[AccessLogCreate],
+        commit: bool = True,
+    ):
+        raise NotImplementedError
+
 
 class AccessLogRepository(AbstractAccessLogRepository):
     def __init__(self):
@@ -53,3 +63,14 @@ class AccessLogRepository(AbstractAccessLogRepository):
         if commit:
             session.commit()
             session.refresh(data)
+
+    def bulk_insert(
+        self,
+        session: Session,
+        records: List[AccessLogCreate],
+        commit: bool = True,
+    ):
+        data = [{**r.dict(), "action": r.action.value} for r in records]
+        session.execute(AccessLog.__table__.insert(), data)
+        if commit:
+            session.commit()
@@ -2,14 +2,15 @@ from abc import ABC, abstractmethod
 from logging import getLogger
 from typing import List, Optional
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
-from src.entities.animal import AnimalCreate, AnimalIDs, AnimalModel, AnimalQuery
+from src.entities.animal import AnimalCreate, AnimalIDs, AnimalLikeModel, AnimalModel, AnimalQuery
 from src.entities.user import UserModel
 from src.schema.animal import Animal
 from src.schema.animal_category import AnimalCategory
 from src.schema.animal_subcategory import AnimalSubcategory
 from src.schema.like import Like
+from src.schema.like_count import LikeCount
 from src.schema.table import TABLES
 from src.schema.user import User
 
@@ -27,6 +28,7 @@ class AbstractAnimalRepository(ABC):
         query: Optional[AnimalQuery] = None,
         limit: Optional[int] = 100,
         offset: Optional[int] = 0,
+        after_id: Optional[str] = None,
     ) -> List[AnimalModel]:
         raise NotImplementedError
 
@@ -38,6 +40,22 @@ class AbstractAnimalRepository(ABC):
     ) -> List[AnimalModel]:
         raise NotImplementedError
 
+    @abstractmethod
+    def select_existing_ids(
+        self,
+        session: Session,
+        query: AnimalIDs,
+    ) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def select_with_like_by_ids(
+        self,
+        session: Session,
+        query: AnimalIDs,
+    ) -> List[AnimalLikeModel]:
+        raise NotImplementedError
+
     @abstractmethod
     def liked_by(
         self,
@@ -45,6 +63,7 @@ class AbstractAnimalRepository(ABC):
         animal_id: str,
         limit: Optional[int] = 100,
         offset: Optional[int] = 0,
+        after_id: Optional[str] = None,
     ) -> List[UserModel]:
         raise NotImplementedError
 
@@ -69,6 +88,7 @@ class AnimalRepository(AbstractAnimalRepository):
         query: Optional[AnimalQuery] = None,
         limit: Optional[int] = 100,
         offset: Optional[int] = 0,
+        after_id: Optional[str] = None,
     ) -> List[AnimalModel]:
         filters = []
         if query is not None:
@@ -84,6 +104,9 @@ class AnimalRepository(AbstractAnimalRepository):
                 filters.append(User.id == query.user_id)
             if query.deactivated is not None:
                 filters.append(Animal.deactivated == query.deactivated)
+        if after_id is not None:
+            filters.append(Animal.id > after_id)
+            offset = 0
         results = (
             session.query(
                 Animal.id.label("id"),
@@ -207,13 +230,100 @@ class AnimalRepository(AbstractAnimalRepository):
         ]
         return data
 
+    def select_existing_ids(
+        self,
+        session: Session,
+        query: AnimalIDs,
+    ) -> List[str]:
+        if len(query.ids) == 0:
+            return []
+        results = session.query(Animal.id).filter(Animal.id.in_(query.ids)).all()
+        return [r[0] for r in results]
+
+    def select_with_like_by_ids(
+        self,
+        session: Session,
+        query: AnimalIDs,
+    ) -> List[AnimalLikeModel]:
+        if len(query.ids) == 0:
+            return []
+        results = (
+            session.query(
+                Animal.id.label("id"),
+                AnimalCategory.id.label("animal_category_id"),
+                AnimalCategory.name_en.label("animal_category_name_en"),
+                AnimalCategory.name_ja.label("animal_category_name_ja"),
+                AnimalSubcategory.id.label("animal_subcategory_id"),
+                AnimalSubcategory.name_en.label("animal_subcategory_name_en"),
+                AnimalSubcategory.name_ja.label("animal_subcategory_name_ja"),
+                User.id.label("user_id"),
+                User.handle_name.label("user_handle_name"),
+                Animal.name.label("name"),
+                Animal.description.label("description"),
+                Animal.photo_url.label("photo_url"),
+                Animal.deactivated.label("deactivated"),
+                Animal.created_at.label("created_at"),
+                Animal.updated_at.label("updated_at"),
+                func.coalesce(LikeCount.count, 0).label("like"),
+            )
+            .join(
+                AnimalCategory,
+                AnimalCategory.id == Animal.animal_category_id,
+                isouter=True,
+            )
+            .join(
+                AnimalSubcategory,
+                AnimalSubcategory.id == Animal.animal_subcategory_id,
+                isouter=True,
+            )
+            .join(
+                User,
+                User.id == Animal.user_id,
+                isouter=True,
+            )
+            .join(
+                LikeCount,
+                LikeCount.animal_id == Animal.id,
+                isouter=True,
+            )
+            .filter(Animal.id.in_(query.ids))
+            .order_by(Animal.id)
+        )
+        data = [
+            AnimalLikeModel(
+                id=d[0],
+                animal_category_id=d[1],
+                animal_category_name_en=d[2],
+                animal_category_name_ja=d[3],
+                animal_subcategory_id=d[4],
+                animal_subcategory_name_en=d[5],
+                animal_subcategory_name_ja=d[6],
+                user_id=d[7],
+                user_handle_name=d[8],
+                name=d[9],
+                description=d[10],
+                photo_url=d[11],
+                deactivated=d[12],
+                created_at=d[13],
+                updated_at=d[14],
+                like=d[15],
+            )
+            for d in results
+        ]
+        return data
+
     def liked_by(
         self,
         session: Session,
         animal_id: str,
         limit: Optional[int] = 100,
         offset: Optional[int] = 0,
+        after_id: Optional[str] = None,
     ) -> List[UserModel]:
+        filters = [Animal.id == animal_id]
+        if after_id is not None:
+            filters.append(User.id > after_id)
+            offset = 0
         results = (
             session.query(User)
             .join(
@@ -226,7 +336,7 @@ class AnimalRepository(AbstractAnimalRepository):
                 Animal.id == Like.animal_id,
                 isouter=True,
             )
-            .filter(Animal.id == animal_id)
+            .filter(and_(*filters))
             .order_by(User.id)
             .limit(limit)
             .offset(offset)
@@ -2,11 +2,13 @@ from abc import ABC, abstractmethod
 from logging import getLogger
 from typing import Dict, List, Optional
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from src.entities.common import Count
 from src.entities.like import LikeCreate, LikeDelete, LikeModel, LikeQuery
 from src.schema.like import Like
+from src.schema.like_count import LikeCount
 from src.schema.table import TABLES
 
 logger = getLogger(__name__)
@@ -34,6 +36,24 @@ class AbstractLikeRepository(ABC):
     ) -> Dict[str, Count]:
         raise NotImplementedError
 
+    @abstractmethod
+    def increment_count(
+        self,
+        session: Session,
+        animal_id: str,
+        commit: bool = True,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def decrement_count(
+        self,
+        session: Session,
+        animal_id: str,
+        commit: bool = True,
+    ):
+        raise NotImplementedError
+
     @abstractmethod
     def insert(
         self,
@@ -91,21 +111,54 @@ class LikeRepository(AbstractLikeRepository):
         session: Session,
         animal_ids: List[str],
     ) -> Dict[str, Count]:
-        results = (
-            session.query(
-                func.count(Like.id).label("count"),
-                Like.animal_id.label("animal_id"),
-            )
-            .filter(Like.animal_id.in_(animal_ids))
-            .group_by(Like.animal_id)
-            .order_by(Like.animal_id)
-            .all()
-        )
+        results = session.query(LikeCount).filter(LikeCount.animal_id.in_(animal_ids)).all()
         data = {animal_id: Count(count=0) for animal_id in animal_ids}
         for r in results:
-            data[r["animal_id"]] = Count(count=r["count"])
+            data[r.animal_id] = Count(count=r.count)
         return data
 
+    def increment_count(
+        self,
+        session: Session,
+        animal_id: str,
+        commit: bool = True,
+    ):
+        statement = insert(LikeCount).values(
+            animal_id=animal_id,
+            count=1,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[LikeCount.animal_id],
+            set_={
+                "count": LikeCount.count + 1,
+                "updated_at": func.now(),
+            },
+        )
+        session.execute(statement)
+        if commit:
+            session.commit()
+
+    def decrement_count(
+        self,
+        session: Session,
+        animal_id: str,
+        commit: bool = True,
+    ):
+        statement = (
+            update(LikeCount)
+            .where(
+                LikeCount.animal_id == animal_id,
+                LikeCount.count > 0,
+            )
+            .values(
+                count=LikeCount.count - 1,
+                updated_at=func.now(),
+            )
+        )
+        session.execute(statement)
+        if commit:
+            session.commit()
+
     def insert(
         self,
         session: Session,
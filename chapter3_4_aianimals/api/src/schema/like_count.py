@@ -0,0 +1,29 @@
+from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy.sql.functions import current_timestamp
+from sqlalchemy.sql.sqltypes import INT
+from src.schema.base import Base
+from src.schema.table import TABLES
+
+
+class LikeCount(Base):
+    __tablename__ = TABLES.LIKE_COUNT.value
+    animal_id = Column(
+        String(32),
+        ForeignKey(f"{TABLES.ANIMAL.value}.id"),
+        primary_key=True,
+    )
+    count = Column(
+        INT,
+        nullable=False,
+        server_default="0",
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=current_timestamp(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=current_timestamp(),
+        nullable=False,
+    )
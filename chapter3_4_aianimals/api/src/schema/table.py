@@ -7,6 +7,7 @@ class TABLES(Enum):
     ANIMAL = "animals"
     USER = "users"
     LIKE = "likes"
+    LIKE_COUNT = "like_counts"
     VIOLATION_TYPE = "violation_types"
     VIOLATION = "violations"
     ACCESS_LOG = "access_logs"
@@ -0,0 +1,339 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from logging import getLogger
+from typing import Deque, List, Optional, Set
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+from src.entities.access_log import AccessLogCreate, Action
+from src.entities.animal import AnimalIDs
+from src.infrastructure.database import AbstractDatabase
+from src.infrastructure.messaging import AbstractMessaging
+from src.middleware.strings import get_uuid
+from src.repository.access_log_repository import AbstractAccessLogRepository
+from src.repository.animal_repository import AbstractAnimalRepository
+from src.repository.like_repository import AbstractLikeRepository
+from src.request_object.access_log import AccessLogCreateRequest
+from src.service.local_cache import AbstractLocalCache
+
+logger = getLogger(__name__)
+
+ACCESS_LOG_RECORDS = Counter(
+    "aianimals_access_log_records_total",
+    "access log records handled by the ingestion buffer",
+    ["result"],
+)
+ACCESS_LOG_BUFFERED = Gauge(
+    "aianimals_access_log_buffered_records",
+    "access log records waiting to be flushed",
+)
+
+
+class AbstractAccessLogBuffer(ABC):
+    def __init__(self):
+        pass
+
+    @abstractmethod
+    def put(
+        self,
+        requests: List[AccessLogCreateRequest],
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self):
+        raise NotImplementedError
+
+
+class AccessLogBuffer(AbstractAccessLogBuffer):
+    def __init__(
+        self,
+        database: AbstractDatabase,
+        access_log_repository: AbstractAccessLogRepository,
+        animal_repository: AbstractAnimalRepository,
+        like_repository: AbstractLikeRepository,
+        local_cache: AbstractLocalCache,
+        batch_size: int = 500,
+        flush_interval_second: float = 1.0,
+        max_buffer_size: int = 10000,
+    ):
+        super().__init__()
+        self.database = database
+        self.access_log_repository = access_log_repository
+        self.animal_repository = animal_repository
+        self.like_repository = like_repository
+        self.local_cache = local_cache
+        self.batch_size = batch_size
+        self.flush_interval_second = flush_interval_second
+        self.max_buffer_size = max_buffer_size
+
+        self.__requests: Deque[AccessLogCreateRequest] = deque()
+        self.__condition = threading.Condition()
+        self.__flush_lock = threading.Lock()
+        self.__closed = False
+        self.__worker: Optional[threading.Thread] = None
+
+    def __start(self):
+        if self.__worker is not None and self.__worker.is_alive():
+            return
+        self.__worker = threading.Thread(
+            target=self.__run,
+            name="access_log_buffer",
+            daemon=True,
+        )
+        self.__worker.start()
+
+    def put(
+        self,
+        requests: List[AccessLogCreateRequest],
+    ) -> bool:
+        now = datetime.now()
+        for request in requests:
+            if request.created_at is None:
+                request.created_at = now
+        with self.__condition:
+            if self.__closed or len(self.__requests) + len(requests) > self.max_buffer_size:
+                ACCESS_LOG_RECORDS.labels(result="rejected").inc(len(requests))
+                return False
+            self.__requests.extend(requests)
+            ACCESS_LOG_BUFFERED.set(len(self.__requests))
+            self.__start()
+            if len(self.__requests) >= self.batch_size:
+                self.__condition.notify()
+        return True
+
+    def __drain(self) -> List[AccessLogCreateRequest]:
+        with self.__condition:
+            size = min(self.batch_size, len(self.__requests))
+            requests = [self.__requests.popleft() for _ in range(size)]
+            ACCESS_LOG_BUFFERED.set(len(self.__requests))
+        return requests
+
+    def __requeue(
+        self,
+        requests: List[AccessLogCreateRequest],
+    ):
+        with self.__condition:
+            capacity = self.max_buffer_size - len(self.__requests)
+            if capacity < len(requests):
+                logger.error(f"drop {len(requests) - capacity} access logs; buffer is full")
+                ACCESS_LOG_RECORDS.labels(result="dropped").inc(len(requests) - max(capacity, 0))
+                requests = requests[: max(capacity, 0)]
+            self.__requests.extendleft(reversed(requests))
+            ACCESS_LOG_BUFFERED.set(len(self.__requests))
+
+    def __is_valid(
+        self,
+        request: AccessLogCreateRequest,
+        animal_ids: Set[str],
+    ) -> bool:
+        if not Action.has_value(value=request.action):
+            logger.error(f"invalid action: {request.action}")
+            return False
+        if request.animal_id not in animal_ids:
+            logger.error(f"invalid animal_id: {request.animal_id}")
+            return False
+        if (
+            request.animal_category_id is not None
+            and self.local_cache.get_animal_category_by_id(id=request.animal_category_id) is None
+        ):
+            logger.error(f"invalid animal_category_id: {request.animal_category_id}")
+            return False
+        if (
+            request.animal_subcategory_id is not None
+            and self.local_cache.get_animal_subcategory_by_id(id=request.animal_subcategory_id) is None
+        ):
+            logger.error(f"invalid animal_subcategory_id: {request.animal_subcategory_id}")
+            return False
+        return True
+
+    def __validate(
+        self,
+        session: Session,
+        requests: List[AccessLogCreateRequest],
+    ) -> List[AccessLogCreateRequest]:
+        animal_ids = set(
+            self.animal_repository.select_existing_ids(
+                session=session,
+                query=AnimalIDs(ids=list({r.animal_id for r in requests})),
+            )
+        )
+        valid_requests = [r for r in requests if self.__is_valid(request=r, animal_ids=animal_ids)]
+        if len(valid_requests) < len(requests):
+            ACCESS_LOG_RECORDS.labels(result="invalid").inc(len(requests) - len(valid_requests))
+        return valid_requests
+
+    def __make_records(
+        self,
+        session: Session,
+        requests: List[AccessLogCreateRequest],
+    ) -> List[AccessLogCreate]:
+        likes = self.like_repository.count(
+            session=session,
+            animal_ids=list({r.animal_id for r in requests}),
+        )
+        return [
+            AccessLogCreate(
+                id=get_uuid(),
+                search_id=request.search_id,
+                phrases=request.phrases,
+                animal_category_id=request.animal_category_id,
+                animal_subcategory_id=request.animal_subcategory_id,
+                sort_by=request.sort_by,
+                model_name=request.model_name,
+                user_id=request.user_id,
+                likes=likes[request.animal_id].count,
+                animal_id=request.animal_id,
+                action=Action(request.action),
+                created_at=request.created_at,
+            )
+            for request in requests
+        ]
+
+    def __insert(
+        self,
+        records: List[AccessLogCreate],
+    ) -> Optional[Exception]:
+        session = self.database.get_session().__next__()
+        try:
+            self.access_log_repository.bulk_insert(
+                session=session,
+                records=records,
+                commit=True,
+            )
+            ACCESS_LOG_RECORDS.labels(result="written").inc(len(records))
+            return None
+        except Exception as e:
+            session.rollback()
+            logger.error(f"failed to write {len(records)} access logs: {e}")
+            ACCESS_LOG_RECORDS.labels(result="failed").inc(len(records))
+            return e
+        finally:
+            session.close()
+
+    def write(
+        self,
+        records: List[AccessLogCreate],
+    ) -> List[AccessLogCreate]:
+        if self.__insert(records=records) is None:
+            return []
+        for i, record in enumerate(records):
+            error = self.__insert(records=[record])
+            if error is None:
+                continue
+            if isinstance(error, (DataError, IntegrityError)):
+                logger.error(f"drop invalid access log: {record.json()}")
+                ACCESS_LOG_RECORDS.labels(result="invalid").inc()
+                continue
+            return records[i:]
+        return []
+
+    def __flush_batch(
+        self,
+        requests: List[AccessLogCreateRequest],
+    ) -> bool:
+        session = self.database.get_session().__next__()
+        try:
+            valid_requests = self.__validate(
+                session=session,
+                requests=requests,
+            )
+            if len(valid_requests) == 0:
+                return True
+            records = self.__make_records(
+                session=session,
+                requests=valid_requests,
+            )
+        except Exception as e:
+            session.rollback()
+            logger.error(f"failed to validate {len(requests)} access logs: {e}")
+            self.__requeue(requests=requests)
+            return False
+        finally:
+            session.close()
+        remaining = self.write(records=records)
+        if len(remaining) == 0:
+            return True
+        self.__requeue(requests=valid_requests[len(records) - len(remaining) :])
+        return False
+
+    def flush(self):
+        with self.__flush_lock:
+            while True:
+                requests = self.__drain()
+                if len(requests) == 0:
+                    return
+                if not self.__flush_batch(requests=requests):
+                    return
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                if not self.__closed and len(self.__requests) < self.batch_size:
+                    self.__condition.wait(timeout=self.flush_interval_second)
+                closed = self.__closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self):
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+        if self.__worker is not None:
+            self.__worker.join(timeout=self.flush_interval_second * 10)
+        self.flush()
+
+
+class QueueAccessLogBuffer(AccessLogBuffer):
+    def __init__(
+        self,
+        database: AbstractDatabase,
+        access_log_repository: AbstractAccessLogRepository,
+        animal_repository: AbstractAnimalRepository,
+        like_repository: AbstractLikeRepository,
+        local_cache: AbstractLocalCache,
+        messaging: AbstractMessaging,
+        queue_name: str,
+        batch_size: int = 500,
+        flush_interval_second: float = 1.0,
+        max_buffer_size: int = 10000,
+    ):
+        super().__init__(
+            database=database,
+            access_log_repository=access_log_repository,
+            animal_repository=animal_repository,
+            like_repository=like_repository,
+            local_cache=local_cache,
+            batch_size=batch_size,
+            flush_interval_second=flush_interval_second,
+            max_buffer_size=max_buffer_size,
+        )
+        self.messaging = messaging
+        self.queue_name = queue_name
+        self.messaging.create_queue(queue_name=self.queue_name)
+
+    def write(
+        self,
+        records: List[AccessLogCreate],
+    ) -> List[AccessLogCreate]:
+        body = [json.loads(r.json()) for r in records]
+        try:
+            self.messaging.publish(
+                queue_name=self.queue_name,
+                body=body,
+            )
+        except Exception as e:
+            logger.exception(f"failed to publish {len(records)} access logs: {e}")
+            ACCESS_LOG_RECORDS.labels(result="failed").inc(len(records))
+            return records
+        ACCESS_LOG_RECORDS.labels(result="published").inc(len(records))
+        return []
@@ -0,0 +1,96 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+logger = getLogger(__name__)
+
+
+def normalize_image(
+    source_file_path: str,
+    destination_file_path: str,
+    max_side: int = 1024,
+    quality: int = 85,
+):
+    with Image.open(source_file_path) as image:
+        image.draft("RGB", (max_side, max_side))
+        normalized = ImageOps.exif_transpose(image)
+        if normalized.mode != "RGB":
+            normalized = normalized.convert("RGB")
+        normalized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        normalized.save(
+            destination_file_path,
+            format="JPEG",
+            quality=quality,
+            optimize=True,
+            progressive=True,
+        )
+
+
+class AbstractImageNormalizer(ABC):
+    def __init__(
+        self,
+        max_side: int = 1024,
+        quality: int = 85,
+    ):
+        self.max_side = max_side
+        self.quality = quality
+
+    @abstractmethod
+    async def normalize(
+        self,
+        source_file_path: str,
+        destination_file_path: str,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self):
+        raise NotImplementedError
+
+
+class ImageNormalizer(AbstractImageNormalizer):
+    def __init__(
+        self,
+        max_side: int = 1024,
+        quality: int = 85,
+        max_workers: int = 2,
+    ):
+        super().__init__(
+            max_side=max_side,
+            quality=quality,
+        )
+        self.max_workers = max_workers
+        self.__executor: Optional[ThreadPoolExecutor] = None
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="image_normalizer",
+            )
+        return self.__executor
+
+    async def normalize(
+        self,
+        source_file_path: str,
+        destination_file_path: str,
+    ):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.__get_executor(),
+            normalize_image,
+            source_file_path,
+            destination_file_path,
+            self.max_side,
+            self.quality,
+        )
+        logger.info(f"normalized image {source_file_path} to {destination_file_path}")
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
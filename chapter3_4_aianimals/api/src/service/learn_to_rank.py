@@ -1,11 +1,13 @@
 import json
+import time
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 import httpx
 from pydantic import BaseModel, Extra
 from src.configurations import Configurations
+from src.middleware.circuit_breaker import CIRCUIT_STATE, CircuitBreaker
 
 logger = getLogger(__name__)
 
@@ -35,6 +37,13 @@ class LearnToRankResponse(BaseModel):
         extra = Extra.forbid
 
 
+class LearnToRankModelResponse(BaseModel):
+    model_name: Optional[str] = None
+
+    class Config:
+        extra = Extra.forbid
+
+
 class LearnToRankServiceABTestResponse(BaseModel):
     endpoint: str
     response: LearnToRankResponse
@@ -54,6 +63,21 @@ class AbstractLearnToRankService(ABC):
     ) -> LearnToRankResponse:
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_reorder(
+        self,
+        request: LearnToRankRequest,
+    ) -> LearnToRankResponse:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_model_name(self) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_get_model_name(self) -> Optional[str]:
+        raise NotImplementedError
+
 
 class PseudoLearnToRankService(AbstractLearnToRankService):
     def __init__(self):
@@ -71,49 +95,67 @@ class PseudoLearnToRankService(AbstractLearnToRankService):
         logger.info(f"response from learn to rank: {response}")
         return response
 
+    async def async_reorder(
+        self,
+        request: LearnToRankRequest,
+    ) -> LearnToRankResponse:
+        return self.reorder(request=request)
+
+    def get_model_name(self) -> Optional[str]:
+        return "pseudo"
+
+    async def async_get_model_name(self) -> Optional[str]:
+        return self.get_model_name()
+
 
 class LearnToRankService(AbstractLearnToRankService):
     def __init__(
         self,
+        client: httpx.Client,
+        async_client: httpx.AsyncClient,
+        circuit_breaker: CircuitBreaker,
         timeout: float = 10.0,
-        retries: int = 3,
+        model_ttl_second: float = 10.0,
     ):
+        self.client = client
+        self.async_client = async_client
+        self.circuit_breaker = circuit_breaker
         self.timeout = timeout
-        self.transport = httpx.HTTPTransport(
-            retries=retries,
-        )
+        self.model_ttl_second = model_ttl_second
         self.url = Configurations.learn_to_rank_url
+        self.model_url = f"{self.url}/model" if self.url is not None else None
+        self.model_name: Optional[str] = None
+        self.__model_checked_at = 0.0
         self.post_header: Dict[str, str] = {
             "accept": "application/json",
             "Content-Type": "application/json",
         }
 
-    def reorder(
+    def __make_request_body(
         self,
         request: LearnToRankRequest,
-    ) -> LearnToRankResponse:
-        logger.info(f"request for learn to rank: {request}")
-        _ids = request.ids
-        if self.url is None:
-            logger.info(f"skip request learn to rank")
-            return LearnToRankResponse(ids=_ids)
+    ) -> str:
         if Configurations.learn_to_rank_ab_test:
-            _request = LearnToRankABTestRequest(request=request)
+            _request: Union[LearnToRankRequest, LearnToRankABTestRequest] = LearnToRankABTestRequest(request=request)
         else:
             _request = request
-        with httpx.Client(
-            timeout=self.timeout,
-            transport=self.transport,
-        ) as client:
-            req = _request.dict()
-            res = client.post(
-                url=self.url,
-                data=json.dumps(req),
-                headers=self.post_header,
-            )
-        if res.status_code != 200:
-            logger.error(f"failed to request learn to rank: {res}")
-            return LearnToRankResponse(ids=_ids)
+        return json.dumps(_request.dict())
+
+    def __parse_response(
+        self,
+        request: LearnToRankRequest,
+        res: Optional[httpx.Response],
+        elapsed_second: float,
+    ) -> LearnToRankResponse:
+        if res is None or res.status_code != 200:
+            if res is not None:
+                logger.error(f"failed to request learn to rank: {res}")
+            self.circuit_breaker.record_failure()
+            return LearnToRankResponse(ids=request.ids)
+        self.circuit_breaker.record(
+            success=True,
+            elapsed_second=elapsed_second,
+        )
         res_json = res.json()
         if Configurations.learn_to_rank_ab_test:
             response = LearnToRankServiceABTestResponse(**res_json["response"]).response
@@ -121,3 +163,115 @@ class LearnToRankService(AbstractLearnToRankService):
             response = LearnToRankResponse(**res_json)
         logger.info(f"response from learn to rank: {response}")
         return response
+
+    def __skip(self) -> bool:
+        if not self.circuit_breaker.allow():
+            logger.info(f"skip request learn to rank; circuit {self.circuit_breaker.state.value}")
+            return True
+        return False
+
+    def reorder(
+        self,
+        request: LearnToRankRequest,
+    ) -> LearnToRankResponse:
+        logger.info(f"request for learn to rank: {request}")
+        url = self.url
+        if url is None:
+            logger.info(f"skip request learn to rank")
+            return LearnToRankResponse(ids=request.ids)
+        if self.__skip():
+            return LearnToRankResponse(ids=request.ids)
+        res: Optional[httpx.Response] = None
+        t0 = time.perf_counter()
+        try:
+            res = self.client.post(
+                url=url,
+                data=self.__make_request_body(request=request),
+                headers=self.post_header,
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"failed to request learn to rank: {e}")
+        return self.__parse_response(
+            request=request,
+            res=res,
+            elapsed_second=time.perf_counter() - t0,
+        )
+
+    async def async_reorder(
+        self,
+        request: LearnToRankRequest,
+    ) -> LearnToRankResponse:
+        logger.info(f"request for learn to rank: {request}")
+        url = self.url
+        if url is None:
+            logger.info(f"skip request learn to rank")
+            return LearnToRankResponse(ids=request.ids)
+        if self.__skip():
+            return LearnToRankResponse(ids=request.ids)
+        res: Optional[httpx.Response] = None
+        t0 = time.perf_counter()
+        try:
+            res = await self.async_client.post(
+                url=url,
+                data=self.__make_request_body(request=request),
+                headers=self.post_header,
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"failed to request learn to rank: {e}")
+        return self.__parse_response(
+            request=request,
+            res=res,
+            elapsed_second=time.perf_counter() - t0,
+        )
+
+    def __should_check_model(self) -> bool:
+        if self.model_url is None or self.circuit_breaker.state != CIRCUIT_STATE.CLOSED:
+            return False
+        now = time.time()
+        if now - self.__model_checked_at < self.model_ttl_second:
+            return False
+        self.__model_checked_at = now
+        return True
+
+    def __parse_model_response(
+        self,
+        res: httpx.Response,
+    ) -> Optional[str]:
+        if res.status_code != 200:
+            logger.error(f"failed to request learn to rank model: {res}")
+            return self.model_name
+        model_name = LearnToRankModelResponse(**res.json()).model_name
+        if model_name != self.model_name:
+            logger.info(f"learn to rank model: {model_name}")
+            self.model_name = model_name
+        return self.model_name
+
+    def get_model_name(self) -> Optional[str]:
+        model_url = self.model_url
+        if model_url is None or not self.__should_check_model():
+            return self.model_name
+        try:
+            res = self.client.get(
+                url=model_url,
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"failed to request learn to rank model: {e}")
+            return self.model_name
+        return self.__parse_model_response(res=res)
+
+    async def async_get_model_name(self) -> Optional[str]:
+        model_url = self.model_url
+        if model_url is None or not self.__should_check_model():
+            return self.model_name
+        try:
+            res = await self.async_client.get(
+                url=model_url,
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"failed to request learn to rank model: {e}")
+            return self.model_name
+        return self.__parse_model_response(res=res)
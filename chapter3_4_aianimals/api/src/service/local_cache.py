@@ -1,7 +1,10 @@
+import threading
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional
 
+from src.entities.animal_category import AnimalCategoryModel
+from src.entities.animal_subcategory import AnimalSubcategoryModel
 from src.infrastructure.database import AbstractDatabase
 from src.repository.animal_category_repository import AbstractAnimalCategoryRepository
 from src.repository.animal_subcategory_repository import AbstractAnimalSubcategoryRepository
@@ -9,23 +12,47 @@ from src.repository.animal_subcategory_repository import AbstractAnimalSubcatego
 logger = getLogger(__name__)
 
 
+class ReferenceData(object):
+    def __init__(
+        self,
+        animal_categories: List[AnimalCategoryModel],
+        animal_subcategories: List[AnimalSubcategoryModel],
+    ):
+        self.animal_categories = animal_categories
+        self.animal_subcategories = animal_subcategories
+        self.animal_category_by_id: Dict[int, AnimalCategoryModel] = {c.id: c for c in animal_categories}
+        self.animal_subcategory_by_id: Dict[int, AnimalSubcategoryModel] = {s.id: s for s in animal_subcategories}
+        self.animal_category_id_by_name: Dict[str, int] = {}
+        for c in animal_categories:
+            if not c.is_deleted:
+                self.animal_category_id_by_name[c.name_en] = c.id
+                self.animal_category_id_by_name[c.name_ja] = c.id
+        self.animal_subcategory_id_by_name: Dict[str, int] = {}
+        for s in animal_subcategories:
+            if not s.is_deleted:
+                self.animal_subcategory_id_by_name[s.name_en] = s.id
+                self.animal_subcategory_id_by_name[s.name_ja] = s.id
+
+
 class AbstractLocalCache(ABC):
     def __init__(
         self,
         animal_category_repository: AbstractAnimalCategoryRepository,
         animal_subcategory_repository: AbstractAnimalSubcategoryRepository,
-        database=AbstractDatabase,
+        database: AbstractDatabase,
+        refresh_interval_second: float = 300.0,
     ):
         self.animal_category_repository = animal_category_repository
         self.animal_subcategory_repository = animal_subcategory_repository
         self.database = database
-        self.cache: Dict[str, Union[str, Dict]] = {}
+        self.refresh_interval_second = refresh_interval_second
 
     @abstractmethod
-    def get(
-        self,
-        key: str,
-    ) -> Optional[Union[str, int, Dict]]:
+    def refresh(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self):
         raise NotImplementedError
 
     @abstractmethod
@@ -46,14 +73,22 @@ class AbstractLocalCache(ABC):
     def get_animal_category_by_id(
         self,
         id: int,
-    ) -> Optional[Dict]:
+    ) -> Optional[AnimalCategoryModel]:
         raise NotImplementedError
 
     @abstractmethod
     def get_animal_subcategory_by_id(
         self,
         id: int,
-    ) -> Optional[Dict]:
+    ) -> Optional[AnimalSubcategoryModel]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_animal_categories(self) -> List[AnimalCategoryModel]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_animal_subcategories(self) -> List[AnimalSubcategoryModel]:
         raise NotImplementedError
 
 
@@ -62,97 +97,80 @@ class LocalCache(AbstractLocalCache):
         self,
         animal_category_repository: AbstractAnimalCategoryRepository,
         animal_subcategory_repository: AbstractAnimalSubcategoryRepository,
-        database=AbstractDatabase,
+        database: AbstractDatabase,
+        refresh_interval_second: float = 300.0,
     ):
         super().__init__(
             animal_category_repository=animal_category_repository,
             animal_subcategory_repository=animal_subcategory_repository,
             database=database,
+            refresh_interval_second=refresh_interval_second,
         )
-        self.initialize()
-
-    def initialize(self):
+        self.__data = self.__load()
+        self.__stop = threading.Event()
+        self.__worker: Optional[threading.Thread] = None
+        if self.refresh_interval_second > 0:
+            self.__worker = threading.Thread(
+                target=self.__run,
+                name="local_cache_refresh",
+                daemon=True,
+            )
+            self.__worker.start()
+
+    def __load(self) -> ReferenceData:
         session = self.database.get_session().__next__()
         try:
             animal_categories = self.animal_category_repository.select(session=session)
-            for animal_category in animal_categories:
-                if not animal_category.is_deleted:
-                    key = self.make_animal_category_key(subkey=animal_category.name_en)
-                    self.cache[key] = animal_category.id
-                    key = self.make_animal_category_key(subkey=animal_category.name_ja)
-                    self.cache[key] = animal_category.id
-                    key = self.make_animal_category_key(subkey=animal_category.id)
-                    self.cache[key] = animal_category.dict()
-                logger.info(f"cached animal category: {animal_category.id}")
             animal_subcategories = self.animal_subcategory_repository.select(session=session)
-            for animal_subcategory in animal_subcategories:
-                if not animal_subcategory.is_deleted:
-                    key = self.make_animal_subcategory_key(subkey=animal_subcategory.name_en)
-                    self.cache[key] = animal_subcategory.id
-                    key = self.make_animal_subcategory_key(subkey=animal_subcategory.name_ja)
-                    self.cache[key] = animal_subcategory.id
-                    key = self.make_animal_subcategory_key(subkey=animal_subcategory.id)
-                    self.cache[key] = animal_subcategory.dict()
-                logger.info(f"cached animal subcategory: {animal_subcategory.id}")
         except Exception as e:
             raise e
         finally:
             session.close()
+        logger.info(f"cached {len(animal_categories)} animal categories and {len(animal_subcategories)} subcategories")
+        return ReferenceData(
+            animal_categories=animal_categories,
+            animal_subcategories=animal_subcategories,
+        )
 
-    def make_animal_category_key(
-        self,
-        subkey: Union[int, str],
-    ) -> str:
-        return f"animal_category_{subkey}"
+    def refresh(self):
+        self.__data = self.__load()
 
-    def make_animal_subcategory_key(
-        self,
-        subkey: Union[int, str],
-    ) -> str:
-        return f"animal_subcategory_{subkey}"
+    def __run(self):
+        while not self.__stop.wait(timeout=self.refresh_interval_second):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"failed to refresh local cache: {e}")
 
-    def get(
-        self,
-        key: str,
-    ) -> Optional[Union[str, Dict]]:
-        return self.cache.get(key, None)
+    def close(self):
+        self.__stop.set()
 
     def get_animal_category_id_by_name(
         self,
         name: str,
     ) -> Optional[int]:
-        key = self.make_animal_category_key(subkey=name)
-        value = self.get(key=key)
-        if isinstance(value, int):
-            return value
-        return None
+        return self.__data.animal_category_id_by_name.get(name)
 
     def get_animal_subcategory_id_by_name(
         self,
         name: str,
     ) -> Optional[int]:
-        key = self.make_animal_subcategory_key(subkey=name)
-        value = self.get(key=key)
-        if isinstance(value, int):
-            return value
-        return None
+        return self.__data.animal_subcategory_id_by_name.get(name)
 
     def get_animal_category_by_id(
         self,
         id: int,
-    ) -> Optional[Dict]:
-        key = self.make_animal_category_key(subkey=id)
-        value = self.get(key=key)
-        if isinstance(value, Dict):
-            return value
-        return None
+    ) -> Optional[AnimalCategoryModel]:
+        return self.__data.animal_category_by_id.get(id)
 
     def get_animal_subcategory_by_id(
         self,
         id: int,
-    ) -> Optional[Dict]:
-        key = self.make_animal_subcategory_key(subkey=id)
-        value = self.get(key=key)
-        if isinstance(value, Dict):
-            return value
-        return None
+    ) -> Optional[AnimalSubcategoryModel]:
+        return self.__data.animal_subcategory_by_id.get(id)
+
+    def list_animal_categories(self) -> List[AnimalCategoryModel]:
+        return self.__data.animal_categories
+
+    def list_animal_subcategories(self) -> List[AnimalSubcategoryModel]:
+        return self.__data.animal_subcategories
@@ -0,0 +1,361 @@
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from logging import getLogger
+from typing import List, Optional, Tuple
+
+import msgpack
+from src.infrastructure.cache import AbstractCache
+from src.middleware.lru_cache import LRUCache
+from src.middleware.tracing import record_cache, record_cache_latency
+from src.response_object.animal import AnimalSearchResponse, AnimalSearchResponses
+
+logger = getLogger(__name__)
+
+SEARCH_CACHE_FORMAT_VERSION = 1
+SEARCH_RESULT_FIELDS: List[str] = list(AnimalSearchResponse.__fields__.keys())
+
+
+class AbstractSearchCache(ABC):
+    def __init__(
+        self,
+        cache: AbstractCache,
+        max_size: int = 1024,
+        ttl_second: int = 60,
+        redis_ttl_second: int = 600,
+        validate: bool = False,
+    ):
+        self.cache = cache
+        self.max_size = max_size
+        self.ttl_second = ttl_second
+        self.redis_ttl_second = redis_ttl_second
+        self.validate = validate
+
+    @abstractmethod
+    def get(
+        self,
+        key: str,
+        search_id: str,
+    ) -> Optional[AnimalSearchResponses]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def mget(
+        self,
+        keys: List[str],
+        search_ids: List[str],
+    ) -> List[Optional[AnimalSearchResponses]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(
+        self,
+        key: str,
+        result: AnimalSearchResponses,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate_local(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_get(
+        self,
+        key: str,
+        search_id: str,
+    ) -> Optional[AnimalSearchResponses]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_mget(
+        self,
+        keys: List[str],
+        search_ids: List[str],
+    ) -> List[Optional[AnimalSearchResponses]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_set(
+        self,
+        key: str,
+        result: AnimalSearchResponses,
+    ):
+        raise NotImplementedError
+
+
+class SearchCache(AbstractSearchCache):
+    def __init__(
+        self,
+        cache: AbstractCache,
+        max_size: int = 1024,
+        ttl_second: int = 60,
+        redis_ttl_second: int = 600,
+        validate: bool = False,
+    ):
+        super().__init__(
+            cache=cache,
+            max_size=max_size,
+            ttl_second=ttl_second,
+            redis_ttl_second=redis_ttl_second,
+            validate=validate,
+        )
+        self.local_cache = LRUCache(
+            max_size=max_size,
+            ttl_second=ttl_second,
+        )
+
+    def encode(
+        self,
+        result: AnimalSearchResponses,
+    ) -> bytes:
+        rows = []
+        for r in result.results:
+            row = [getattr(r, f) for f in SEARCH_RESULT_FIELDS]
+            row[SEARCH_RESULT_FIELDS.index("created_at")] = r.created_at.isoformat()
+            rows.append(row)
+        return msgpack.packb(
+            [
+                SEARCH_CACHE_FORMAT_VERSION,
+                result.hits,
+                result.max_score,
+                result.offset,
+                result.sort_by,
+                result.model_name,
+                rows,
+            ],
+            use_bin_type=True,
+        )
+
+    def decode(
+        self,
+        value: bytes,
+        search_id: str,
+    ) -> Optional[AnimalSearchResponses]:
+        try:
+            version, hits, max_score, offset, sort_by, model_name, rows = msgpack.unpackb(value, raw=False)
+        except Exception as e:
+            logger.info(f"failed to decode search cache: {e}")
+            return None
+        if version != SEARCH_CACHE_FORMAT_VERSION:
+            return None
+        created_at_index = SEARCH_RESULT_FIELDS.index("created_at")
+        for row in rows:
+            row[created_at_index] = datetime.fromisoformat(row[created_at_index])
+        if self.validate:
+            return AnimalSearchResponses(
+                hits=hits,
+                max_score=max_score,
+                results=[AnimalSearchResponse(**dict(zip(SEARCH_RESULT_FIELDS, row))) for row in rows],
+                offset=offset,
+                search_id=search_id,
+                sort_by=sort_by,
+                model_name=model_name,
+            )
+        return AnimalSearchResponses.construct(
+            hits=hits,
+            max_score=max_score,
+            results=[AnimalSearchResponse.construct(**dict(zip(SEARCH_RESULT_FIELDS, row))) for row in rows],
+            offset=offset,
+            search_id=search_id,
+            sort_by=sort_by,
+            model_name=model_name,
+        )
+
+    def __get_local(
+        self,
+        key: str,
+        search_id: str,
+    ) -> Optional[AnimalSearchResponses]:
+        t0 = time.perf_counter()
+        cached = self.local_cache.get(key=key)
+        record_cache_latency(cache="search_local", elapsed_second=time.perf_counter() - t0)
+        if cached is None:
+            record_cache(cache="search_local", miss=1)
+            return None
+        record_cache(cache="search_local", hit=1)
+        return cached.copy(update={"search_id": search_id})
+
+    def __register_remote(
+        self,
+        key: str,
+        search_id: str,
+        value: Optional[bytes],
+        elapsed: float,
+    ) -> Optional[AnimalSearchResponses]:
+        record_cache_latency(cache="search_redis", elapsed_second=elapsed)
+        return self.__decode_remote(
+            key=key,
+            search_id=search_id,
+            value=value,
+        )
+
+    def __decode_remote(
+        self,
+        key: str,
+        search_id: str,
+        value: Optional[bytes],
+    ) -> Optional[AnimalSearchResponses]:
+        searched = self.decode(value=value, search_id=search_id) if value is not None else None
+        if searched is None:
+            record_cache(cache="search_redis", miss=1)
+            return None
+        record_cache(cache="search_redis", hit=1)
+        self.local_cache.set(
+            key=key,
+            value=searched,
+        )
+        return searched
+
+    def get(
+        self,
+        key: str,
+        search_id: str,
+    ) -> Optional[AnimalSearchResponses]:
+        searched = self.__get_local(
+            key=key,
+            search_id=search_id,
+        )
+        if searched is not None:
+            return searched
+        t0 = time.perf_counter()
+        value = self.cache.get_bytes(key=key)
+        return self.__register_remote(
+            key=key,
+            search_id=search_id,
+            value=value,
+            elapsed=time.perf_counter() - t0,
+        )
+
+    def __split_local(
+        self,
+        keys: List[str],
+        search_ids: List[str],
+    ) -> Tuple[List[Optional[AnimalSearchResponses]], List[int]]:
+        searched = [
+            self.__get_local(
+                key=key,
+                search_id=search_id,
+            )
+            for key, search_id in zip(keys, search_ids)
+        ]
+        missing = [i for i, s in enumerate(searched) if s is None]
+        return searched, missing
+
+    def __register_remotes(
+        self,
+        keys: List[str],
+        search_ids: List[str],
+        searched: List[Optional[AnimalSearchResponses]],
+        missing: List[int],
+        values: List[Optional[bytes]],
+        elapsed: float,
+    ) -> List[Optional[AnimalSearchResponses]]:
+        record_cache_latency(cache="search_redis", elapsed_second=elapsed)
+        for i, value in zip(missing, values):
+            searched[i] = self.__decode_remote(
+                key=keys[i],
+                search_id=search_ids[i],
+                value=value,
+            )
+        return searched
+
+    def mget(
+        self,
+        keys: List[str],
+        search_ids: List[str],
+    ) -> List[Optional[AnimalSearchResponses]]:
+        searched, missing = self.__split_local(
+            keys=keys,
+            search_ids=search_ids,
+        )
+        if len(missing) == 0:
+            return searched
+        t0 = time.perf_counter()
+        values = self.cache.mget_bytes(keys=[keys[i] for i in missing])
+        return self.__register_remotes(
+            keys=keys,
+            search_ids=search_ids,
+            searched=searched,
+            missing=missing,
+            values=values,
+            elapsed=time.perf_counter() - t0,
+        )
+
+    def set(
+        self,
+        key: str,
+        result: AnimalSearchResponses,
+    ):
+        logger.info(f"save cache: {key}")
+        self.local_cache.set(
+            key=key,
+            value=result,
+        )
+        self.cache.set(
+            key=key,
+            value=self.encode(result=result),
+            expire_second=self.redis_ttl_second,
+        )
+
+    def invalidate_local(self):
+        logger.info("invalidate local search cache")
+        self.local_cache.clear()
+
+    async def async_get(
+        self,
+        key: str,
+        search_id: str,
+    ) -> Optional[AnimalSearchResponses]:
+        searched = self.__get_local(
+            key=key,
+            search_id=search_id,
+        )
+        if searched is not None:
+            return searched
+        t0 = time.perf_counter()
+        value = await self.cache.async_get_bytes(key=key)
+        return self.__register_remote(
+            key=key,
+            search_id=search_id,
+            value=value,
+            elapsed=time.perf_counter() - t0,
+        )
+
+    async def async_mget(
+        self,
+        keys: List[str],
+        search_ids: List[str],
+    ) -> List[Optional[AnimalSearchResponses]]:
+        searched, missing = self.__split_local(
+            keys=keys,
+            search_ids=search_ids,
+        )
+        if len(missing) == 0:
+            return searched
+        t0 = time.perf_counter()
+        values = await self.cache.async_mget_bytes(keys=[keys[i] for i in missing])
+        return self.__register_remotes(
+            keys=keys,
+            search_ids=search_ids,
+            searched=searched,
+            missing=missing,
+            values=values,
+            elapsed=time.perf_counter() - t0,
+        )
+
+    async def async_set(
+        self,
+        key: str,
+        result: AnimalSearchResponses,
+    ):
+        logger.info(f"save cache: {key}")
+        self.local_cache.set(
+            key=key,
+            value=result,
+        )
+        await self.cache.async_set(
+            key=key,
+            value=self.encode(result=result),
+            expire_second=self.redis_ttl_second,
+        )
@@ -36,6 +36,13 @@ class AbstractSimilarImageSearchService(ABC):
     ) -> SimilarImageSearchResponse:
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_search(
+        self,
+        request: SimilarImageSearchRequest,
+    ) -> SimilarImageSearchResponse:
+        raise NotImplementedError
+
 
 class PseudoSimilarImageSearchService(AbstractSimilarImageSearchService):
     def __init__(self):
@@ -59,23 +66,46 @@ class PseudoSimilarImageSearchService(AbstractSimilarImageSearchService):
         logger.info(f"response from similar image search: {response}")
         return response
 
+    async def async_search(
+        self,
+        request: SimilarImageSearchRequest,
+    ) -> SimilarImageSearchResponse:
+        return self.search(request=request)
+
 
 class SimilarImageSearchService(AbstractSimilarImageSearchService):
     def __init__(
         self,
+        client: httpx.Client,
+        async_client: httpx.AsyncClient,
         timeout: float = 10.0,
-        retries: int = 3,
     ):
+        self.client = client
+        self.async_client = async_client
         self.timeout = timeout
-        self.transport = httpx.HTTPTransport(
-            retries=retries,
-        )
         self.url = Configurations.similar_image_search_url
         self.post_header: Dict[str, str] = {
             "accept": "application/json",
             "Content-Type": "application/json",
         }
 
+    def __parse_response(
+        self,
+        request: SimilarImageSearchRequest,
+        res: Optional[httpx.Response],
+    ) -> SimilarImageSearchResponse:
+        if res is None or res.status_code != 200:
+            if res is not None:
+                logger.error(f"failed to request similar image search: {res}")
+            return SimilarImageSearchResponse(
+                ids=[request.id],
+                model_name=None,
+            )
+        res_json = res.json()
+        response = SimilarImageSearchResponse(**res_json)
+        logger.info(f"response from similar image search: {response}")
+        return response
+
     def search(
         self,
         request: SimilarImageSearchRequest,
@@ -83,25 +113,41 @@ class SimilarImageSearchService(AbstractSimilarImageSearchService):
         logger.info(f"request for similar image: {request}")
         if self.url is None:
             logger.info(f"skip request similar image search")
-            return SimilarImageSearchResponse(ids=[id])
-
-        with httpx.Client(
-            timeout=self.timeout,
-            transport=self.transport,
-        ) as client:
-            req = request.dict()
-            res = client.post(
+            return SimilarImageSearchResponse(ids=[request.id])
+        res: Optional[httpx.Response] = None
+        try:
+            res = self.client.post(
                 url=self.url,
-                data=json.dumps(req),
+                data=json.dumps(request.dict()),
                 headers=self.post_header,
+                timeout=self.timeout,
             )
-        if res.status_code != 200:
-            logger.error(f"failed to request similar image search: {res}")
-            return SimilarImageSearchResponse(
-                ids=[id],
-                model_name=None,
+        except httpx.HTTPError as e:
+            logger.error(f"failed to request similar image search: {e}")
+        return self.__parse_response(
+            request=request,
+            res=res,
+        )
+
+    async def async_search(
+        self,
+        request: SimilarImageSearchRequest,
+    ) -> SimilarImageSearchResponse:
+        logger.info(f"request for similar image: {request}")
+        if self.url is None:
+            logger.info(f"skip request similar image search")
+            return SimilarImageSearchResponse(ids=[request.id])
+        res: Optional[httpx.Response] = None
+        try:
+            res = await self.async_client.post(
+                url=self.url,
+                data=json.dumps(request.dict()),
+                headers=self.post_header,
+                timeout=self.timeout,
             )
-        res_json = res.json()
-        response = SimilarImageSearchResponse(**res_json)
-        logger.info(f"response from similar image search: {response}")
-        return response
+        except httpx.HTTPError as e:
+            logger.error(f"failed to request similar image search: {e}")
+        return self.__parse_response(
+            request=request,
+            res=res,
+        )
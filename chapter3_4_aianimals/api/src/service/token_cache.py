@@ -0,0 +1,300 @@
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from logging import getLogger
+from typing import Optional, Tuple, Union
+
+from src.constants import CONSTANTS
+from src.infrastructure.cache import AbstractCache
+from src.middleware.lru_cache import LRUCache
+
+logger = getLogger(__name__)
+
+
+class AbstractTokenCache(ABC):
+    def __init__(
+        self,
+        cache: Optional[AbstractCache] = None,
+        max_size: int = 10000,
+        ttl_second: int = 10,
+        redis_ttl_second: int = 600,
+    ):
+        self.cache = cache
+        self.max_size = max_size
+        self.ttl_second = ttl_second
+        self.redis_ttl_second = redis_ttl_second
+
+    @abstractmethod
+    def get(
+        self,
+        token: str,
+    ) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_shared(
+        self,
+        token: str,
+    ) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(
+        self,
+        token: str,
+        user_id: str,
+        shared: bool = True,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate_user(
+        self,
+        user_id: str,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_get_shared(
+        self,
+        token: str,
+    ) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_set(
+        self,
+        token: str,
+        user_id: str,
+        shared: bool = True,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_invalidate_user(
+        self,
+        user_id: str,
+    ):
+        raise NotImplementedError
+
+
+class TokenCache(AbstractTokenCache):
+    def __init__(
+        self,
+        cache: Optional[AbstractCache] = None,
+        max_size: int = 10000,
+        ttl_second: int = 10,
+        redis_ttl_second: int = 600,
+    ):
+        super().__init__(
+            cache=cache,
+            max_size=max_size,
+            ttl_second=ttl_second,
+            redis_ttl_second=redis_ttl_second,
+        )
+        self.__entries = LRUCache(
+            max_size=self.max_size,
+            ttl_second=self.ttl_second,
+        )
+        self.__revocations = LRUCache(
+            max_size=self.max_size,
+            ttl_second=self.ttl_second,
+        )
+
+    def make_digest(
+        self,
+        token: str,
+    ) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def __make_token_key(
+        self,
+        digest: str,
+    ) -> str:
+        return f"{CONSTANTS.TOKEN_CACHE_PREFIX}_{digest}"
+
+    def __make_revoked_key(
+        self,
+        user_id: str,
+    ) -> str:
+        return f"{CONSTANTS.TOKEN_REVOKED_PREFIX}_{user_id}"
+
+    def __make_redis_value(
+        self,
+        user_id: str,
+        verified_at: float,
+    ) -> str:
+        return f"{user_id}{CONSTANTS.SPLITTER}{verified_at}"
+
+    def __parse_redis_value(
+        self,
+        value: Optional[Union[str, int, float, bool, bytes]],
+    ) -> Optional[Tuple[str, float]]:
+        if value is None or not isinstance(value, str) or CONSTANTS.SPLITTER not in value:
+            return None
+        user_id, verified_at = value.split(CONSTANTS.SPLITTER)
+        return user_id, float(verified_at)
+
+    def __is_revoked(
+        self,
+        user_id: str,
+        verified_at: float,
+        revoked_at: Optional[Union[str, int, float, bool, bytes]],
+    ) -> bool:
+        if revoked_at is None:
+            return False
+        try:
+            revoked = verified_at <= float(revoked_at)
+        except ValueError:
+            logger.warning(f"invalid token revocation for {user_id}: {revoked_at!r}")
+            revoked = True
+        if revoked:
+            logger.info(f"token revoked for {user_id}")
+        return revoked
+
+    def __is_revoked_locally(
+        self,
+        user_id: str,
+        verified_at: float,
+    ) -> bool:
+        return self.__is_revoked(
+            user_id=user_id,
+            verified_at=verified_at,
+            revoked_at=self.__revocations.get(key=user_id),
+        )
+
+    def __revoke_locally(
+        self,
+        user_id: str,
+    ) -> float:
+        revoked_at = time.time()
+        self.__revocations.set(
+            key=user_id,
+            value=revoked_at,
+        )
+        logger.info(f"invalidated cached tokens for {user_id}")
+        return revoked_at
+
+    def get(
+        self,
+        token: str,
+    ) -> Optional[str]:
+        digest = self.make_digest(token=token)
+        entry = self.__entries.get(key=digest)
+        if entry is None:
+            return None
+        user_id, verified_at = entry
+        if self.__is_revoked_locally(user_id=user_id, verified_at=verified_at):
+            self.__entries.delete(key=digest)
+            return None
+        return user_id
+
+    def get_shared(
+        self,
+        token: str,
+    ) -> Optional[str]:
+        if self.cache is None:
+            return None
+        digest = self.make_digest(token=token)
+        entry = self.__parse_redis_value(value=self.cache.get(key=self.__make_token_key(digest=digest)))
+        if entry is None:
+            return None
+        user_id, verified_at = entry
+        if self.__is_revoked_locally(user_id=user_id, verified_at=verified_at):
+            return None
+        if self.__is_revoked(
+            user_id=user_id,
+            verified_at=verified_at,
+            revoked_at=self.cache.get(key=self.__make_revoked_key(user_id=user_id)),
+        ):
+            return None
+        return user_id
+
+    async def async_get_shared(
+        self,
+        token: str,
+    ) -> Optional[str]:
+        if self.cache is None:
+            return None
+        digest = self.make_digest(token=token)
+        entry = self.__parse_redis_value(value=await self.cache.async_get(key=self.__make_token_key(digest=digest)))
+        if entry is None:
+            return None
+        user_id, verified_at = entry
+        if self.__is_revoked_locally(user_id=user_id, verified_at=verified_at):
+            return None
+        if self.__is_revoked(
+            user_id=user_id,
+            verified_at=verified_at,
+            revoked_at=await self.cache.async_get(key=self.__make_revoked_key(user_id=user_id)),
+        ):
+            return None
+        return user_id
+
+    def set(
+        self,
+        token: str,
+        user_id: str,
+        shared: bool = True,
+    ):
+        digest = self.make_digest(token=token)
+        verified_at = time.time()
+        self.__entries.set(
+            key=digest,
+            value=(user_id, verified_at),
+        )
+        if shared and self.cache is not None:
+            self.cache.set(
+                key=self.__make_token_key(digest=digest),
+                value=self.__make_redis_value(
+                    user_id=user_id,
+                    verified_at=verified_at,
+                ),
+                expire_second=self.redis_ttl_second,
+            )
+
+    async def async_set(
+        self,
+        token: str,
+        user_id: str,
+        shared: bool = True,
+    ):
+        digest = self.make_digest(token=token)
+        verified_at = time.time()
+        self.__entries.set(
+            key=digest,
+            value=(user_id, verified_at),
+        )
+        if shared and self.cache is not None:
+            await self.cache.async_set(
+                key=self.__make_token_key(digest=digest),
+                value=self.__make_redis_value(
+                    user_id=user_id,
+                    verified_at=verified_at,
+                ),
+                expire_second=self.redis_ttl_second,
+            )
+
+    def invalidate_user(
+        self,
+        user_id: str,
+    ):
+        revoked_at = self.__revoke_locally(user_id=user_id)
+        if self.cache is not None:
+            self.cache.set(
+                key=self.__make_revoked_key(user_id=user_id),
+                value=revoked_at,
+                expire_second=self.redis_ttl_second,
+            )
+
+    async def async_invalidate_user(
+        self,
+        user_id: str,
+    ):
+        revoked_at = self.__revoke_locally(user_id=user_id)
+        if self.cache is not None:
+            await self.cache.async_set(
+                key=self.__make_revoked_key(user_id=user_id),
+                value=revoked_at,
+                expire_second=self.redis_ttl_second,
+            )
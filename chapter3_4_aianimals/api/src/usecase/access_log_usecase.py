@@ -1,13 +1,10 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
 from logging import getLogger
+from typing import List
 
-from sqlalchemy.orm import Session
-from src.entities.access_log import AccessLogCreate, Action
-from src.middleware.strings import get_uuid
 from src.repository.access_log_repository import AbstractAccessLogRepository
-from src.repository.like_repository import AbstractLikeRepository
 from src.request_object.access_log import AccessLogCreateRequest
+from src.service.access_log_buffer import AbstractAccessLogBuffer
 
 logger = getLogger(__name__)
 
@@ -16,17 +13,23 @@ class AbstractAccessLogUsecase(ABC):
     def __init__(
         self,
         access_log_repository: AbstractAccessLogRepository,
-        like_repository: AbstractLikeRepository,
+        access_log_buffer: AbstractAccessLogBuffer,
     ):
         self.access_log_repository = access_log_repository
-        self.like_repository = like_repository
+        self.access_log_buffer = access_log_buffer
 
     @abstractmethod
     def register(
         self,
-        session: Session,
         request: AccessLogCreateRequest,
-    ):
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def bulk_register(
+        self,
+        requests: List[AccessLogCreateRequest],
+    ) -> bool:
         raise NotImplementedError
 
 
@@ -34,43 +37,21 @@ class AccessLogUsecase(AbstractAccessLogUsecase):
     def __init__(
         self,
         access_log_repository: AbstractAccessLogRepository,
-        like_repository: AbstractLikeRepository,
+        access_log_buffer: AbstractAccessLogBuffer,
     ):
         super().__init__(
             access_log_repository=access_log_repository,
-            like_repository=like_repository,
+            access_log_buffer=access_log_buffer,
         )
 
     def register(
         self,
-        session: Session,
         request: AccessLogCreateRequest,
-    ):
-        action = Action.value_to_key(value=request.action)
-        if action is None:
-            logger.error(f"invalid action: {request.action}")
-            return
-        if request.created_at is None:
-            request.created_at = datetime.now()
-        likes = self.like_repository.count(
-            session=session,
-            animal_ids=[request.animal_id],
-        )
-        like_count = likes[request.animal_id].count
+    ) -> bool:
+        return self.bulk_register(requests=[request])
 
-        record = AccessLogCreate(
-            id=get_uuid(),
-            phrases=request.phrases,
-            animal_category_id=request.animal_category_id,
-            animal_subcategory_id=request.animal_subcategory_id,
-            user_id=request.user_id,
-            likes=like_count,
-            animal_id=request.animal_id,
-            action=action,
-            created_at=request.created_at,
-        )
-        self.access_log_repository.insert(
-            session=session,
-            record=record,
-            commit=True,
-        )
+    def bulk_register(
+        self,
+        requests: List[AccessLogCreateRequest],
+    ) -> bool:
+        return self.access_log_buffer.put(requests=requests)
@@ -8,6 +8,7 @@ from src.middleware.strings import get_uuid
 from src.repository.animal_category_repository import AbstractAnimalCategoryRepository
 from src.request_object.animal_category import AnimalCategoryCreateRequest, AnimalCategoryRequest
 from src.response_object.animal_category import AnimalCategoryResponse
+from src.service.local_cache import AbstractLocalCache
 
 logger = getLogger(__name__)
 
@@ -16,8 +17,10 @@ class AbstractAnimalCategoryUsecase(ABC):
     def __init__(
         self,
         animal_category_repository: AbstractAnimalCategoryRepository,
+        local_cache: AbstractLocalCache,
     ):
         self.animal_category_repository = animal_category_repository
+        self.local_cache = local_cache
 
     @abstractmethod
     def retrieve(
@@ -40,22 +43,30 @@ class AnimalCategoryUsecase(AbstractAnimalCategoryUsecase):
     def __init__(
         self,
         animal_category_repository: AbstractAnimalCategoryRepository,
+        local_cache: AbstractLocalCache,
     ):
-        super().__init__(animal_category_repository=animal_category_repository)
+        super().__init__(
+            animal_category_repository=animal_category_repository,
+            local_cache=local_cache,
+        )
 
     def retrieve(
         self,
         session: Session,
         request: Optional[AnimalCategoryRequest] = None,
     ) -> List[AnimalCategoryResponse]:
-        query: Optional[AnimalCategoryQuery] = None
-        if request is not None:
-            query = AnimalCategoryQuery(**request.dict())
-
-        data = self.animal_category_repository.select(
-            session=session,
-            query=query,
-        )
+        query = AnimalCategoryQuery(**request.dict()) if request is not None else None
+        data = self.local_cache.list_animal_categories()
+        if query is not None:
+            if query.id is not None:
+                animal_category = self.local_cache.get_animal_category_by_id(id=query.id)
+                data = [animal_category] if animal_category is not None else []
+            if query.name_en is not None:
+                data = [d for d in data if d.name_en == query.name_en]
+            if query.name_ja is not None:
+                data = [d for d in data if d.name_ja == query.name_ja]
+            if query.is_deleted is not None:
+                data = [d for d in data if d.is_deleted == query.is_deleted]
         response = [AnimalCategoryResponse(**d.dict()) for d in data]
         return response
 
@@ -75,6 +86,7 @@ class AnimalCategoryUsecase(AbstractAnimalCategoryUsecase):
             commit=True,
         )
         if data is not None:
+            self.local_cache.refresh()
             response = AnimalCategoryResponse(**data.dict())
             return response
         return None
@@ -1,9 +1,10 @@
-import json
+import asyncio
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 from fastapi import BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.configurations import Configurations
 from src.constants import CONSTANTS
@@ -11,16 +12,22 @@ from src.entities.animal import (
     ANIMAL_INDEX,
     AnimalCreate,
     AnimalIDs,
+    AnimalLikeModel,
     AnimalQuery,
+    AnimalSearchCursor,
     AnimalSearchQuery,
+    AnimalSearchResult,
+    AnimalSearchResults,
     AnimalSearchSortKey,
 )
 from src.infrastructure.cache import AbstractCache
 from src.infrastructure.messaging import AbstractMessaging
 from src.infrastructure.search import AbstractSearch
 from src.infrastructure.storage import AbstractStorage
-from src.middleware.json import json_serial
+from src.middleware.cursor import decode_cursor, decode_json_cursor, encode_json_cursor
+from src.middleware.lru_cache import LRUCache
 from src.middleware.strings import get_uuid
+from src.middleware.tracing import record_cache, stage
 from src.repository.animal_repository import AbstractAnimalRepository
 from src.repository.like_repository import AbstractLikeRepository
 from src.request_object.animal import (
@@ -39,6 +46,7 @@ from src.response_object.animal import (
 from src.response_object.user import UserResponse
 from src.service.learn_to_rank import AbstractLearnToRankService, LearnToRankRequest
 from src.service.local_cache import AbstractLocalCache
+from src.service.search_cache import AbstractSearchCache
 from src.service.similar_image_search import AbstractSimilarImageSearchService, SimilarImageSearchRequest
 
 logger = getLogger(__name__)
@@ -56,6 +64,7 @@ class AbstractAnimalUsecase(ABC):
         search_client: AbstractSearch,
         messaging: AbstractMessaging,
         local_cache: AbstractLocalCache,
+        search_cache: AbstractSearchCache,
     ):
         self.animal_repository = animal_repository
         self.like_repository = like_repository
@@ -66,6 +75,7 @@ class AbstractAnimalUsecase(ABC):
         self.search_client = search_client
         self.messaging = messaging
         self.local_cache = local_cache
+        self.search_cache = search_cache
 
     @abstractmethod
     def retrieve(
@@ -74,6 +84,18 @@ class AbstractAnimalUsecase(ABC):
         request: Optional[AnimalRequest] = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[AnimalResponse]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_retrieve(
+        self,
+        session: AsyncSession,
+        request: Optional[AnimalRequest] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[AnimalResponse]:
         raise NotImplementedError
 
@@ -84,6 +106,18 @@ class AbstractAnimalUsecase(ABC):
         animal_id: str,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[UserResponse]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_liked_by(
+        self,
+        session: AsyncSession,
+        animal_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[UserResponse]:
         raise NotImplementedError
 
@@ -97,6 +131,16 @@ class AbstractAnimalUsecase(ABC):
     ) -> Optional[AnimalResponse]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_register(
+        self,
+        session: AsyncSession,
+        request: AnimalCreateRequest,
+        local_file_path: str,
+        background_tasks: BackgroundTasks,
+    ) -> Optional[AnimalResponse]:
+        raise NotImplementedError
+
     @abstractmethod
     def search(
         self,
@@ -107,6 +151,54 @@ class AbstractAnimalUsecase(ABC):
     ) -> AnimalSearchResponses:
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_search(
+        self,
+        request: AnimalSearchRequest,
+        background_tasks: BackgroundTasks,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> AnimalSearchResponses:
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_batch(
+        self,
+        requests: List[AnimalSearchRequest],
+        background_tasks: BackgroundTasks,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[AnimalSearchResponses]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_search_batch(
+        self,
+        requests: List[AnimalSearchRequest],
+        background_tasks: BackgroundTasks,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[AnimalSearchResponses]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_after(
+        self,
+        request: AnimalSearchRequest,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[AnimalSearchResponses, Optional[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_search_after(
+        self,
+        request: AnimalSearchRequest,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[AnimalSearchResponses, Optional[str]]:
+        raise NotImplementedError
+
     @abstractmethod
     def search_similar_image(
         self,
@@ -115,6 +207,14 @@ class AbstractAnimalUsecase(ABC):
     ) -> SimilarAnimalSearchResponses:
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_search_similar_image(
+        self,
+        session: AsyncSession,
+        request: SimilarAnimalSearchRequest,
+    ) -> SimilarAnimalSearchResponses:
+        raise NotImplementedError
+
 
 class AnimalUsecase(AbstractAnimalUsecase):
     def __init__(
@@ -128,6 +228,7 @@ class AnimalUsecase(AbstractAnimalUsecase):
         search_client: AbstractSearch,
         messaging: AbstractMessaging,
         local_cache: AbstractLocalCache,
+        search_cache: AbstractSearchCache,
     ):
         super().__init__(
             animal_repository=animal_repository,
@@ -139,6 +240,12 @@ class AnimalUsecase(AbstractAnimalUsecase):
             search_client=search_client,
             messaging=messaging,
             local_cache=local_cache,
+            search_cache=search_cache,
+        )
+        self.learn_to_rank_model_name: Optional[str] = None
+        self.similar_word_cache = LRUCache(
+            max_size=Configurations.similar_word_cache_size,
+            ttl_second=Configurations.similar_word_cache_ttl_second,
         )
 
     def retrieve(
@@ -147,9 +254,10 @@ class AnimalUsecase(AbstractAnimalUsecase):
         request: Optional[AnimalRequest] = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[AnimalResponse]:
         if limit > 200:
-            raise ValueError
+            raise ValueError("limit must be 200 or less")
         query: Optional[AnimalQuery] = None
         if request is not None:
             query = AnimalQuery(**request.dict())
@@ -158,6 +266,7 @@ class AnimalUsecase(AbstractAnimalUsecase):
             query=query,
             limit=limit,
             offset=offset,
+            after_id=decode_cursor(cursor=cursor) if cursor is not None else None,
         )
         like = self.like_repository.count(
             session=session,
@@ -166,24 +275,62 @@ class AnimalUsecase(AbstractAnimalUsecase):
         response = [AnimalResponse(like=like[d.id].count, **d.dict()) for d in data]
         return response
 
+    async def async_retrieve(
+        self,
+        session: AsyncSession,
+        request: Optional[AnimalRequest] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[AnimalResponse]:
+        return await session.run_sync(
+            lambda s: self.retrieve(
+                session=s,
+                request=request,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        )
+
     def liked_by(
         self,
         session: Session,
         animal_id: str,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[UserResponse]:
         if limit > 200:
-            raise ValueError
+            raise ValueError("limit must be 200 or less")
         data = self.animal_repository.liked_by(
             session=session,
             animal_id=animal_id,
             limit=limit,
             offset=offset,
+            after_id=decode_cursor(cursor=cursor) if cursor is not None else None,
         )
         response = [UserResponse(**d.dict()) for d in data]
         return response
 
+    async def async_liked_by(
+        self,
+        session: AsyncSession,
+        animal_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[UserResponse]:
+        return await session.run_sync(
+            lambda s: self.liked_by(
+                session=s,
+                animal_id=animal_id,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        )
+
     def register(
         self,
         session: Session,
@@ -215,20 +362,35 @@ class AnimalUsecase(AbstractAnimalUsecase):
         )
         if data is not None:
             response = AnimalResponse(**data.dict())
-            for q in Configurations.animal_violation_queues:
-                background_tasks.add_task(
-                    self.messaging.publish,
-                    q,
-                    {"id": data.id},
-                )
+            background_tasks.add_task(
+                self.messaging.async_publish_batch,
+                [(q, {"id": data.id}) for q in Configurations.animal_violation_queues],
+            )
             return response
         return None
 
+    async def async_register(
+        self,
+        session: AsyncSession,
+        request: AnimalCreateRequest,
+        local_file_path: str,
+        background_tasks: BackgroundTasks,
+    ) -> Optional[AnimalResponse]:
+        return await session.run_sync(
+            lambda s: self.register(
+                session=s,
+                request=request,
+                local_file_path=local_file_path,
+                background_tasks=background_tasks,
+            )
+        )
+
     def __make_search_key(
         self,
         query: AnimalSearchQuery,
         limit: int = 100,
         offset: int = 0,
+        model_name: Optional[str] = None,
     ) -> str:
         key = f"{CONSTANTS.ANIMAL_SEARCH_CACHE_PREFIX}_"
         key += f"{query.animal_category_name_en}_"
@@ -236,21 +398,71 @@ class AnimalUsecase(AbstractAnimalUsecase):
         key += f"{query.animal_subcategory_name_en}_"
         key += f"{query.animal_subcategory_name_ja}_"
         key += f"{'_'.join(sorted(query.phrases))}_"
+        key += f"{'_'.join(sorted(query.similar_words or []))}_"
         key += f"{limit}_"
         key += f"{offset}_"
         key += query.sort_by.value
+        if query.sort_by == AnimalSearchSortKey.LEARN_TO_RANK:
+            key += f"_{model_name}"
         return key
 
-    def __set_search_cache(
+    def __track_learn_to_rank_model_name(
         self,
-        key: str,
-        result: AnimalSearchResponses,
+        model_name: Optional[str],
     ):
-        logger.info(f"save cache: {key}")
-        self.cache.set(
-            key=key,
-            value=json.dumps(result.dict(), default=json_serial),
-            expire_second=60 * 10,
+        if not Configurations.learn_to_rank_cache:
+            return
+        if model_name is None or self.learn_to_rank_model_name == model_name:
+            return
+        logger.info(f"learn to rank model changed from {self.learn_to_rank_model_name} to {model_name}")
+        if self.learn_to_rank_model_name is not None:
+            self.search_cache.invalidate_local()
+        self.learn_to_rank_model_name = model_name
+
+    def __needs_learn_to_rank_model_name(
+        self,
+        queries: List[AnimalSearchQuery],
+    ) -> bool:
+        return Configurations.learn_to_rank_cache and any(
+            query.sort_by == AnimalSearchSortKey.LEARN_TO_RANK for query in queries
+        )
+
+    def __get_learn_to_rank_model_name(
+        self,
+        queries: List[AnimalSearchQuery],
+    ) -> Optional[str]:
+        if self.__needs_learn_to_rank_model_name(queries=queries):
+            self.__track_learn_to_rank_model_name(model_name=self.learn_to_rank.get_model_name())
+        return self.learn_to_rank_model_name
+
+    async def __async_get_learn_to_rank_model_name(
+        self,
+        queries: List[AnimalSearchQuery],
+    ) -> Optional[str]:
+        if self.__needs_learn_to_rank_model_name(queries=queries):
+            self.__track_learn_to_rank_model_name(model_name=await self.learn_to_rank.async_get_model_name())
+        return self.learn_to_rank_model_name
+
+    def __make_search_cache_key(
+        self,
+        query: AnimalSearchQuery,
+        limit: int = 100,
+        offset: int = 0,
+        model_name: Optional[str] = None,
+    ) -> Optional[str]:
+        if query.sort_by != AnimalSearchSortKey.LEARN_TO_RANK:
+            return self.__make_search_key(
+                query=query,
+                limit=limit,
+                offset=offset,
+            )
+        if not Configurations.learn_to_rank_cache or model_name is None:
+            return None
+        return self.__make_search_key(
+            query=query,
+            limit=limit,
+            offset=offset,
+            model_name=model_name,
         )
 
     def __make_similar_word_cache_key(
@@ -270,15 +482,11 @@ class AnimalUsecase(AbstractAnimalUsecase):
             extracted[k] = float(v)
         return extracted
 
-    def search(
+    def __make_search_query(
         self,
         request: AnimalSearchRequest,
-        background_tasks: BackgroundTasks,
-        limit: int = 100,
-        offset: int = 0,
-    ) -> AnimalSearchResponses:
-        search_id = get_uuid()
-        model_name = None
+        similar_words: List[str],
+    ) -> AnimalSearchQuery:
         sort_by = AnimalSearchSortKey.value_to_key(value=request.sort_by)
         query = AnimalSearchQuery(
             animal_category_name_en=request.animal_category_name_en,
@@ -286,125 +494,743 @@ class AnimalUsecase(AbstractAnimalUsecase):
             animal_subcategory_name_en=request.animal_subcategory_name_en,
             animal_subcategory_name_ja=request.animal_subcategory_name_ja,
             phrases=request.phrases,
+            similar_words=similar_words,
             sort_by=sort_by,
         )
         logger.info(f"search query: {query}")
-        key = self.__make_search_key(
-            query=query,
-            limit=limit,
-            offset=offset,
-        )
-        cached = self.cache.get(key=key)
-        if cached is not None and isinstance(cached, str):
-            cache = json.loads(cached)
-            logger.info(f"hit cache: {key}")
-            searched = AnimalSearchResponses(**cache)
-            searched.search_id = search_id
-            logger.info(f"request: {request}; response: {searched}")
-            return searched
-
-        logger.info(f"no cache for {key}")
-
-        similar_words: List[str] = []
-        for phrase in request.phrases:
-            similar_words_key = self.__make_similar_word_cache_key(word=phrase)
-            cached_similar_words = self.cache.get(key=similar_words_key)
-            if cached_similar_words is not None and isinstance(cached_similar_words, str):
-                _similar_words = self.__extract_similar_word_value(similar_words=cached_similar_words)
-                similar_words.extend(list(_similar_words.keys()))
-        similar_words = list(set(similar_words))
-        logger.info(f"similar words: {similar_words}")
-        AnimalSearchQuery.similar_words = similar_words
-
-        results = self.search_client.search(
-            index=ANIMAL_INDEX,
-            query=query,
-            from_=offset,
-            size=limit,
+        return query
+
+    def __split_similar_word_phrases(
+        self,
+        phrases: List[str],
+    ) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+        similar_words: Dict[str, Dict[str, float]] = {}
+        missing_phrases: List[str] = []
+        for phrase in dict.fromkeys(phrases):
+            _similar_words = self.similar_word_cache.get(key=phrase)
+            if _similar_words is None:
+                missing_phrases.append(phrase)
+            else:
+                similar_words[phrase] = _similar_words
+        record_cache(
+            cache="similar_word",
+            hit=len(phrases) - len(missing_phrases),
+            miss=len(missing_phrases),
         )
-        if query.sort_by == AnimalSearchSortKey.LEARN_TO_RANK:
-            _ids = {r.id: r for r in results.results}
-            learn_to_rank_request = LearnToRankRequest(
-                ids=list(_ids.keys()),
-                query_phrases=query.phrases,
-            )
-            if query.animal_category_name_en is not None:
-                animal_category_id = self.local_cache.get_animal_category_id_by_name(name=query.animal_category_name_en)
-                learn_to_rank_request.query_animal_category_id = animal_category_id
-            if query.animal_category_name_ja is not None:
-                animal_category_id = self.local_cache.get_animal_category_id_by_name(name=query.animal_category_name_ja)
-                learn_to_rank_request.query_animal_category_id = animal_category_id
-            if query.animal_subcategory_name_en is not None:
-                animal_subcategory_id = self.local_cache.get_animal_subcategory_id_by_name(
-                    name=query.animal_subcategory_name_en
+        return similar_words, missing_phrases
+
+    def __register_similar_words(
+        self,
+        phrases: List[str],
+        cached_similar_words: List[Optional[Union[str, int, float, bool, bytes]]],
+    ) -> Dict[str, Dict[str, float]]:
+        similar_words: Dict[str, Dict[str, float]] = {}
+        for phrase, c in zip(phrases, cached_similar_words):
+            _similar_words: Dict[str, float] = {}
+            if c is not None and isinstance(c, str):
+                _similar_words = self.__extract_similar_word_value(similar_words=c)
+            self.similar_word_cache.set(
+                key=phrase,
+                value=_similar_words,
+            )
+            similar_words[phrase] = _similar_words
+        return similar_words
+
+    def __merge_similar_words(
+        self,
+        phrases: List[str],
+        similar_word_map: Dict[str, Dict[str, float]],
+    ) -> List[str]:
+        similar_words: Dict[str, float] = {}
+        for phrase in phrases:
+            similar_words.update(similar_word_map.get(phrase, {}))
+        logger.info(f"similar words: {list(similar_words.keys())}")
+        return list(similar_words.keys())
+
+    def __get_similar_word_map(
+        self,
+        phrases: List[str],
+    ) -> Dict[str, Dict[str, float]]:
+        similar_word_map, missing_phrases = self.__split_similar_word_phrases(phrases=phrases)
+        if len(missing_phrases) > 0:
+            cached_similar_words = self.cache.mget(
+                keys=[self.__make_similar_word_cache_key(word=phrase) for phrase in missing_phrases],
+            )
+            similar_word_map.update(
+                self.__register_similar_words(
+                    phrases=missing_phrases,
+                    cached_similar_words=cached_similar_words,
                 )
-                learn_to_rank_request.query_animal_subcategory_id = animal_subcategory_id
-            if query.animal_subcategory_name_ja is not None:
-                animal_subcategory_id = self.local_cache.get_animal_subcategory_id_by_name(
-                    name=query.animal_subcategory_name_ja
+            )
+        return similar_word_map
+
+    async def __async_get_similar_word_map(
+        self,
+        phrases: List[str],
+    ) -> Dict[str, Dict[str, float]]:
+        similar_word_map, missing_phrases = self.__split_similar_word_phrases(phrases=phrases)
+        if len(missing_phrases) > 0:
+            cached_similar_words = await self.cache.async_mget(
+                keys=[self.__make_similar_word_cache_key(word=phrase) for phrase in missing_phrases],
+            )
+            similar_word_map.update(
+                self.__register_similar_words(
+                    phrases=missing_phrases,
+                    cached_similar_words=cached_similar_words,
                 )
-                learn_to_rank_request.query_animal_subcategory_id = animal_subcategory_id
+            )
+        return similar_word_map
+
+    def __get_similar_words(
+        self,
+        phrases: List[str],
+    ) -> List[str]:
+        return self.__merge_similar_words(
+            phrases=phrases,
+            similar_word_map=self.__get_similar_word_map(phrases=phrases),
+        )
+
+    async def __async_get_similar_words(
+        self,
+        phrases: List[str],
+    ) -> List[str]:
+        return self.__merge_similar_words(
+            phrases=phrases,
+            similar_word_map=await self.__async_get_similar_word_map(phrases=phrases),
+        )
+
+    def __make_learn_to_rank_request(
+        self,
+        query: AnimalSearchQuery,
+        ids: List[str],
+    ) -> LearnToRankRequest:
+        learn_to_rank_request = LearnToRankRequest(
+            ids=ids,
+            query_phrases=query.phrases,
+        )
+        if query.animal_category_name_en is not None:
+            animal_category_id = self.local_cache.get_animal_category_id_by_name(name=query.animal_category_name_en)
+            learn_to_rank_request.query_animal_category_id = animal_category_id
+        if query.animal_category_name_ja is not None:
+            animal_category_id = self.local_cache.get_animal_category_id_by_name(name=query.animal_category_name_ja)
+            learn_to_rank_request.query_animal_category_id = animal_category_id
+        if query.animal_subcategory_name_en is not None:
+            animal_subcategory_id = self.local_cache.get_animal_subcategory_id_by_name(
+                name=query.animal_subcategory_name_en
+            )
+            learn_to_rank_request.query_animal_subcategory_id = animal_subcategory_id
+        if query.animal_subcategory_name_ja is not None:
+            animal_subcategory_id = self.local_cache.get_animal_subcategory_id_by_name(
+                name=query.animal_subcategory_name_ja
+            )
+            learn_to_rank_request.query_animal_subcategory_id = animal_subcategory_id
+        return learn_to_rank_request
+
+    def __learn_to_rank(
+        self,
+        query: AnimalSearchQuery,
+        results: AnimalSearchResults,
+    ) -> Optional[str]:
+        if query.sort_by != AnimalSearchSortKey.LEARN_TO_RANK:
+            return None
+        _ids = {r.id: r for r in results.results}
+        learn_to_rank_request = self.__make_learn_to_rank_request(
+            query=query,
+            ids=list(_ids.keys()),
+        )
+        with stage("search", "learn_to_rank"):
             ranked_ids = self.learn_to_rank.reorder(request=learn_to_rank_request)
-            model_name = ranked_ids.model_name
-            _results = [_ids[i] for i in ranked_ids.ids]
-            results.results = _results
+        results.results = [_ids[i] for i in ranked_ids.ids]
+        return ranked_ids.model_name
 
-        searched = AnimalSearchResponses(
+    async def __async_learn_to_rank(
+        self,
+        query: AnimalSearchQuery,
+        results: AnimalSearchResults,
+    ) -> Optional[str]:
+        if query.sort_by != AnimalSearchSortKey.LEARN_TO_RANK:
+            return None
+        _ids = {r.id: r for r in results.results}
+        learn_to_rank_request = self.__make_learn_to_rank_request(
+            query=query,
+            ids=list(_ids.keys()),
+        )
+        with stage("search", "learn_to_rank"):
+            ranked_ids = await self.learn_to_rank.async_reorder(request=learn_to_rank_request)
+        results.results = [_ids[i] for i in ranked_ids.ids]
+        return ranked_ids.model_name
+
+    def __make_search_response(
+        self,
+        query: AnimalSearchQuery,
+        results: AnimalSearchResults,
+        search_id: str,
+        model_name: Optional[str] = None,
+    ) -> AnimalSearchResponses:
+        if Configurations.search_response_validate:
+            return AnimalSearchResponses(
+                hits=results.hits,
+                max_score=results.max_score,
+                results=[AnimalSearchResponse(**r.dict()) for r in results.results],
+                offset=results.offset,
+                search_id=search_id,
+                sort_by=query.sort_by.value,
+                model_name=model_name,
+            )
+        return AnimalSearchResponses.construct(
             hits=results.hits,
             max_score=results.max_score,
-            results=[AnimalSearchResponse(**r.dict()) for r in results.results],
+            results=[AnimalSearchResponse.construct(**r.__dict__) for r in results.results],
             offset=results.offset,
             search_id=search_id,
-            sort_by=sort_by.value,
+            sort_by=query.sort_by.value,
             model_name=model_name,
         )
-        if query.sort_by != AnimalSearchSortKey.LEARN_TO_RANK:
+
+    def search(
+        self,
+        request: AnimalSearchRequest,
+        background_tasks: BackgroundTasks,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> AnimalSearchResponses:
+        search_id = get_uuid()
+        with stage("search", "similar_words"):
+            similar_words = self.__get_similar_words(phrases=request.phrases)
+        with stage("search", "query"):
+            query = self.__make_search_query(
+                request=request,
+                similar_words=similar_words,
+            )
+        model_name = self.__get_learn_to_rank_model_name(queries=[query])
+        key = self.__make_search_cache_key(
+            query=query,
+            limit=limit,
+            offset=offset,
+            model_name=model_name,
+        )
+        if key is not None:
+            with stage("search", "search_cache"):
+                searched = self.search_cache.get(
+                    key=key,
+                    search_id=search_id,
+                )
+            if searched is not None:
+                logger.info(f"hit cache: {key}")
+                logger.info(f"request: {request}; response: {searched}")
+                return searched
+            logger.info(f"no cache for {key}")
+
+        with stage("search", "elasticsearch"):
+            results = self.search_client.search(
+                index=ANIMAL_INDEX,
+                query=query,
+                from_=offset,
+                size=limit,
+            )
+        model_name = self.__learn_to_rank(
+            query=query,
+            results=results,
+        )
+
+        with stage("search", "response"):
+            searched = self.__make_search_response(
+                query=query,
+                results=results,
+                search_id=search_id,
+                model_name=model_name,
+            )
+        cache_key = self.__make_search_cache_key(
+            query=query,
+            limit=limit,
+            offset=offset,
+            model_name=model_name,
+        )
+        if cache_key is not None:
             background_tasks.add_task(
-                self.__set_search_cache,
-                key,
+                self.search_cache.set,
+                cache_key,
                 searched,
             )
         logger.info(f"request: {request}; response: {searched}")
         return searched
 
-    def search_similar_image(
+    async def async_search(
         self,
-        session: Session,
-        request: SimilarAnimalSearchRequest,
-    ) -> SimilarAnimalSearchResponses:
+        request: AnimalSearchRequest,
+        background_tasks: BackgroundTasks,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> AnimalSearchResponses:
         search_id = get_uuid()
-        search_request = SimilarImageSearchRequest(id=request.id)
-        response = self.similar_image_search.search(request=search_request)
-        query = AnimalIDs(ids=response.ids)
-        animals = self.animal_repository.select_by_ids(
-            session=session,
+        with stage("search", "similar_words"):
+            similar_words = await self.__async_get_similar_words(phrases=request.phrases)
+        with stage("search", "query"):
+            query = self.__make_search_query(
+                request=request,
+                similar_words=similar_words,
+            )
+        model_name = await self.__async_get_learn_to_rank_model_name(queries=[query])
+        key = self.__make_search_cache_key(
             query=query,
+            limit=limit,
+            offset=offset,
+            model_name=model_name,
         )
-        likes = self.like_repository.count(
-            session=session,
-            animal_ids=[a.id for a in animals],
+        if key is not None:
+            with stage("search", "search_cache"):
+                searched = await self.search_cache.async_get(
+                    key=key,
+                    search_id=search_id,
+                )
+            if searched is not None:
+                logger.info(f"hit cache: {key}")
+                logger.info(f"request: {request}; response: {searched}")
+                return searched
+            logger.info(f"no cache for {key}")
+
+        with stage("search", "elasticsearch"):
+            results = await self.search_client.async_search(
+                index=ANIMAL_INDEX,
+                query=query,
+                from_=offset,
+                size=limit,
+            )
+        model_name = await self.__async_learn_to_rank(
+            query=query,
+            results=results,
+        )
+
+        with stage("search", "response"):
+            searched = self.__make_search_response(
+                query=query,
+                results=results,
+                search_id=search_id,
+                model_name=model_name,
+            )
+        cache_key = self.__make_search_cache_key(
+            query=query,
+            limit=limit,
+            offset=offset,
+            model_name=model_name,
+        )
+        if cache_key is not None:
+            background_tasks.add_task(
+                self.search_cache.async_set,
+                cache_key,
+                searched,
+            )
+        logger.info(f"request: {request}; response: {searched}")
+        return searched
+
+    def __make_batch_search_queries(
+        self,
+        requests: List[AnimalSearchRequest],
+        similar_words: List[List[str]],
+    ) -> List[AnimalSearchQuery]:
+        return [
+            self.__make_search_query(
+                request=request,
+                similar_words=_similar_words,
+            )
+            for request, _similar_words in zip(requests, similar_words)
+        ]
+
+    def __register_batch_search_responses(
+        self,
+        queries: List[AnimalSearchQuery],
+        search_ids: List[str],
+        searched: List[Optional[AnimalSearchResponses]],
+        missing: List[int],
+        results: List[AnimalSearchResults],
+        model_names: List[Optional[str]],
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Tuple[str, AnimalSearchResponses]]:
+        to_cache: List[Tuple[str, AnimalSearchResponses]] = []
+        for i, _results, model_name in zip(missing, results, model_names):
+            response = self.__make_search_response(
+                query=queries[i],
+                results=_results,
+                search_id=search_ids[i],
+                model_name=model_name,
+            )
+            searched[i] = response
+            cache_key = self.__make_search_cache_key(
+                query=queries[i],
+                limit=limit,
+                offset=offset,
+                model_name=model_name,
+            )
+            if cache_key is not None:
+                to_cache.append((cache_key, response))
+        return to_cache
+
+    def __fill_batch_search_responses(
+        self,
+        searched: List[Optional[AnimalSearchResponses]],
+    ) -> List[AnimalSearchResponses]:
+        responses: List[AnimalSearchResponses] = []
+        for i, response in enumerate(searched):
+            if response is None:
+                raise RuntimeError(f"batch search response {i} is missing")
+            responses.append(response)
+        return responses
+
+    def search_batch(
+        self,
+        requests: List[AnimalSearchRequest],
+        background_tasks: BackgroundTasks,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[AnimalSearchResponses]:
+        search_ids = [get_uuid() for _ in requests]
+        with stage("search_batch", "similar_words"):
+            similar_word_map = self.__get_similar_word_map(phrases=[p for r in requests for p in r.phrases])
+            similar_words = [
+                self.__merge_similar_words(
+                    phrases=r.phrases,
+                    similar_word_map=similar_word_map,
+                )
+                for r in requests
+            ]
+        with stage("search_batch", "query"):
+            queries = self.__make_batch_search_queries(
+                requests=requests,
+                similar_words=similar_words,
+            )
+        model_name = self.__get_learn_to_rank_model_name(queries=queries)
+        keys = [
+            self.__make_search_cache_key(
+                query=query,
+                limit=limit,
+                offset=offset,
+                model_name=model_name,
+            )
+            for query in queries
+        ]
+        cached = [(i, key) for i, key in enumerate(keys) if key is not None]
+        searched: List[Optional[AnimalSearchResponses]] = [None for _ in requests]
+        if len(cached) > 0:
+            with stage("search_batch", "search_cache"):
+                hits = self.search_cache.mget(
+                    keys=[key for _, key in cached],
+                    search_ids=[search_ids[i] for i, _ in cached],
+                )
+            for (i, _), hit in zip(cached, hits):
+                searched[i] = hit
+        missing = [i for i, s in enumerate(searched) if s is None]
+        logger.info(f"hit cache for {len(requests) - len(missing)} of {len(requests)} searches")
+        if len(missing) > 0:
+            with stage("search_batch", "elasticsearch"):
+                results = self.search_client.multi_search(
+                    index=ANIMAL_INDEX,
+                    queries=[queries[i] for i in missing],
+                    from_=offset,
+                    size=limit,
+                )
+            model_names = [
+                self.__learn_to_rank(
+                    query=queries[i],
+                    results=_results,
+                )
+                for i, _results in zip(missing, results)
+            ]
+            with stage("search_batch", "response"):
+                to_cache = self.__register_batch_search_responses(
+                    queries=queries,
+                    search_ids=search_ids,
+                    searched=searched,
+                    missing=missing,
+                    results=results,
+                    model_names=model_names,
+                    limit=limit,
+                    offset=offset,
+                )
+            for cache_key, response in to_cache:
+                background_tasks.add_task(
+                    self.search_cache.set,
+                    cache_key,
+                    response,
+                )
+        return self.__fill_batch_search_responses(searched=searched)
+
+    async def async_search_batch(
+        self,
+        requests: List[AnimalSearchRequest],
+        background_tasks: BackgroundTasks,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[AnimalSearchResponses]:
+        search_ids = [get_uuid() for _ in requests]
+        with stage("search_batch", "similar_words"):
+            similar_word_map = await self.__async_get_similar_word_map(phrases=[p for r in requests for p in r.phrases])
+            similar_words = [
+                self.__merge_similar_words(
+                    phrases=r.phrases,
+                    similar_word_map=similar_word_map,
+                )
+                for r in requests
+            ]
+        with stage("search_batch", "query"):
+            queries = self.__make_batch_search_queries(
+                requests=requests,
+                similar_words=similar_words,
+            )
+        model_name = await self.__async_get_learn_to_rank_model_name(queries=queries)
+        keys = [
+            self.__make_search_cache_key(
+                query=query,
+                limit=limit,
+                offset=offset,
+                model_name=model_name,
+            )
+            for query in queries
+        ]
+        cached = [(i, key) for i, key in enumerate(keys) if key is not None]
+        searched: List[Optional[AnimalSearchResponses]] = [None for _ in requests]
+        if len(cached) > 0:
+            with stage("search_batch", "search_cache"):
+                hits = await self.search_cache.async_mget(
+                    keys=[key for _, key in cached],
+                    search_ids=[search_ids[i] for i, _ in cached],
+                )
+            for (i, _), hit in zip(cached, hits):
+                searched[i] = hit
+        missing = [i for i, s in enumerate(searched) if s is None]
+        logger.info(f"hit cache for {len(requests) - len(missing)} of {len(requests)} searches")
+        if len(missing) > 0:
+            with stage("search_batch", "elasticsearch"):
+                results = await self.search_client.async_multi_search(
+                    index=ANIMAL_INDEX,
+                    queries=[queries[i] for i in missing],
+                    from_=offset,
+                    size=limit,
+                )
+            model_names = await asyncio.gather(
+                *[
+                    self.__async_learn_to_rank(
+                        query=queries[i],
+                        results=_results,
+                    )
+                    for i, _results in zip(missing, results)
+                ]
+            )
+            with stage("search_batch", "response"):
+                to_cache = self.__register_batch_search_responses(
+                    queries=queries,
+                    search_ids=search_ids,
+                    searched=searched,
+                    missing=missing,
+                    results=results,
+                    model_names=list(model_names),
+                    limit=limit,
+                    offset=offset,
+                )
+            for cache_key, response in to_cache:
+                background_tasks.add_task(
+                    self.search_cache.async_set,
+                    cache_key,
+                    response,
+                )
+        return self.__fill_batch_search_responses(searched=searched)
+
+    def __decode_search_cursor(
+        self,
+        cursor: Optional[str] = None,
+    ) -> Optional[AnimalSearchCursor]:
+        if cursor is None:
+            return None
+        return AnimalSearchCursor(**decode_json_cursor(cursor=cursor))
+
+    def __encode_search_cursor(
+        self,
+        results: AnimalSearchResults,
+    ) -> Optional[str]:
+        if results.cursor is None:
+            return None
+        return encode_json_cursor(value=results.cursor.dict())
+
+    def search_after(
+        self,
+        request: AnimalSearchRequest,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[AnimalSearchResponses, Optional[str]]:
+        search_id = get_uuid()
+        search_cursor = self.__decode_search_cursor(cursor=cursor)
+        with stage("search", "similar_words"):
+            similar_words = self.__get_similar_words(phrases=request.phrases)
+        with stage("search", "query"):
+            query = self.__make_search_query(
+                request=request,
+                similar_words=similar_words,
+            )
+        with stage("search", "elasticsearch"):
+            results = self.search_client.search_after(
+                index=ANIMAL_INDEX,
+                query=query,
+                size=limit,
+                cursor=search_cursor,
+            )
+        model_name = self.__learn_to_rank(
+            query=query,
+            results=results,
         )
+        with stage("search", "response"):
+            searched = self.__make_search_response(
+                query=query,
+                results=results,
+                search_id=search_id,
+                model_name=model_name,
+            )
+        logger.info(f"request: {request}; response: {searched}")
+        return searched, self.__encode_search_cursor(results=results)
+
+    async def async_search_after(
+        self,
+        request: AnimalSearchRequest,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[AnimalSearchResponses, Optional[str]]:
+        search_id = get_uuid()
+        search_cursor = self.__decode_search_cursor(cursor=cursor)
+        with stage("search", "similar_words"):
+            similar_words = await self.__async_get_similar_words(phrases=request.phrases)
+        with stage("search", "query"):
+            query = self.__make_search_query(
+                request=request,
+                similar_words=similar_words,
+            )
+        with stage("search", "elasticsearch"):
+            results = await self.search_client.async_search_after(
+                index=ANIMAL_INDEX,
+                query=query,
+                size=limit,
+                cursor=search_cursor,
+            )
+        model_name = await self.__async_learn_to_rank(
+            query=query,
+            results=results,
+        )
+        with stage("search", "response"):
+            searched = self.__make_search_response(
+                query=query,
+                results=results,
+                search_id=search_id,
+                model_name=model_name,
+            )
+        logger.info(f"request: {request}; response: {searched}")
+        return searched, self.__encode_search_cursor(results=results)
+
+    def __make_similar_animal_search_responses(
+        self,
+        request: SimilarAnimalSearchRequest,
+        search_id: str,
+        ids: List[str],
+        documents: Dict[str, Union[AnimalSearchResult, AnimalLikeModel]],
+        model_name: Optional[str],
+    ) -> SimilarAnimalSearchResponses:
         responses = [
             SimilarAnimalSearchResponse(
-                id=a.id,
-                name=a.name,
-                description=a.description,
-                photo_url=a.photo_url,
-                animal_category_name_en=a.animal_category_name_en,
-                animal_category_name_ja=a.animal_category_name_ja,
-                animal_subcategory_name_en=a.animal_subcategory_name_en,
-                animal_subcategory_name_ja=a.animal_subcategory_name_ja,
-                user_handle_name=a.user_handle_name,
-                like=likes[a.id].count,
-                created_at=a.created_at,
-            )
-            for a in animals
+                id=documents[i].id,
+                name=documents[i].name,
+                description=documents[i].description,
+                photo_url=documents[i].photo_url,
+                animal_category_name_en=documents[i].animal_category_name_en,
+                animal_category_name_ja=documents[i].animal_category_name_ja,
+                animal_subcategory_name_en=documents[i].animal_subcategory_name_en,
+                animal_subcategory_name_ja=documents[i].animal_subcategory_name_ja,
+                user_handle_name=documents[i].user_handle_name,
+                like=documents[i].like,
+                created_at=documents[i].created_at,
+            )
+            for i in ids
+            if i in documents
         ]
         searched = SimilarAnimalSearchResponses(
             results=responses,
             search_id=search_id,
             sort_by="image_similarity",
-            model_name=response.model_name,
+            model_name=model_name,
         )
         logger.info(f"request: {request}; response: {searched}")
         return searched
+
+    def search_similar_image(
+        self,
+        session: Session,
+        request: SimilarAnimalSearchRequest,
+    ) -> SimilarAnimalSearchResponses:
+        search_id = get_uuid()
+        search_request = SimilarImageSearchRequest(id=request.id)
+        with stage("search_similar_image", "similar_image_search"):
+            response = self.similar_image_search.search(request=search_request)
+        ids = list(dict.fromkeys(response.ids))
+        documents: Dict[str, Union[AnimalSearchResult, AnimalLikeModel]] = {}
+        if Configurations.similar_image_search_from_index:
+            with stage("search_similar_image", "elasticsearch"):
+                try:
+                    documents.update(
+                        self.search_client.get_documents(
+                            index=ANIMAL_INDEX,
+                            ids=ids,
+                        )
+                    )
+                except Exception as e:
+                    logger.warning(f"failed to get animal documents: {e}")
+        missing_ids = [i for i in ids if i not in documents]
+        if len(missing_ids) > 0:
+            with stage("search_similar_image", "database"):
+                animals = self.animal_repository.select_with_like_by_ids(
+                    session=session,
+                    query=AnimalIDs(ids=missing_ids),
+                )
+            documents.update({a.id: a for a in animals})
+        return self.__make_similar_animal_search_responses(
+            request=request,
+            search_id=search_id,
+            ids=ids,
+            documents=documents,
+            model_name=response.model_name,
+        )
+
+    async def async_search_similar_image(
+        self,
+        session: AsyncSession,
+        request: SimilarAnimalSearchRequest,
+    ) -> SimilarAnimalSearchResponses:
+        search_id = get_uuid()
+        search_request = SimilarImageSearchRequest(id=request.id)
+        with stage("search_similar_image", "similar_image_search"):
+            response = await self.similar_image_search.async_search(request=search_request)
+        ids = list(dict.fromkeys(response.ids))
+        documents: Dict[str, Union[AnimalSearchResult, AnimalLikeModel]] = {}
+        if Configurations.similar_image_search_from_index:
+            with stage("search_similar_image", "elasticsearch"):
+                try:
+                    documents.update(
+                        await self.search_client.async_get_documents(
+                            index=ANIMAL_INDEX,
+                            ids=ids,
+                        )
+                    )
+                except Exception as e:
+                    logger.warning(f"failed to get animal documents: {e}")
+        missing_ids = [i for i in ids if i not in documents]
+        if len(missing_ids) > 0:
+            with stage("search_similar_image", "database"):
+                animals = await session.run_sync(
+                    lambda s: self.animal_repository.select_with_like_by_ids(
+                        session=s,
+                        query=AnimalIDs(ids=missing_ids),
+                    )
+                )
+            documents.update({a.id: a for a in animals})
+        return self.__make_similar_animal_search_responses(
+            request=request,
+            search_id=search_id,
+            ids=ids,
+            documents=documents,
+            model_name=response.model_name,
+        )
@@ -106,6 +106,11 @@ class LikeUsecase(AbstractLikeUsecase):
             user_id=request.user_id,
         )
         logger.info(f"record: {record}")
+        self.like_repository.increment_count(
+            session=session,
+            animal_id=record.animal_id,
+            commit=False,
+        )
         data = self.like_repository.insert(
             session=session,
             record=record,
@@ -123,6 +128,19 @@ class LikeUsecase(AbstractLikeUsecase):
         request: LikeDeleteRequest,
     ):
         record = LikeDelete(**request.dict())
+        exist = self.like_repository.select(
+            session=session,
+            query=LikeQuery(id=record.id),
+            limit=1,
+            offset=0,
+        )
+        if len(exist) == 0:
+            return
+        self.like_repository.decrement_count(
+            session=session,
+            animal_id=exist[0].animal_id,
+            commit=False,
+        )
         self.like_repository.delete(
             session=session,
             record=record,
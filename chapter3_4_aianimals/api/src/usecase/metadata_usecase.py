@@ -3,11 +3,10 @@ from logging import getLogger
 
 from sqlalchemy.orm import Session
 from src.entities.animal import AnimalSearchSortKey
-from src.entities.animal_category import AnimalCategoryQuery
-from src.entities.animal_subcategory import AnimalSubcategoryQuery
-from src.repository.animal_category_repository import AbstractAnimalCategoryRepository
-from src.repository.animal_subcategory_repository import AbstractAnimalSubcategoryRepository
+from src.response_object.animal_category import AnimalCategoryResponse
+from src.response_object.animal_subcategory import AnimalSubcategoryResponse
 from src.response_object.metadata import MetadataResponse
+from src.service.local_cache import AbstractLocalCache
 
 logger = getLogger(__name__)
 
@@ -15,11 +14,9 @@ logger = getLogger(__name__)
 class AbstractMetadataUsecase(ABC):
     def __init__(
         self,
-        animal_category_repository: AbstractAnimalCategoryRepository,
-        animal_subcategory_repository: AbstractAnimalSubcategoryRepository,
+        local_cache: AbstractLocalCache,
     ):
-        self.animal_category_repository = animal_category_repository
-        self.animal_subcategory_repository = animal_subcategory_repository
+        self.local_cache = local_cache
 
     @abstractmethod
     def retrieve(
@@ -32,31 +29,22 @@ class AbstractMetadataUsecase(ABC):
 class MetadataUsecase(AbstractMetadataUsecase):
     def __init__(
         self,
-        animal_category_repository: AbstractAnimalCategoryRepository,
-        animal_subcategory_repository: AbstractAnimalSubcategoryRepository,
+        local_cache: AbstractLocalCache,
     ):
-        super().__init__(
-            animal_category_repository=animal_category_repository,
-            animal_subcategory_repository=animal_subcategory_repository,
-        )
-        pass
+        super().__init__(local_cache=local_cache)
 
     def retrieve(
         self,
         session: Session,
     ) -> MetadataResponse:
-        animal_category = self.animal_category_repository.select(
-            session=session,
-            query=AnimalCategoryQuery(
-                is_deleted=False,
-            ),
-        )
-        animal_subcategory = self.animal_subcategory_repository.select(
-            session=session,
-            query=AnimalSubcategoryQuery(
-                is_deleted=False,
-            ),
-        )
+        animal_category = [
+            AnimalCategoryResponse(**d.dict()) for d in self.local_cache.list_animal_categories() if not d.is_deleted
+        ]
+        animal_subcategory = [
+            AnimalSubcategoryResponse(**d.dict())
+            for d in self.local_cache.list_animal_subcategories()
+            if not d.is_deleted
+        ]
         response = MetadataResponse(
             animal_category=animal_category,
             animal_subcategory=animal_subcategory,
@@ -35,6 +35,12 @@ class Configurations:
     )
 
     animal_registry_queue = os.getenv("ANIMAL_REGISTRY_QUEUE", "animal")
+    access_log_registry_queue = os.getenv("ACCESS_LOG_REGISTRY_QUEUE", "access_log")
+    access_log_dead_letter_queue = os.getenv("ACCESS_LOG_DEAD_LETTER_QUEUE", "access_log_dead_letter")
+    access_log_batch_size = int(os.getenv("ACCESS_LOG_BATCH_SIZE", 500))
+    access_log_flush_interval_second = float(os.getenv("ACCESS_LOG_FLUSH_INTERVAL_SECOND", 5.0))
+
+    like_count_reconciliation_interval_second = int(os.getenv("LIKE_COUNT_RECONCILIATION_INTERVAL_SECOND", 3600))
 
     animal_violation_queues = []
     for k, v in os.environ.items():
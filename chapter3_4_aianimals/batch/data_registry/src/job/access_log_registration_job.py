@@ -0,0 +1,28 @@
+from src.configurations import Configurations
+from src.infrastructure.messaging import RabbitmqMessaging
+from src.job.abstract_job import AbstractJob
+from src.usecase.access_log_usecase import AbstractAccessLogUsecase
+
+
+class AccessLogRegistrationJob(AbstractJob):
+    def __init__(
+        self,
+        access_log_usecase: AbstractAccessLogUsecase,
+        messaging: RabbitmqMessaging,
+    ):
+        super().__init__()
+        self.access_log_usecase = access_log_usecase
+        self.messaging = messaging
+
+    def run(self):
+        self.logger.info("run access log registration job")
+        try:
+            self.messaging.init_channel()
+            self.messaging.create_queue(queue_name=Configurations.access_log_registry_queue)
+            self.messaging.channel.basic_qos(prefetch_count=Configurations.access_log_batch_size)
+            self.access_log_usecase.register_from_queue()
+        except Exception as e:
+            self.logger.exception(e)
+            raise e
+        finally:
+            self.messaging.close()
@@ -20,6 +20,7 @@ from src.schema.animal_category import AnimalCategory
 from src.schema.animal_subcategory import AnimalSubcategory
 from src.schema.base import Base
 from src.schema.like import Like
+from src.schema.like_count import LikeCount
 from src.schema.user import User
 from src.schema.violation import Violation
 from src.schema.violation_type import ViolationType
@@ -69,6 +70,7 @@ class InitializationJob(AbstractJob):
             User,
             Animal,
             Like,
+            LikeCount,
             ViolationType,
             Violation,
             AccessLog,
@@ -317,6 +319,7 @@ class InitializationJob(AbstractJob):
                 )
             )
         self.like_usecase.bulk_register(requests=requests)
+        self.like_usecase.reconcile_count()
         self.logger.info(f"done register like: {file_path}")
 
     def __register_access_log(
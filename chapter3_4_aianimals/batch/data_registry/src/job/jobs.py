@@ -11,6 +11,8 @@ class Job(BaseModel):
 class JOBS(Enum):
     INITIALIZATION_JOG = Job(name="initialization_job")
     ANIMAL_TO_SEARCH_JOB = Job(name="animal_to_search_job")
+    ACCESS_LOG_REGISTRATION_JOB = Job(name="access_log_registration_job")
+    LIKE_COUNT_RECONCILIATION_JOB = Job(name="like_count_reconciliation_job")
 
     @staticmethod
     def has_name(name: str) -> bool:
@@ -0,0 +1,23 @@
+from time import sleep
+
+from src.configurations import Configurations
+from src.job.abstract_job import AbstractJob
+from src.usecase.like_usecase import AbstractLikeUsecase
+
+
+class LikeCountReconciliationJob(AbstractJob):
+    def __init__(
+        self,
+        like_usecase: AbstractLikeUsecase,
+    ):
+        super().__init__()
+        self.like_usecase = like_usecase
+
+    def run(self):
+        self.logger.info("run like count reconciliation job")
+        while True:
+            try:
+                self.like_usecase.reconcile_count()
+            except Exception as e:
+                self.logger.exception(e)
+            sleep(Configurations.like_count_reconciliation_interval_second)
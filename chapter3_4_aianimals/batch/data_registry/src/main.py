@@ -1,9 +1,11 @@
 from dependency_injector.wiring import Provide, inject
 from src.configurations import Configurations
 from src.infrastructure.messaging import RabbitmqMessaging
+from src.job.access_log_registration_job import AccessLogRegistrationJob
 from src.job.animal_to_search_job import AnimalToSearchJob
 from src.job.initialization_job import InitializationJob
 from src.job.jobs import JOBS
+from src.job.like_count_reconciliation_job import LikeCountReconciliationJob
 from src.registry.container import Container
 
 
@@ -12,16 +14,23 @@ def main(
     messaging: RabbitmqMessaging = Provide[Container.infrastructures.messaging],
     initialization_job: InitializationJob = Provide[Container.jobs.initialization_job],
     animal_search_job: AnimalToSearchJob = Provide[Container.jobs.animal_search_job],
+    access_log_registration_job: AccessLogRegistrationJob = Provide[Container.jobs.access_log_registration_job],
+    like_count_reconciliation_job: LikeCountReconciliationJob = Provide[Container.jobs.like_count_reconciliation_job],
 ):
     messaging.init_channel()
     for q in Configurations.animal_violation_queues:
         messaging.create_queue(queue_name=q)
     messaging.create_queue(queue_name=Configurations.animal_registry_queue)
+    messaging.create_queue(queue_name=Configurations.access_log_registry_queue)
 
     if Configurations.job == JOBS.ANIMAL_TO_SEARCH_JOB.value.name:
         animal_search_job.run()
     elif Configurations.job == JOBS.INITIALIZATION_JOG.value.name:
         initialization_job.run()
+    elif Configurations.job == JOBS.ACCESS_LOG_REGISTRATION_JOB.value.name:
+        access_log_registration_job.run()
+    elif Configurations.job == JOBS.LIKE_COUNT_RECONCILIATION_JOB.value.name:
+        like_count_reconciliation_job.run()
     else:
         raise ValueError
 
@@ -6,8 +6,10 @@ from src.infrastructure.cache import AbstractCache, RedisCache
 from src.infrastructure.database import AbstractDatabase, PostgreSQLDatabase
 from src.infrastructure.messaging import RabbitmqMessaging
 from src.infrastructure.search import AbstractSearch, ElasticsearchClient
+from src.job.access_log_registration_job import AccessLogRegistrationJob
 from src.job.animal_to_search_job import AnimalToSearchJob
 from src.job.initialization_job import InitializationJob
+from src.job.like_count_reconciliation_job import LikeCountReconciliationJob
 from src.repository.access_log_repository import AbstractAccessLogRepository, AccessLogRepository
 from src.repository.animal_category_repository import AbstractAnimalCategoryRepository, AnimalCategoryRepository
 from src.repository.animal_repository import AbstractAnimalRepository, AnimalRepository
@@ -131,6 +133,7 @@ class Usecases(containers.DeclarativeContainer):
     access_log_usecase: AbstractAccessLogUsecase = providers.Factory(
         AccessLogUsecase,
         access_log_repository=repositories.access_log_repository,
+        messaging=infrastructures.messaging,
     )
 
 
@@ -158,6 +161,15 @@ class Jobs(containers.DeclarativeContainer):
         animal_usecase=usecases.animal_usecase,
         messaging=infrastructures.messaging,
     )
+    access_log_registration_job: AccessLogRegistrationJob = providers.Factory(
+        AccessLogRegistrationJob,
+        access_log_usecase=usecases.access_log_usecase,
+        messaging=infrastructures.messaging,
+    )
+    like_count_reconciliation_job: LikeCountReconciliationJob = providers.Factory(
+        LikeCountReconciliationJob,
+        like_usecase=usecases.like_usecase,
+    )
 
 
 class Container(containers.DeclarativeContainer):
@@ -2,11 +2,13 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from src.entities.common import Count
 from src.entities.like import LikeCreate, LikeModel, LikeQuery
 from src.infrastructure.database import AbstractDatabase
 from src.schema.like import Like
+from src.schema.like_count import LikeCount
 from src.schema.table import TABLES
 
 
@@ -50,6 +52,13 @@ class AbstractLikeRepository(ABC):
     ):
         raise NotImplementedError
 
+    @abstractmethod
+    def reconcile_count(
+        self,
+        commit: bool = True,
+    ):
+        raise NotImplementedError
+
 
 class LikeRepository(AbstractLikeRepository):
     def __init__(
@@ -156,3 +165,47 @@ class LikeRepository(AbstractLikeRepository):
             raise e
         finally:
             session.close()
+
+    def reconcile_count(
+        self,
+        commit: bool = True,
+    ):
+        session = self.database.get_session().__next__()
+        try:
+            aggregated = select(
+                Like.animal_id,
+                func.count(Like.id),
+            ).group_by(Like.animal_id)
+            upsert = insert(LikeCount).from_select(
+                ["animal_id", "count"],
+                aggregated,
+            )
+            upsert = upsert.on_conflict_do_update(
+                index_elements=[LikeCount.animal_id],
+                set_={
+                    "count": upsert.excluded.count,
+                    "updated_at": func.now(),
+                },
+                where=LikeCount.count != upsert.excluded.count,
+            )
+            session.execute(upsert)
+            stale = (
+                update(LikeCount)
+                .where(
+                    LikeCount.count != 0,
+                    ~exists().where(Like.animal_id == LikeCount.animal_id),
+                )
+                .values(
+                    count=0,
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.execute(stale)
+            if commit:
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
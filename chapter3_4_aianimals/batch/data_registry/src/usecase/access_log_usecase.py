@@ -1,9 +1,14 @@
+import json
 import logging
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Tuple
 
+from sqlalchemy.exc import DataError, IntegrityError
+from src.configurations import Configurations
 from src.entities.access_log import AccessLogCreate, Action
+from src.infrastructure.messaging import RabbitmqMessaging
 from src.repository.access_log_repository import AbstractAccessLogRepository
 from src.request_object.access_log import AccessLogCreateRequest
 
@@ -12,9 +17,11 @@ class AbstractAccessLogUsecase(ABC):
     def __init__(
         self,
         access_log_repository: AbstractAccessLogRepository,
+        messaging: RabbitmqMessaging,
     ):
         self.logger = logging.getLogger(__name__)
         self.access_log_repository = access_log_repository
+        self.messaging = messaging
 
     @abstractmethod
     def register(
@@ -30,13 +37,21 @@ class AbstractAccessLogUsecase(ABC):
     ):
         raise NotImplementedError
 
+    @abstractmethod
+    def register_from_queue(self):
+        raise NotImplementedError
+
 
 class AccessLogUsecase(AbstractAccessLogUsecase):
     def __init__(
         self,
         access_log_repository: AbstractAccessLogRepository,
+        messaging: RabbitmqMessaging,
     ):
-        super().__init__(access_log_repository=access_log_repository)
+        super().__init__(
+            access_log_repository=access_log_repository,
+            messaging=messaging,
+        )
 
     def register(
         self,
@@ -93,3 +108,102 @@ class AccessLogUsecase(AbstractAccessLogUsecase):
                 commit=True,
             )
             self.logger.info(f"bulk register access log: {i} to {i+200}")
+
+    def __dead_letter(
+        self,
+        body: Dict,
+    ):
+        self.messaging.publish(
+            queue_name=Configurations.access_log_dead_letter_queue,
+            body=body,
+        )
+
+    def __register_message(
+        self,
+        delivery_tag: int,
+        records: List[AccessLogCreate],
+    ) -> bool:
+        try:
+            self.access_log_repository.bulk_insert(
+                records=records,
+                commit=True,
+            )
+        except (DataError, IntegrityError):
+            for record in records:
+                try:
+                    self.access_log_repository.bulk_insert(
+                        records=[record],
+                        commit=True,
+                    )
+                except (DataError, IntegrityError) as e:
+                    self.logger.error(f"dead letter invalid access log {record.id}: {e}")
+                    self.__dead_letter(body=dict(record=json.loads(record.json()), error=str(e)))
+        except Exception as e:
+            self.logger.error(f"failed to register access log: {e}")
+            return False
+        self.messaging.channel.basic_ack(delivery_tag=delivery_tag)
+        return True
+
+    def __flush(
+        self,
+        messages: List[Tuple[int, List[AccessLogCreate]]],
+    ):
+        records = [r for _, _records in messages for r in _records]
+        try:
+            self.access_log_repository.bulk_insert(
+                records=records,
+                commit=True,
+            )
+            self.messaging.channel.basic_ack(
+                delivery_tag=messages[-1][0],
+                multiple=True,
+            )
+            self.logger.info(f"registered access log: {len(records)}")
+            return
+        except Exception as e:
+            self.logger.error(f"failed to register {len(records)} access logs; retry per message: {e}")
+        for i, (delivery_tag, _records) in enumerate(messages):
+            if self.__register_message(
+                delivery_tag=delivery_tag,
+                records=_records,
+            ):
+                continue
+            for _delivery_tag, _ in messages[i:]:
+                self.messaging.channel.basic_nack(
+                    delivery_tag=_delivery_tag,
+                    requeue=True,
+                )
+            time.sleep(Configurations.access_log_flush_interval_second)
+            return
+
+    def register_from_queue(self):
+        self.messaging.create_queue(queue_name=Configurations.access_log_dead_letter_queue)
+        messages: List[Tuple[int, List[AccessLogCreate]]] = []
+        size = 0
+        flushed_at = time.time()
+        self.logger.info(f"Waiting for {Configurations.access_log_registry_queue} queue...")
+        for method, _, body in self.messaging.channel.consume(
+            queue=Configurations.access_log_registry_queue,
+            inactivity_timeout=Configurations.access_log_flush_interval_second,
+        ):
+            if method is not None:
+                try:
+                    now = datetime.now()
+                    records = [AccessLogCreate(**d, updated_at=now) for d in json.loads(body)]
+                    messages.append((method.delivery_tag, records))
+                    size += len(records)
+                except Exception as e:
+                    self.logger.error(f"dead letter malformed access log message: {e}")
+                    self.__dead_letter(body=dict(body=body.decode(errors="replace"), error=str(e)))
+                    self.messaging.channel.basic_ack(delivery_tag=method.delivery_tag)
+            if len(messages) == 0:
+                continue
+            if (
+                size < Configurations.access_log_batch_size
+                and time.time() - flushed_at < Configurations.access_log_flush_interval_second
+            ):
+                continue
+            self.__flush(messages=messages)
+            messages = []
+            size = 0
+            flushed_at = time.time()
@@ -40,6 +40,10 @@ class AbstractLikeUsecase(ABC):
     ):
         raise NotImplementedError
 
+    @abstractmethod
+    def reconcile_count(self):
+        raise NotImplementedError
+
 
 class LikeUsecase(AbstractLikeUsecase):
     def __init__(
@@ -118,3 +122,8 @@ class LikeUsecase(AbstractLikeUsecase):
                 commit=True,
             )
             self.logger.info(f"bulk register like: {i} to {i+200}")
+
+    def reconcile_count(self):
+        self.logger.info("reconcile like count")
+        self.like_repository.reconcile_count(commit=True)
+        self.logger.info("done reconcile like count")
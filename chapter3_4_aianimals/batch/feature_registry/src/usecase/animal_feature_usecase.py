@@ -1,12 +1,13 @@
 import json
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
 import cloudpickle
 from src.configurations import Configurations
 from src.entities.animal import AnimalQuery
 from src.infrastructure.cache import AbstractCache
 from src.infrastructure.client.rabbitmq_messaging import RabbitmqMessaging
+from src.middleware.feature_codec import encode_features
 from src.middleware.logger import configure_logger
 from src.repository.animal_repository import AbstractAnimalRepository
 from src.request_object.animal_feature import AnimalFeatureInitializeRequest, AnimalFeatureRegistrationRequest
@@ -179,8 +180,6 @@ class AnimalFeatureUsecase(AbstractAnimalFeatureUsecase):
             mlflow_run_id=request.mlflow_run_id,
             vectorized_animal_categories=vectorized_animal_category,
             vectorized_animal_subcategories=vectorized_animal_subcategory,
-            tokenized_descriptions=tokenized_description,
-            tokenized_names=tokenized_name,
             vectorized_descriptions=vectorized_description,
             vectorized_names=vectorized_name,
             update=True,
@@ -243,8 +242,6 @@ class AnimalFeatureUsecase(AbstractAnimalFeatureUsecase):
                 mlflow_run_id=request.mlflow_run_id,
                 vectorized_animal_categories=vectorized_animal_category,
                 vectorized_animal_subcategories=vectorized_animal_subcategory,
-                tokenized_descriptions=tokenized_description,
-                tokenized_names=tokenized_name,
                 vectorized_descriptions=vectorized_description,
                 vectorized_names=vectorized_name,
                 update=False,
@@ -265,8 +262,6 @@ class AnimalFeatureUsecase(AbstractAnimalFeatureUsecase):
         mlflow_run_id: str,
         vectorized_animal_categories: List[List[int]],
         vectorized_animal_subcategories: List[List[int]],
-        tokenized_descriptions: List[str],
-        tokenized_names: List[str],
         vectorized_descriptions: List[List[float]],
         vectorized_names: List[List[float]],
         update: bool = True,
@@ -275,8 +270,6 @@ class AnimalFeatureUsecase(AbstractAnimalFeatureUsecase):
             animal_id,
             animal_category_vector,
             animal_subcategory_vector,
-            description_words,
-            name_words,
             description_vector,
             name_vector,
         ) in enumerate(
@@ -284,8 +277,6 @@ class AnimalFeatureUsecase(AbstractAnimalFeatureUsecase):
                 animal_ids,
                 vectorized_animal_categories,
                 vectorized_animal_subcategories,
-                tokenized_descriptions,
-                tokenized_names,
                 vectorized_descriptions,
                 vectorized_names,
             )
@@ -296,17 +287,15 @@ class AnimalFeatureUsecase(AbstractAnimalFeatureUsecase):
                     mlflow_experiment_id=mlflow_experiment_id,
                     mlflow_run_id=mlflow_run_id,
                 )
-                data = dict(
+                data: Dict[str, Sequence[float]] = dict(
                     animal_category_vector=animal_category_vector,
                     animal_subcategory_vector=animal_subcategory_vector,
-                    name_words=name_words.split(" "),
-                    description_words=description_words.split(" "),
                     name_vector=name_vector,
                     description_vector=description_vector,
                 )
                 self.cache.set(
                     key=key,
-                    value=json.dumps(data),
+                    value=encode_features(features=data),
                     expire_second=Configurations.feature_cache_ttl,
                 )
             if i % 1000 == 0:
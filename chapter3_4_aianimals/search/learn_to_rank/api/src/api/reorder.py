@@ -1,9 +1,10 @@
 from logging import getLogger
 
 from fastapi import APIRouter, BackgroundTasks
+from src.configurations import Configurations
 from src.registry.container import EmptyContainer
 from src.registry.registry import container
-from src.schema.animal import AnimalRequest, AnimalRequestResponse, AnimalResponse
+from src.schema.animal import AnimalRequest, AnimalRequestResponse, AnimalResponse, ModelResponse
 
 logger = getLogger(__name__)
 
@@ -15,6 +16,11 @@ async def get_reorder_definition():
     return AnimalRequestResponse()
 
 
+@router.get("/model", response_model=ModelResponse)
+async def get_model():
+    return ModelResponse()
+
+
 @router.post("", response_model=AnimalResponse)
 async def post_reorder(
     background_tasks: BackgroundTasks,
@@ -22,6 +28,12 @@ async def post_reorder(
 ):
     if isinstance(container, EmptyContainer):
         return AnimalResponse(ids=request.ids)
+    elif Configurations.reorder_micro_batch:
+        data = await container.reorder_usecase.async_reorder(
+            request=request,
+            background_tasks=background_tasks,
+        )
+        return data
     else:
         data = container.reorder_usecase.reorder(
             request=request,
@@ -31,5 +31,18 @@ class Configurations(object):
     predictor_batch_size = int(os.getenv("PREDICTOR_BATCH_SIZE", 32))
     predictor_input_name = os.getenv("PREDICTOR_INPUT_NAME", "inputs")
     predictor_output_name = os.getenv("PREDICTOR_OUTPUT_NAME", "outputs")
+    onnx_intra_op_num_threads = int(os.getenv("ONNX_INTRA_OP_NUM_THREADS", 0))
+    onnx_inter_op_num_threads = int(os.getenv("ONNX_INTER_OP_NUM_THREADS", 1))
+    onnx_graph_optimization_level = os.getenv("ONNX_GRAPH_OPTIMIZATION_LEVEL", "all")
+    onnx_io_binding = bool(int(os.getenv("ONNX_IO_BINDING", "0")))
+    query_feature_cache_size = int(os.getenv("QUERY_FEATURE_CACHE_SIZE", 4096))
+    like_cache_ttl_second = float(os.getenv("LIKE_CACHE_TTL_SECOND", 0))
+    like_cache_max_size = int(os.getenv("LIKE_CACHE_MAX_SIZE", 100000))
+    feature_fallback = os.getenv("FEATURE_FALLBACK", "default")
+
+    reorder_micro_batch = bool(int(os.getenv("REORDER_MICRO_BATCH", "1")))
+    reorder_max_batch_size = int(os.getenv("REORDER_MAX_BATCH_SIZE", 16))
+    reorder_max_wait_millisecond = float(os.getenv("REORDER_MAX_WAIT_MILLISECOND", 2.0))
+    reorder_max_preparing = int(os.getenv("REORDER_MAX_PREPARING", 4))
 
     empty_run = bool(int(os.getenv("EMPTY_RUN", "0")))
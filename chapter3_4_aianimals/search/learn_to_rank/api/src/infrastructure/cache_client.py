@@ -1,7 +1,7 @@
 import os
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Optional
+from typing import List, Optional
 
 import redis
 
@@ -28,6 +28,13 @@ class AbstractCacheClient(ABC):
     ) -> Optional[str]:
         raise NotImplementedError
 
+    @abstractmethod
+    def mget_bytes(
+        self,
+        keys: List[str],
+    ) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
 
 class RedisClient(AbstractCacheClient):
     def __init__(self):
@@ -42,6 +49,12 @@ class RedisClient(AbstractCacheClient):
             db=self.__redis_db,
             decode_responses=True,
         )
+        self.binary_redis_client = redis.Redis(
+            host=self.__redis_host,
+            port=self.__redis_port,
+            db=self.__redis_db,
+            decode_responses=False,
+        )
 
     def set(
         self,
@@ -61,3 +74,12 @@ class RedisClient(AbstractCacheClient):
     ) -> Optional[str]:
         value = self.redis_client.get(key)
         return value
+
+    def mget_bytes(
+        self,
+        keys: List[str],
+    ) -> List[Optional[bytes]]:
+        if len(keys) == 0:
+            return []
+        values = self.binary_redis_client.mget(keys)
+        return values
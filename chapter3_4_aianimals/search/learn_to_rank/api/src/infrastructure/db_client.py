@@ -1,8 +1,13 @@
 import os
+import threading
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from logging import getLogger
+from typing import ContextManager, Iterator
 
 import psycopg2
+from psycopg2.extensions import connection as Connection
+from psycopg2.pool import ThreadedConnectionPool
 
 logger = getLogger(__name__)
 
@@ -15,6 +20,10 @@ class AbstractDBClient(ABC):
     def get_connection(self):
         raise NotImplementedError
 
+    @abstractmethod
+    def connection(self) -> ContextManager[Connection]:
+        raise NotImplementedError
+
 
 class DBClient(AbstractDBClient):
     def __init__(self):
@@ -23,7 +32,26 @@ class DBClient(AbstractDBClient):
         self.__postgres_port = int(os.getenv("POSTGRES_PORT", 5432))
         self.__postgres_db = os.environ["POSTGRES_DB"]
         self.__postgres_host = os.environ["POSTGRES_HOST"]
+        self.__postgres_pool_size = int(os.getenv("POSTGRES_POOL_SIZE", 4))
+        self.__postgres_pool_max_size = int(os.getenv("POSTGRES_POOL_MAX_SIZE", 8))
         self.__connection_string = f"host={self.__postgres_host} port={self.__postgres_port} dbname={self.__postgres_db} user={self.__postgres_user} password={self.__postgres_password}"
 
+        self.__pool = ThreadedConnectionPool(
+            minconn=self.__postgres_pool_size,
+            maxconn=self.__postgres_pool_max_size,
+            dsn=self.__connection_string,
+        )
+        self.__available = threading.BoundedSemaphore(self.__postgres_pool_max_size)
+
     def get_connection(self):
         return psycopg2.connect(self.__connection_string)
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        with self.__available:
+            conn = self.__pool.getconn()
+            try:
+                with conn:
+                    yield conn
+            finally:
+                self.__pool.putconn(conn)
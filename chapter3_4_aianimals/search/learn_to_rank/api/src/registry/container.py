@@ -1,10 +1,13 @@
 from abc import ABC
+from typing import Optional
 
+from src.configurations import Configurations
 from src.infrastructure.cache_client import AbstractCacheClient
 from src.infrastructure.db_client import AbstractDBClient
 from src.repository.feature_cache_repository import AbstractFeatureCacheRepository, FeatureCacheRepository
 from src.repository.like_repository import LikeRepository
 from src.service.learn_to_rank_service import AbstractLearnToRankService
+from src.service.prediction_batcher import AbstractPredictionBatcher
 from src.usecase.reorder_usecase import AbstractReorderUsecase, ReorderUsecase
 
 
@@ -19,14 +22,20 @@ class Container(AbstractContainer):
         db_client: AbstractDBClient,
         cache_client: AbstractCacheClient,
         learn_to_rank_service: AbstractLearnToRankService,
+        prediction_batcher: Optional[AbstractPredictionBatcher] = None,
     ):
         super().__init__()
 
         self.db_client = db_client
         self.cache_client = cache_client
         self.learn_to_rank_service = learn_to_rank_service
+        self.prediction_batcher = prediction_batcher
 
-        self.like_repository: LikeRepository = LikeRepository(db_client=self.db_client)
+        self.like_repository: LikeRepository = LikeRepository(
+            db_client=self.db_client,
+            cache_ttl_second=Configurations.like_cache_ttl_second,
+            cache_max_size=Configurations.like_cache_max_size,
+        )
         self.feature_cache_repository: AbstractFeatureCacheRepository = FeatureCacheRepository(cache=self.cache_client)
         self.reorder_usecase: AbstractReorderUsecase = ReorderUsecase(
             like_repository=self.like_repository,
@@ -34,6 +43,8 @@ class Container(AbstractContainer):
             db_client=self.db_client,
             cache_client=self.cache_client,
             learn_to_rank_service=self.learn_to_rank_service,
+            prediction_batcher=self.prediction_batcher,
+            feature_fallback=Configurations.feature_fallback,
         )
 
 
@@ -1,18 +1,27 @@
 import os
 from logging import getLogger
+from typing import Optional
 
 import cloudpickle
 import mlflow
 from mlflow.tracking import MlflowClient
-from onnxruntime import InferenceSession
+from onnxruntime import ExecutionMode, GraphOptimizationLevel, InferenceSession, SessionOptions
 from src.configurations import Configurations
 from src.infrastructure.cache_client import RedisClient
 from src.infrastructure.db_client import DBClient
 from src.registry.container import Container, EmptyContainer
 from src.service.learn_to_rank_service import AbstractLearnToRankService, LearnToRankService
+from src.service.prediction_batcher import AbstractPredictionBatcher, PredictionBatcher
 
 logger = getLogger(__name__)
 
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
 
 def download_model(
     mlflow_client: MlflowClient,
@@ -33,6 +42,21 @@ def load_cloud_pickle(file_path: str):
     return p
 
 
+def load_onnx_session(file_path: str) -> InferenceSession:
+    options = SessionOptions()
+    options.intra_op_num_threads = Configurations.onnx_intra_op_num_threads
+    options.inter_op_num_threads = Configurations.onnx_inter_op_num_threads
+    options.execution_mode = ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[Configurations.onnx_graph_optimization_level]
+    session = InferenceSession(
+        file_path,
+        sess_options=options,
+        providers=["CPUExecutionProvider"],
+    )
+    logger.info(f"loaded: {file_path} inputs: {[(i.name, i.shape) for i in session.get_inputs()]}")
+    return session
+
+
 def build_container() -> Container:
     logger.info("build container...")
 
@@ -44,7 +68,7 @@ def build_container() -> Container:
     predictor_file_path = download_model(
         mlflow_client=mlflow_client,
         run_id=run.info.run_id,
-        save_as="model",
+        save_as="onnx" if Configurations.is_onnx_predictor else "model",
     )
     likes_scaler_file_path = download_model(
         mlflow_client=mlflow_client,
@@ -70,7 +94,7 @@ def build_container() -> Container:
     if predictor_file_path.endswith(".pkl") or predictor_file_path.endswith(".pickle"):
         predictor = load_cloud_pickle(file_path=predictor_file_path)
     elif predictor_file_path.endswith(".onnx"):
-        predictor = InferenceSession(predictor_file_path)
+        predictor = load_onnx_session(file_path=predictor_file_path)
     else:
         raise ValueError
 
@@ -89,12 +113,24 @@ def build_container() -> Container:
         predictor_batch_size=Configurations.predictor_batch_size,
         predictor_input_name=Configurations.predictor_input_name,
         predictor_output_name=Configurations.predictor_output_name,
+        onnx_io_binding=Configurations.onnx_io_binding,
+        query_feature_cache_size=Configurations.query_feature_cache_size,
     )
 
+    prediction_batcher: Optional[AbstractPredictionBatcher] = None
+    if Configurations.reorder_micro_batch:
+        prediction_batcher = PredictionBatcher(
+            learn_to_rank_service=learn_to_rank_service,
+            max_batch_size=Configurations.reorder_max_batch_size,
+            max_wait_millisecond=Configurations.reorder_max_wait_millisecond,
+            max_preparing=Configurations.reorder_max_preparing,
+        )
+
     return Container(
         db_client=DBClient(),
         cache_client=RedisClient(),
         learn_to_rank_service=learn_to_rank_service,
+        prediction_batcher=prediction_batcher,
     )
 
 
@@ -34,7 +34,7 @@ class BaseRepository(object):
         parameters: Optional[Tuple] = None,
     ) -> List[Dict[str, Any]]:
         logger.info(f"select query: {query}, parameters: {parameters}")
-        with self.db_client.get_connection() as conn:
+        with self.db_client.connection() as conn:
             with conn.cursor(cursor_factory=DictCursor) as cursor:
                 cursor.execute(query, parameters)
                 rows = cursor.fetchall()
@@ -1,13 +1,35 @@
-import json
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+import numpy as np
 from src.infrastructure.cache_client import AbstractCacheClient
+from src.middleware.feature_codec import (
+    FEATURE_CODEC_MAGIC,
+    FEATURE_CODEC_VERSION,
+    FEATURE_DTYPE,
+    FEATURE_VECTOR_KEYS,
+    HEADER,
+    decode_features,
+)
 
 logger = getLogger(__name__)
 
 
+class FeatureMatrix(object):
+    def __init__(
+        self,
+        vectors: Optional[Dict[str, np.ndarray]],
+        missing: np.ndarray,
+    ):
+        self.vectors = vectors
+        self.missing = missing
+
+    @property
+    def missing_count(self) -> int:
+        return int(self.missing.sum())
+
+
 class AbstractFeatureCacheRepository(ABC):
     def __init__(
         self,
@@ -16,10 +38,10 @@ class AbstractFeatureCacheRepository(ABC):
         self.cache = cache
 
     @abstractmethod
-    def get_features_by_keys(
+    def get_feature_matrix(
         self,
         keys: List[str],
-    ) -> Dict[str, Dict[str, List[float]]]:
+    ) -> FeatureMatrix:
         raise NotImplementedError
 
 
@@ -29,14 +51,71 @@ class FeatureCacheRepository(AbstractFeatureCacheRepository):
         cache: AbstractCacheClient,
     ):
         super().__init__(cache=cache)
+        self.widths: Optional[List[int]] = None
+        self.header: Optional[bytes] = None
+        self.packed_size = 0
 
-    def get_features_by_keys(
+    def __set_widths(
+        self,
+        widths: List[int],
+    ):
+        self.widths = widths
+        self.header = HEADER.pack(FEATURE_CODEC_MAGIC, FEATURE_CODEC_VERSION, *widths)
+        self.packed_size = HEADER.size + sum(widths) * FEATURE_DTYPE.itemsize
+        logger.info(f"feature widths: {dict(zip(FEATURE_VECTOR_KEYS, widths))}")
+
+    def __decode(
+        self,
+        key: str,
+        value: bytes,
+    ) -> Optional[np.ndarray]:
+        try:
+            features = decode_features(value=value)
+        except Exception as e:
+            logger.error(f"failed to decode features for {key}: {e}")
+            return None
+        if features is None:
+            return None
+        widths = [features[k].shape[0] for k in FEATURE_VECTOR_KEYS]
+        if self.widths is None:
+            self.__set_widths(widths=widths)
+        elif widths != self.widths:
+            logger.warning(f"feature widths {widths} for {key} do not match {self.widths}")
+            return None
+        return np.concatenate([features[k] for k in FEATURE_VECTOR_KEYS])
+
+    def get_feature_matrix(
         self,
         keys: List[str],
-    ) -> Dict[str, Dict[str, List[float]]]:
-        features = {}
-        for key in keys:
-            feature = self.cache.get(key=key)
-            if feature is not None:
-                features[key] = json.loads(str(feature))
-        return features
+    ) -> FeatureMatrix:
+        values = self.cache.mget_bytes(keys=keys)
+        missing = np.ones(len(keys), dtype=bool)
+        matrix: Optional[np.ndarray] = None
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            row: Optional[np.ndarray]
+            if self.header is not None and len(value) == self.packed_size and value.startswith(self.header):
+                row = np.frombuffer(value, dtype=FEATURE_DTYPE, offset=HEADER.size)
+            else:
+                row = self.__decode(key=keys[i], value=value)
+            if row is None:
+                continue
+            if matrix is None:
+                matrix = np.empty((len(keys), row.shape[0]), dtype=FEATURE_DTYPE)
+            matrix[i] = row
+            missing[i] = False
+
+        widths = self.widths
+        if widths is None:
+            return FeatureMatrix(vectors=None, missing=missing)
+        if matrix is None:
+            matrix = np.empty((len(keys), sum(widths)), dtype=FEATURE_DTYPE)
+        matrix[missing] = 0
+
+        vectors = {}
+        offset = 0
+        for key, width in zip(FEATURE_VECTOR_KEYS, widths):
+            vectors[key] = matrix[:, offset : offset + width]
+            offset += width
+        return FeatureMatrix(vectors=vectors, missing=missing)
@@ -1,5 +1,7 @@
+import threading
+import time
 from logging import getLogger
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from pydantic import BaseModel, Extra
 from src.infrastructure.db_client import AbstractDBClient
@@ -19,9 +21,16 @@ class LikeRepository(BaseRepository):
     def __init__(
         self,
         db_client: AbstractDBClient,
+        cache_ttl_second: float = 0.0,
+        cache_max_size: int = 100000,
     ):
         super().__init__(db_client=db_client)
         self.like_table = TABLES.LIKE.value
+        self.cache_ttl_second = cache_ttl_second
+        self.cache_max_size = cache_max_size
+
+        self.__cache: Dict[str, Tuple[int, float]] = {}
+        self.__cache_lock = threading.Lock()
 
     def select(
         self,
@@ -55,27 +64,75 @@ class LikeRepository(BaseRepository):
         data = {r["animal_id"]: int(r["likes"]) for r in records}
         return data
 
+    def select_by_ids(
+        self,
+        animal_ids: List[str],
+    ) -> Dict[str, int]:
+        if len(animal_ids) == 0:
+            return {}
+        query = f"""
+            SELECT
+                {self.like_table}.animal_id as animal_id,
+                COUNT({self.like_table}.animal_id) AS likes
+            FROM
+                {self.like_table}
+            WHERE
+                {self.like_table}.animal_id = ANY(%s)
+            GROUP BY
+                {self.like_table}.animal_id
+            ;
+        """
+
+        records = self.execute_select_query(
+            query=query,
+            parameters=(animal_ids,),
+        )
+        data = {r["animal_id"]: int(r["likes"]) for r in records}
+        return data
+
+    def __get_cached(
+        self,
+        animal_ids: List[str],
+    ) -> Tuple[Dict[str, int], List[str]]:
+        now = time.monotonic()
+        records = {}
+        missing = []
+        for animal_id in animal_ids:
+            cached = self.__cache.get(animal_id)
+            if cached is not None and cached[1] > now:
+                records[animal_id] = cached[0]
+            else:
+                missing.append(animal_id)
+        return records, missing
+
+    def __set_cached(
+        self,
+        animal_ids: List[str],
+        records: Dict[str, int],
+    ):
+        expires_at = time.monotonic() + self.cache_ttl_second
+        with self.__cache_lock:
+            if len(self.__cache) + len(animal_ids) > self.cache_max_size:
+                now = time.monotonic()
+                self.__cache = {k: v for k, v in self.__cache.items() if v[1] > now}
+                if len(self.__cache) + len(animal_ids) > self.cache_max_size:
+                    self.__cache = {}
+            for animal_id in animal_ids:
+                self.__cache[animal_id] = (records.get(animal_id, 0), expires_at)
+
     def select_all(
         self,
         like_query: LikeQuery,
     ) -> Dict[str, int]:
-        limit = 200
-        offset = 0
-        records = {}
-        while True:
-            data = self.select(
-                like_query=like_query,
-                limit=limit,
-                offset=offset,
+        animal_ids = list(dict.fromkeys(like_query.animal_ids))
+        if self.cache_ttl_second <= 0:
+            return self.select_by_ids(animal_ids=animal_ids)
+        records, missing = self.__get_cached(animal_ids=animal_ids)
+        if len(missing) > 0:
+            data = self.select_by_ids(animal_ids=missing)
+            self.__set_cached(
+                animal_ids=missing,
+                records=data,
             )
-            if len(data) == len(like_query.animal_ids):
-                for k, v in data.items():
-                    records[k] = v
-                break
-            if len(data) > 0:
-                for k, v in data.items():
-                    records[k] = v
-            else:
-                break
-            offset += limit
+            records.update(data)
         return records
@@ -22,6 +22,13 @@ class AnimalResponse(BaseModel):
         extra = Extra.forbid
 
 
+class ModelResponse(BaseModel):
+    model_name: Optional[str] = Configurations.mlflow_run_id
+
+    class Config:
+        extra = Extra.forbid
+
+
 class AnimalRequestResponse(BaseModel):
     request: Dict[str, str] = dict(
         ids="[str]",
@@ -0,0 +1,52 @@
+from logging import getLogger
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sklearn.base import BaseEstimator
+
+logger = getLogger(__name__)
+
+
+def find_categories(encoder: BaseEstimator) -> Optional[List[Any]]:
+    steps = [encoder]
+    pipeline = getattr(encoder, "pipeline", encoder)
+    if hasattr(pipeline, "steps"):
+        steps = [step for _, step in pipeline.steps]
+    for step in reversed(steps):
+        categories = getattr(step, "categories_", None)
+        if categories is not None and len(categories) == 1:
+            return list(categories[0])
+    return None
+
+
+class CategoricalLookupTable(object):
+    def __init__(
+        self,
+        encoder: BaseEstimator,
+    ):
+        self.encoder = encoder
+        self.index: Dict[Any, int] = {}
+
+        categories = find_categories(encoder=self.encoder)
+        if categories is None:
+            self.width = self.encoder.transform([[None]]).shape[1]
+            logger.warning(f"no categories found in {self.encoder}; fall back to transform")
+            return
+        encoded = self.encoder.transform([[c] for c in categories]).tocsr()
+        self.width = encoded.shape[1]
+        for i, category in enumerate(categories):
+            start, end = encoded.indptr[i], encoded.indptr[i + 1]
+            if end - start == 1 and encoded.data[start] == 1:
+                self.index[category] = int(encoded.indices[start])
+        logger.info(f"compiled {len(self.index)} of {len(categories)} categories into a lookup table")
+
+    def encode(
+        self,
+        value: Any,
+        out: np.ndarray,
+    ):
+        index = self.index.get(value)
+        if index is not None:
+            out[index] = 1
+        else:
+            out[:] = self.encoder.transform([[value]]).toarray()[0]
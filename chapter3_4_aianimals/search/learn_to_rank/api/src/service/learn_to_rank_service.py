@@ -1,4 +1,6 @@
+import threading
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from logging import getLogger
 from typing import List, Optional, Tuple, Union
 
@@ -6,6 +8,7 @@ import numpy as np
 from lightgbm import LGBMRanker, LGBMRegressor
 from onnxruntime import InferenceSession
 from sklearn.base import BaseEstimator
+from src.service.categorical_lookup_table import CategoricalLookupTable
 
 logger = getLogger(__name__)
 
@@ -17,36 +20,45 @@ class AbstractLearnToRankService(ABC):
     @abstractmethod
     def transform_like_scaler(
         self,
-        likes: List[List[int]],
-    ) -> List[List[float]]:
+        likes: np.ndarray,
+    ) -> np.ndarray:
         raise NotImplementedError
 
     @abstractmethod
     def transform_query_animal_category_id_encoder(
         self,
         query_animal_category_id: List[List[Optional[int]]],
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         raise NotImplementedError
 
     @abstractmethod
     def transform_query_animal_subcategory_id_encoder(
         self,
         query_animal_subcategory_id: List[List[Optional[int]]],
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         raise NotImplementedError
 
     @abstractmethod
     def transform_query_phrase_encoder(
         self,
         query_phrase: List[List[str]],
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode_query(
+        self,
+        query_phrase: str,
+        query_animal_category_id: Optional[int],
+        query_animal_subcategory_id: Optional[int],
+    ) -> np.ndarray:
         raise NotImplementedError
 
     @abstractmethod
     def postprocess(
         self,
         ids: List[str],
-        prediction: List[float],
+        prediction: np.ndarray,
     ) -> List[Tuple[str, float]]:
         raise NotImplementedError
 
@@ -54,10 +66,18 @@ class AbstractLearnToRankService(ABC):
     def predict(
         self,
         ids: List[str],
-        input: List[List[float]],
+        input: np.ndarray,
     ) -> List[Tuple[str, float]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def predict_batch(
+        self,
+        ids: List[List[str]],
+        inputs: List[np.ndarray],
+    ) -> List[List[Tuple[str, float]]]:
+        raise NotImplementedError
+
 
 class LearnToRankService(AbstractLearnToRankService):
     def __init__(
@@ -71,6 +91,8 @@ class LearnToRankService(AbstractLearnToRankService):
         predictor_batch_size: Optional[int] = None,
         predictor_input_name: Optional[str] = None,
         predictor_output_name: Optional[str] = None,
+        onnx_io_binding: bool = False,
+        query_feature_cache_size: int = 4096,
     ):
         super().__init__()
 
@@ -83,68 +105,159 @@ class LearnToRankService(AbstractLearnToRankService):
         self.predictor_batch_size = predictor_batch_size
         self.predictor_input_name = predictor_input_name
         self.predictor_output_name = predictor_output_name
+        self.onnx_io_binding = onnx_io_binding
+
+        self.__fixed_batch_size: Optional[int] = None
+        self.__output_shape: Tuple[int, ...] = (1,)
+        self.__buffers = threading.local()
+        self.__query_phrase_table = CategoricalLookupTable(encoder=self.preprocess_query_phrase_encoder)
+        self.__query_animal_category_id_table = CategoricalLookupTable(
+            encoder=self.preprocess_query_animal_category_id_encoder
+        )
+        self.__query_animal_subcategory_id_table = CategoricalLookupTable(
+            encoder=self.preprocess_query_animal_subcategory_id_encoder
+        )
+        self.__encode_query = lru_cache(maxsize=query_feature_cache_size)(self.__compile_query)
+        if self.is_onnx_predictor:
+            batch_size = self.predictor.get_inputs()[0].shape[0]
+            if isinstance(batch_size, int):
+                self.__fixed_batch_size = batch_size
+                logger.warning(f"onnx predictor has a fixed batch size {batch_size}; inputs will be padded")
+            for output in self.predictor.get_outputs():
+                if output.name == self.predictor_output_name:
+                    self.__output_shape = tuple(d if isinstance(d, int) else 1 for d in output.shape[1:])
 
     def transform_like_scaler(
         self,
-        likes: List[List[int]],
-    ) -> List[List[float]]:
-        return self.preprocess_like_scaler.transform(likes).tolist()
+        likes: np.ndarray,
+    ) -> np.ndarray:
+        return np.asarray(self.preprocess_like_scaler.transform(likes), dtype=np.float32)
 
     def transform_query_animal_category_id_encoder(
         self,
         query_animal_category_id: List[List[Optional[int]]],
-    ) -> List[List[float]]:
-        return self.preprocess_query_animal_category_id_encoder.transform(query_animal_category_id).toarray().tolist()
+    ) -> np.ndarray:
+        return self.preprocess_query_animal_category_id_encoder.transform(query_animal_category_id).toarray()
 
     def transform_query_animal_subcategory_id_encoder(
         self,
         query_animal_subcategory_id: List[List[Optional[int]]],
-    ) -> List[List[float]]:
-        return (
-            self.preprocess_query_animal_subcategory_id_encoder.transform(query_animal_subcategory_id)
-            .toarray()
-            .tolist()
-        )
+    ) -> np.ndarray:
+        return self.preprocess_query_animal_subcategory_id_encoder.transform(query_animal_subcategory_id).toarray()
 
     def transform_query_phrase_encoder(
         self,
         query_phrase: List[List[str]],
-    ) -> List[List[float]]:
-        return self.preprocess_query_phrase_encoder.transform(query_phrase).toarray().tolist()
+    ) -> np.ndarray:
+        return self.preprocess_query_phrase_encoder.transform(query_phrase).toarray()
+
+    def __compile_query(
+        self,
+        query_phrase: str,
+        query_animal_category_id: Optional[int],
+        query_animal_subcategory_id: Optional[int],
+    ) -> np.ndarray:
+        tables = [
+            (self.__query_phrase_table, query_phrase),
+            (self.__query_animal_category_id_table, query_animal_category_id),
+            (self.__query_animal_subcategory_id_table, query_animal_subcategory_id),
+        ]
+        query_features = np.zeros(sum(t.width for t, _ in tables), dtype=np.float32)
+        offset = 0
+        for table, value in tables:
+            table.encode(
+                value=value,
+                out=query_features[offset : offset + table.width],
+            )
+            offset += table.width
+        query_features.flags.writeable = False
+        return query_features
+
+    def encode_query(
+        self,
+        query_phrase: str,
+        query_animal_category_id: Optional[int],
+        query_animal_subcategory_id: Optional[int],
+    ) -> np.ndarray:
+        return self.__encode_query(
+            query_phrase,
+            query_animal_category_id,
+            query_animal_subcategory_id,
+        )
 
     def _predict_sklearn(
         self,
-        input: List[List[float]],
-    ) -> List[float]:
-        return self.predictor.predict(input).tolist()
+        input: np.ndarray,
+    ) -> np.ndarray:
+        return np.asarray(self.predictor.predict(input))
 
-    def _predict_onnx(
+    def __predict_onnx_fixed_batch(
         self,
-        input: List[List[float]],
-    ) -> List[float]:
-        if self.predictor_batch_size is None:
-            raise ValueError
-
-        outputs = []
-        _input = np.array(input)
-        for i in range(0, _input.shape[0], self.predictor_batch_size):
-            x = _input[i : i + self.predictor_batch_size].astype("float32")
-            if len(x) < self.predictor_batch_size:
-                _x = np.zeros((self.predictor_batch_size, x.shape[1])).astype("float32")
-                for p in range(len(_x)):
-                    _x[p] = x[p]
-                x = _x
-            output = self.predictor.run(
+        input: np.ndarray,
+        batch_size: int,
+    ) -> np.ndarray:
+        size = input.shape[0]
+        padded = np.zeros((-(-size // batch_size) * batch_size, input.shape[1]), dtype=np.float32)
+        padded[:size] = input
+        outputs = [
+            self.predictor.run(
                 [self.predictor_output_name],
-                {self.predictor_input_name: x},
+                {self.predictor_input_name: padded[i : i + batch_size]},
+            )[0]
+            for i in range(0, padded.shape[0], batch_size)
+        ]
+        return np.concatenate(outputs).reshape(-1)[:size]
+
+    def __output_buffer(
+        self,
+        size: int,
+    ) -> np.ndarray:
+        buffer = getattr(self.__buffers, "output", None)
+        if buffer is None or buffer.shape[0] < size:
+            buffer = np.empty((max(size, self.predictor_batch_size or 0), *self.__output_shape), dtype=np.float32)
+            self.__buffers.output = buffer
+        return buffer[:size]
+
+    def __predict_onnx_io_binding(
+        self,
+        input: np.ndarray,
+    ) -> np.ndarray:
+        output = self.__output_buffer(size=input.shape[0])
+        binding = self.predictor.io_binding()
+        binding.bind_cpu_input(self.predictor_input_name, input)
+        binding.bind_output(
+            name=self.predictor_output_name,
+            device_type="cpu",
+            device_id=0,
+            element_type=np.float32,
+            shape=output.shape,
+            buffer_ptr=output.ctypes.data,
+        )
+        self.predictor.run_with_iobinding(binding)
+        return output.reshape(-1).copy()
+
+    def _predict_onnx(
+        self,
+        input: np.ndarray,
+    ) -> np.ndarray:
+        _input = np.ascontiguousarray(input, dtype=np.float32)
+        if self.__fixed_batch_size is not None:
+            return self.__predict_onnx_fixed_batch(
+                input=_input,
+                batch_size=self.__fixed_batch_size,
             )
-            outputs.extend(output[0].tolist())
-        return outputs[: _input.shape[0]]
+        if self.onnx_io_binding:
+            return self.__predict_onnx_io_binding(input=_input)
+        output = self.predictor.run(
+            [self.predictor_output_name],
+            {self.predictor_input_name: _input},
+        )
+        return np.asarray(output[0]).reshape(-1)
 
     def _predict(
         self,
-        input: List[List[float]],
-    ) -> List[float]:
+        input: np.ndarray,
+    ) -> np.ndarray:
         if self.is_onnx_predictor:
             return self._predict_onnx(input=input)
         else:
@@ -153,16 +266,16 @@ class LearnToRankService(AbstractLearnToRankService):
     def postprocess(
         self,
         ids: List[str],
-        prediction: List[float],
+        prediction: np.ndarray,
     ) -> List[Tuple[str, float]]:
-        id_prediction = {id: prob for id, prob in zip(ids, prediction)}
-        sort_orders = sorted(id_prediction.items(), key=lambda x: x[1], reverse=True)
-        return sort_orders
+        size = min(len(ids), prediction.shape[0])
+        orders = np.argsort(-prediction[:size], kind="stable")
+        return [(ids[i], float(prediction[i])) for i in orders]
 
     def predict(
         self,
         ids: List[str],
-        input: List[List[float]],
+        input: np.ndarray,
     ) -> List[Tuple[str, float]]:
         prediction = self._predict(input=input)
         id_prediction = self.postprocess(
@@ -171,3 +284,20 @@ class LearnToRankService(AbstractLearnToRankService):
         )
         logger.info(f"sorted prediction: {id_prediction}")
         return id_prediction
+
+    def predict_batch(
+        self,
+        ids: List[List[str]],
+        inputs: List[np.ndarray],
+    ) -> List[List[Tuple[str, float]]]:
+        prediction = self._predict(input=np.concatenate(inputs))
+        offsets = np.cumsum([i.shape[0] for i in inputs])[:-1]
+        id_predictions = [
+            self.postprocess(
+                ids=_ids,
+                prediction=_prediction,
+            )
+            for _ids, _prediction in zip(ids, np.split(prediction, offsets))
+        ]
+        logger.info(f"predicted {len(inputs)} requests in a batch of {prediction.shape[0]}")
+        return id_predictions
@@ -0,0 +1,158 @@
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from logging import getLogger
+from typing import AsyncContextManager, AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+from src.service.learn_to_rank_service import AbstractLearnToRankService
+
+logger = getLogger(__name__)
+
+
+class PredictionRequest(object):
+    def __init__(
+        self,
+        ids: List[str],
+        input: np.ndarray,
+        future: asyncio.Future,
+    ):
+        self.ids = ids
+        self.input = input
+        self.future = future
+
+
+class AbstractPredictionBatcher(ABC):
+    def __init__(
+        self,
+        learn_to_rank_service: AbstractLearnToRankService,
+        max_batch_size: int = 16,
+        max_wait_millisecond: float = 2.0,
+        max_preparing: int = 4,
+    ):
+        self.learn_to_rank_service = learn_to_rank_service
+        self.max_batch_size = max_batch_size
+        self.max_wait_millisecond = max_wait_millisecond
+        self.max_preparing = max_preparing
+
+    @abstractmethod
+    def preparing(self) -> AsyncContextManager[None]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def predict(
+        self,
+        ids: List[str],
+        input: np.ndarray,
+    ) -> List[Tuple[str, float]]:
+        raise NotImplementedError
+
+
+class PredictionBatcher(AbstractPredictionBatcher):
+    def __init__(
+        self,
+        learn_to_rank_service: AbstractLearnToRankService,
+        max_batch_size: int = 16,
+        max_wait_millisecond: float = 2.0,
+        max_preparing: int = 4,
+    ):
+        super().__init__(
+            learn_to_rank_service=learn_to_rank_service,
+            max_batch_size=max_batch_size,
+            max_wait_millisecond=max_wait_millisecond,
+            max_preparing=max_preparing,
+        )
+        self.__queue: Optional[asyncio.Queue] = None
+        self.__worker: Optional[asyncio.Task] = None
+        self.__preparing = 0
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+
+    def __start(self) -> asyncio.Queue:
+        if self.__queue is not None and self.__worker is not None and not self.__worker.done():
+            return self.__queue
+        queue: asyncio.Queue = asyncio.Queue()
+        self.__queue = queue
+        self.__worker = asyncio.get_running_loop().create_task(self.__run(queue=queue))
+        return queue
+
+    @asynccontextmanager
+    async def preparing(self) -> AsyncIterator[None]:
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_preparing)
+        async with self.__semaphore:
+            self.__preparing += 1
+            try:
+                yield
+            finally:
+                self.__preparing -= 1
+
+    async def predict(
+        self,
+        ids: List[str],
+        input: np.ndarray,
+    ) -> List[Tuple[str, float]]:
+        queue = self.__start()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put(
+            PredictionRequest(
+                ids=ids,
+                input=input,
+                future=future,
+            )
+        )
+        return await future
+
+    async def __collect(
+        self,
+        queue: asyncio.Queue,
+    ) -> List[PredictionRequest]:
+        loop = asyncio.get_running_loop()
+        batch = [await queue.get()]
+        deadline = loop.time() + self.max_wait_millisecond / 1000
+        while len(batch) < self.max_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0 or self.__preparing == 0:
+                break
+            getter = loop.create_task(queue.get())
+            done, _ = await asyncio.wait({getter}, timeout=timeout)
+            if getter not in done:
+                getter.cancel()
+                break
+            batch.append(getter.result())
+        return batch
+
+    async def __predict(
+        self,
+        batch: List[PredictionRequest],
+    ):
+        loop = asyncio.get_running_loop()
+        id_predictions = await loop.run_in_executor(
+            None,
+            self.learn_to_rank_service.predict_batch,
+            [r.ids for r in batch],
+            [r.input for r in batch],
+        )
+        for r, id_prediction in zip(batch, id_predictions):
+            if not r.future.done():
+                r.future.set_result(id_prediction)
+
+    async def __run(
+        self,
+        queue: asyncio.Queue,
+    ):
+        while True:
+            batch = await self.__collect(queue=queue)
+            try:
+                await self.__predict(batch=batch)
+                continue
+            except Exception as e:
+                logger.exception(f"failed to predict a batch of {len(batch)} requests: {e}")
+            for r in batch:
+                try:
+                    await self.__predict(batch=[r])
+                except Exception as e:
+                    if not r.future.done():
+                        r.future.set_exception(e)
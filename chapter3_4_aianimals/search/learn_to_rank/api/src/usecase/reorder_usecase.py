@@ -1,16 +1,21 @@
 from abc import ABC, abstractmethod
+from enum import Enum
 from logging import getLogger
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from fastapi import BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from src.configurations import Configurations
 from src.infrastructure.cache_client import AbstractCacheClient
 from src.infrastructure.db_client import AbstractDBClient
+from src.middleware.feature_codec import FEATURE_VECTOR_KEYS
 from src.middleware.string import get_md5_hash
 from src.repository.feature_cache_repository import AbstractFeatureCacheRepository
 from src.repository.like_repository import LikeQuery, LikeRepository
 from src.schema.animal import AnimalRequest, AnimalResponse
 from src.service.learn_to_rank_service import AbstractLearnToRankService
+from src.service.prediction_batcher import AbstractPredictionBatcher
 
 logger = getLogger(__name__)
 
@@ -32,6 +37,15 @@ def make_feature_cache_key(animal_id: str) -> str:
     return f"animal_feature_{animal_id}_{Configurations.feature_mlflow_experiment_id}_{Configurations.feature_mlflow_run_id}"
 
 
+class FEATURE_FALLBACK(Enum):
+    DEFAULT = "default"
+    DROP = "drop"
+
+    @staticmethod
+    def has_value(value: str) -> bool:
+        return value in [v.value for v in FEATURE_FALLBACK.__members__.values()]
+
+
 class AbstractReorderUsecase(ABC):
     def __init__(
         self,
@@ -40,12 +54,18 @@ class AbstractReorderUsecase(ABC):
         db_client: AbstractDBClient,
         cache_client: AbstractCacheClient,
         learn_to_rank_service: AbstractLearnToRankService,
+        prediction_batcher: Optional[AbstractPredictionBatcher] = None,
+        feature_fallback: str = FEATURE_FALLBACK.DEFAULT.value,
     ):
         self.like_repository = like_repository
         self.feature_cache_repository = feature_cache_repository
         self.db_client = db_client
         self.cache_client = cache_client
         self.learn_to_rank_service = learn_to_rank_service
+        self.prediction_batcher = prediction_batcher
+        if not FEATURE_FALLBACK.has_value(feature_fallback):
+            raise ValueError(f"feature fallback must be one of {[v.value for v in FEATURE_FALLBACK]}")
+        self.feature_fallback = FEATURE_FALLBACK(feature_fallback)
 
     @abstractmethod
     def reorder(
@@ -55,6 +75,14 @@ class AbstractReorderUsecase(ABC):
     ) -> AnimalResponse:
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_reorder(
+        self,
+        request: AnimalRequest,
+        background_tasks: BackgroundTasks,
+    ) -> AnimalResponse:
+        raise NotImplementedError
+
 
 class ReorderUsecase(AbstractReorderUsecase):
     def __init__(
@@ -64,6 +92,8 @@ class ReorderUsecase(AbstractReorderUsecase):
         db_client: AbstractDBClient,
         cache_client: AbstractCacheClient,
         learn_to_rank_service: AbstractLearnToRankService,
+        prediction_batcher: Optional[AbstractPredictionBatcher] = None,
+        feature_fallback: str = FEATURE_FALLBACK.DEFAULT.value,
     ):
         super().__init__(
             like_repository=like_repository,
@@ -71,6 +101,8 @@ class ReorderUsecase(AbstractReorderUsecase):
             db_client=db_client,
             cache_client=cache_client,
             learn_to_rank_service=learn_to_rank_service,
+            prediction_batcher=prediction_batcher,
+            feature_fallback=feature_fallback,
         )
 
     def __set_prediction_cache(
@@ -84,11 +116,33 @@ class ReorderUsecase(AbstractReorderUsecase):
             expire_second=60 * 10,  # expire in 10 minutes
         )
 
-    def reorder(
+    def __make_inputs(
+        self,
+        transformed_likes: np.ndarray,
+        query_features: np.ndarray,
+        feature_vectors: Dict[str, np.ndarray],
+        rows: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        vectors = [feature_vectors[k] for k in FEATURE_VECTOR_KEYS]
+        if rows is not None:
+            transformed_likes = transformed_likes[rows]
+            vectors = [v[rows] for v in vectors]
+        size = transformed_likes.shape[0]
+        widths = [transformed_likes.shape[1], query_features.shape[0], *[v.shape[1] for v in vectors]]
+        inputs = np.empty((size, sum(widths)), dtype=np.float32)
+        inputs[:, : widths[0]] = transformed_likes
+        offset = widths[0]
+        inputs[:, offset : offset + widths[1]] = query_features
+        offset += widths[1]
+        for vector in vectors:
+            inputs[:, offset : offset + vector.shape[1]] = vector
+            offset += vector.shape[1]
+        return inputs
+
+    def __prepare(
         self,
         request: AnimalRequest,
-        background_tasks: BackgroundTasks,
-    ) -> AnimalResponse:
+    ) -> Tuple[str, Optional[AnimalResponse], List[str], np.ndarray, List[str]]:
         logger.info(f"request: {request}")
         query_phrases = ".".join(request.query_phrases)
         query_id = make_query_id(
@@ -99,46 +153,52 @@ class ReorderUsecase(AbstractReorderUsecase):
         )
         cached_data = self.cache_client.get(key=query_id)
         if cached_data is not None:
-            return AnimalResponse(ids=cached_data.split(","))
-        _likes = self.like_repository.select_all(like_query=LikeQuery(animal_ids=request.ids))
-        likes = [[_likes.get(id, 0)] for id in request.ids]
+            return query_id, AnimalResponse(ids=cached_data.split(",")), [], np.empty((0, 0), dtype=np.float32), []
 
         feature_cache_keys = [make_feature_cache_key(animal_id=id) for id in request.ids]
-        features = self.feature_cache_repository.get_features_by_keys(keys=feature_cache_keys)
-        transformed_likes = self.learn_to_rank_service.transform_like_scaler(likes=likes)
-        transformed_query_animal_category_id = self.learn_to_rank_service.transform_query_animal_category_id_encoder(
-            query_animal_category_id=[[request.query_animal_category_id]]
-        )
-        transformed_query_animal_subcategory_id = (
-            self.learn_to_rank_service.transform_query_animal_subcategory_id_encoder(
-                query_animal_subcategory_id=[[request.query_animal_subcategory_id]]
+        feature_matrix = self.feature_cache_repository.get_feature_matrix(keys=feature_cache_keys)
+        feature_vectors = feature_matrix.vectors
+        if feature_vectors is None or feature_matrix.missing.all():
+            logger.warning(f"no features found for {request.ids}")
+            return query_id, AnimalResponse(ids=request.ids), [], np.empty((0, 0), dtype=np.float32), []
+
+        ids = request.ids
+        missing_ids = []
+        rows = None
+        if feature_matrix.missing_count > 0:
+            logger.warning(
+                f"features missing for {feature_matrix.missing_count} of {len(request.ids)} animals; "
+                f"fall back to {self.feature_fallback.value}"
             )
+            if self.feature_fallback == FEATURE_FALLBACK.DROP:
+                rows = np.flatnonzero(~feature_matrix.missing)
+                ids = [request.ids[i] for i in rows]
+                missing_ids = [request.ids[i] for i in np.flatnonzero(feature_matrix.missing)]
+
+        _likes = self.like_repository.select_all(like_query=LikeQuery(animal_ids=request.ids))
+        likes = np.array([[_likes.get(id, 0)] for id in request.ids], dtype=np.float64)
+        transformed_likes = self.learn_to_rank_service.transform_like_scaler(likes=likes)
+        query_features = self.learn_to_rank_service.encode_query(
+            query_phrase=query_phrases,
+            query_animal_category_id=request.query_animal_category_id,
+            query_animal_subcategory_id=request.query_animal_subcategory_id,
         )
-        transformed_query_phrase = self.learn_to_rank_service.transform_query_phrase_encoder(
-            query_phrase=[[query_phrases]]
+        inputs = self.__make_inputs(
+            transformed_likes=transformed_likes,
+            query_features=query_features,
+            feature_vectors=feature_vectors,
+            rows=rows,
         )
+        return query_id, None, ids, inputs, missing_ids
 
-        inputs = [
-            [
-                *l,
-                *transformed_query_phrase[0],
-                *transformed_query_animal_category_id[0],
-                *transformed_query_animal_subcategory_id[0],
-                *f["animal_category_vector"],
-                *f["animal_subcategory_vector"],
-                *f["name_vector"],
-                *f["description_vector"],
-            ]
-            for l, f in zip(
-                transformed_likes,
-                features.values(),
-            )
-        ]
-        prediction = self.learn_to_rank_service.predict(
-            ids=request.ids,
-            input=inputs,
-        )
-        ordered_animal_ids = [p[0] for p in prediction]
+    def __respond(
+        self,
+        query_id: str,
+        prediction: List[Tuple[str, float]],
+        missing_ids: List[str],
+        background_tasks: BackgroundTasks,
+    ) -> AnimalResponse:
+        ordered_animal_ids = [p[0] for p in prediction] + missing_ids
 
         background_tasks.add_task(
             self.__set_prediction_cache,
@@ -148,3 +208,44 @@ class ReorderUsecase(AbstractReorderUsecase):
         response = AnimalResponse(ids=ordered_animal_ids)
         logger.info(f"response: {response}")
         return response
+
+    def reorder(
+        self,
+        request: AnimalRequest,
+        background_tasks: BackgroundTasks,
+    ) -> AnimalResponse:
+        query_id, response, ids, inputs, missing_ids = self.__prepare(request=request)
+        if response is not None:
+            return response
+        prediction = self.learn_to_rank_service.predict(
+            ids=ids,
+            input=inputs,
+        )
+        return self.__respond(
+            query_id=query_id,
+            prediction=prediction,
+            missing_ids=missing_ids,
+            background_tasks=background_tasks,
+        )
+
+    async def async_reorder(
+        self,
+        request: AnimalRequest,
+        background_tasks: BackgroundTasks,
+    ) -> AnimalResponse:
+        if self.prediction_batcher is None:
+            raise ValueError("prediction batcher is not configured")
+        async with self.prediction_batcher.preparing():
+            query_id, response, ids, inputs, missing_ids = await run_in_threadpool(self.__prepare, request)
+        if response is not None:
+            return response
+        prediction = await self.prediction_batcher.predict(
+            ids=ids,
+            input=inputs,
+        )
+        return self.__respond(
+            query_id=query_id,
+            prediction=prediction,
+            missing_ids=missing_ids,
+            background_tasks=background_tasks,
+        )
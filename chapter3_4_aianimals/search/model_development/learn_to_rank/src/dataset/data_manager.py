@@ -1,13 +1,14 @@
-import json
 import os
 from abc import ABC, abstractmethod
 from datetime import date
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import psycopg2
 import redis
 from psycopg2.extras import DictCursor
 from src.dataset.schema import TABLES, AccessLog
+from src.middleware.feature_codec import decode_features
 from src.middleware.logger import configure_logger
 
 logger = configure_logger(__name__)
@@ -33,6 +34,13 @@ class AbstractCache(ABC):
     ) -> Optional[Union[str, int, float, bool, bytes]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def mget_bytes(
+        self,
+        keys: List[str],
+    ) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
 
 class DBClient(AbstractDBClient):
     def __init__(self):
@@ -60,6 +68,12 @@ class RedisCache(AbstractCache):
             db=self.__redis_db,
             decode_responses=True,
         )
+        self.binary_redis_client = redis.Redis(
+            host=self.__redis_host,
+            port=self.__redis_port,
+            db=self.__redis_db,
+            decode_responses=False,
+        )
 
     def get(
         self,
@@ -68,6 +82,15 @@ class RedisCache(AbstractCache):
         value = self.redis_client.get(key)
         return value
 
+    def mget_bytes(
+        self,
+        keys: List[str],
+    ) -> List[Optional[bytes]]:
+        if len(keys) == 0:
+            return []
+        values = self.binary_redis_client.mget(keys)
+        return values
+
 
 class FeatureCacheRepository(object):
     def __init__(
@@ -79,18 +102,18 @@ class FeatureCacheRepository(object):
     def get_features_by_keys(
         self,
         keys: List[str],
-    ) -> Dict[str, Dict[str, List[float]]]:
+        chunk_size: int = 1000,
+    ) -> Dict[str, Dict[str, np.ndarray]]:
         logger.info(f"keys to get from cache: {len(keys)}")
         features = {}
-        i = 1000
-        for key in keys:
-            feature = self.cache.get(key=key)
-            if feature is not None:
-                features[key] = json.loads(str(feature))
-                i -= 1
-                if i == 0:
-                    logger.info(f"retrieved {len(features)} from cache")
-                    i = 1000
+        for i in range(0, len(keys), chunk_size):
+            chunk = keys[i : i + chunk_size]
+            values = self.cache.mget_bytes(keys=chunk)
+            for key, value in zip(chunk, values):
+                decoded = decode_features(value=value)
+                if decoded is not None:
+                    features[key] = decoded
+            logger.info(f"retrieved {len(features)} from cache")
         return features
 
 
@@ -56,10 +56,10 @@ def retrieve_access_logs(
             query_animal_subcategory_id=record.query_animal_subcategory_id,
             likes=record.likes,
             feature_vector=FeatureVector(
-                animal_category_vector=feature_vector["animal_category_vector"],
-                animal_subcategory_vector=feature_vector["animal_subcategory_vector"],
-                name_vector=feature_vector["name_vector"],
-                description_vector=feature_vector["description_vector"],
+                animal_category_vector=feature_vector["animal_category_vector"].tolist(),
+                animal_subcategory_vector=feature_vector["animal_subcategory_vector"].tolist(),
+                name_vector=feature_vector["name_vector"].tolist(),
+                description_vector=feature_vector["description_vector"].tolist(),
             ),
         )
 
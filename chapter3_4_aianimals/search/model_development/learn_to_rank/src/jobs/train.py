@@ -52,7 +52,6 @@ q_test: {sum(q_test) if q_test is not None else None}
         model_file_path = model.save(file_path=model_save_file_path)
         onnx_file_path = model.save_onnx(
             file_path=model_save_file_path,
-            batch_size=40,
             feature_size=np.array(x_train).shape[1],
         )
         return Artifact(
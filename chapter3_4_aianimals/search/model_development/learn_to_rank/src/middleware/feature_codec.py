@@ -0,0 +1,43 @@
+import json
+import struct
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+FEATURE_CODEC_MAGIC = b"AF"
+FEATURE_CODEC_VERSION = 1
+FEATURE_VECTOR_KEYS = [
+    "animal_category_vector",
+    "animal_subcategory_vector",
+    "name_vector",
+    "description_vector",
+]
+FEATURE_DTYPE = np.dtype("<f4")
+HEADER = struct.Struct(f"<2sBx{len(FEATURE_VECTOR_KEYS)}I")
+
+
+def encode_features(features: Dict[str, Sequence[float]]) -> bytes:
+    vectors = [np.asarray(features[k], dtype=FEATURE_DTYPE).ravel() for k in FEATURE_VECTOR_KEYS]
+    header = HEADER.pack(
+        FEATURE_CODEC_MAGIC,
+        FEATURE_CODEC_VERSION,
+        *[v.shape[0] for v in vectors],
+    )
+    return header + b"".join(v.tobytes() for v in vectors)
+
+
+def decode_features(value: Optional[Union[str, bytes]]) -> Optional[Dict[str, np.ndarray]]:
+    if value is None:
+        return None
+    if isinstance(value, str) or not value.startswith(FEATURE_CODEC_MAGIC):
+        data = json.loads(value)
+        return {k: np.asarray(data[k], dtype=np.float32) for k in FEATURE_VECTOR_KEYS}
+    _, version, *lengths = HEADER.unpack_from(value)
+    if version != FEATURE_CODEC_VERSION:
+        raise ValueError(f"unsupported feature codec version: {version}")
+    features = {}
+    offset = HEADER.size
+    for key, length in zip(FEATURE_VECTOR_KEYS, lengths):
+        features[key] = np.frombuffer(value, dtype=FEATURE_DTYPE, count=length, offset=offset)
+        offset += length * FEATURE_DTYPE.itemsize
+    return features
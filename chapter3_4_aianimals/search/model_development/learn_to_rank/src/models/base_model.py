@@ -48,7 +48,7 @@ class BaseLearnToRankModel(ABC):
     def save_onnx(
         self,
         file_path: str,
-        batch_size: int = 20,
+        batch_size: Optional[int] = None,
         feature_size: int = 1,
     ) -> str:
         raise NotImplementedError
@@ -4,8 +4,10 @@ from typing import Dict, List, Optional, Union
 
 import cloudpickle
 import numpy as np
+import onnxmltools
 import pandas as pd
 from lightgbm import LGBMRanker
+from onnxmltools.convert.common.data_types import FloatTensorType
 from src.middleware.logger import configure_logger
 from src.models.base_model import BaseLearnToRankModel
 
@@ -98,11 +100,22 @@ class LightGBMLearnToRankRanker(BaseLearnToRankModel):
     def save_onnx(
         self,
         file_path: str,
-        batch_size: int = 20,
+        batch_size: Optional[int] = None,
         feature_size: int = 1,
     ) -> str:
-        logger.info("pass")
-        return ""
+        file, ext = os.path.splitext(file_path)
+        if ext != ".onnx":
+            file_path = f"{file}.onnx"
+        initial_types = [
+            ["inputs", FloatTensorType([batch_size, feature_size])],
+        ]
+        onnx_model = onnxmltools.convert_lightgbm(
+            self.model,
+            initial_types=initial_types,
+        )
+        logger.info(f"save model: {file_path}")
+        onnxmltools.utils.save_model(onnx_model, file_path)
+        return file_path
 
     def load(
         self,
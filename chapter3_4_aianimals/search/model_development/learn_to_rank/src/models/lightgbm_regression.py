@@ -93,7 +93,7 @@ class LightGBMLearnToRankRegression(BaseLearnToRankModel):
     def save_onnx(
         self,
         file_path: str,
-        batch_size: int = 20,
+        batch_size: Optional[int] = None,
         feature_size: int = 1,
     ) -> str:
         file, ext = os.path.splitext(file_path)